@@ -0,0 +1,174 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Micro-benchmarks for serialize.deserialize and serialize.serialize
+
+Run explicitly, they are not collected by the regular test run:
+
+    pytest benchmarks/bench_serialize.py --benchmark-columns=mean,ops \
+        --benchmark-sort=name
+
+Each result's extra_info holds objects_per_sec and allocated_bytes. Use
+--benchmark-save/--benchmark-compare to judge a change against a baseline.
+"""
+import datetime
+import functools
+import importlib
+import json
+
+# ignoring "Module 'typing' has no attribute 'ForwardRef'"
+from typing import Callable, cast, Dict, ForwardRef, Sequence, Type  # type: ignore
+
+import cattr
+import pytest  # type: ignore
+
+from looker_sdk.rtl import model
+from looker_sdk.rtl import serialize
+from looker_sdk.rtl import timestamp
+from looker_sdk.sdk import models
+
+from benchmarks import payloads
+
+TDecoder = Callable[[str, serialize.TStructure], object]
+
+
+def _json_backend(module: str) -> Callable[[str], object]:
+    try:
+        return importlib.import_module(module).loads  # type: ignore
+    except ImportError:
+        return None  # type: ignore
+
+
+def _structure_with(loads: Callable[[str], object]) -> TDecoder:
+    def decode(data: str, structure: serialize.TStructure) -> object:
+        return cattr.structure(loads(data), structure)  # type: ignore
+
+    return decode
+
+
+# the hooks path resolves models' ForwardRef field types by name, as the
+# generated per-model hook registrations did before sdk/converters.py
+_MODELS: Dict[str, Type[model.Model]] = {}
+for _name in dir(models):
+    _value = getattr(models, _name)
+    if isinstance(_value, type) and issubclass(_value, model.Model):
+        _MODELS[_name] = _value
+        cattr.register_structure_hook(  # type: ignore
+            ForwardRef(_name), functools.partial(serialize.structure_hook, _MODELS)
+        )
+
+
+def _hooks(data: str, structure: serialize.TStructure) -> object:
+    """deserialize() with an empty converter registry, so the cattr hooks
+    structure models by attrs reflection.
+    """
+    registry = serialize.converters
+    serialize.converters = serialize.ConverterRegistry()
+    try:
+        return serialize.deserialize(data, structure)
+    finally:
+        serialize.converters = registry
+
+
+# name -> decoder. "cattr" is the SDK's own path, which structures generated
+# models with the precomputed sdk/converters.py fields; "hooks" is the same
+# without them; "raw" skips model structuring entirely; the others swap the
+# JSON parser under cattr.
+DECODERS: Dict[str, TDecoder] = {
+    "cattr": serialize.deserialize,
+    "hooks": _hooks,
+    "raw": lambda data, structure: json.loads(data),
+}
+for _backend in ("ujson", "orjson", "rapidjson"):
+    _loads = _json_backend(_backend)
+    if _loads:
+        DECODERS[f"cattr+{_backend}"] = _structure_with(_loads)
+
+
+@pytest.fixture(params=sorted(DECODERS))  # type: ignore
+def decoder(request) -> TDecoder:
+    return DECODERS[request.param]
+
+
+def test_deserialize_dashboard(measure, decoder, dashboard_json):
+    result = measure(lambda: decoder(dashboard_json, models.Dashboard), objects=201)
+    assert result
+
+
+def test_deserialize_users(measure, decoder, users_json):
+    result = measure(
+        lambda: decoder(users_json, Sequence[models.User]), objects=50000, rounds=3
+    )
+    assert len(result) == 50000  # type: ignore
+
+
+def test_deserialize_explore(measure, decoder, explore_json):
+    fields = 60 * 80
+    result = measure(
+        lambda: decoder(explore_json, models.LookmlModelExplore), objects=fields
+    )
+    assert result
+
+
+def test_serialize_dashboard(measure, dashboard_json):
+    dashboard = serialize.deserialize(dashboard_json, models.Dashboard)
+    assert measure(lambda: serialize.serialize(dashboard), objects=201)
+
+
+def test_update_dashboard(measure, dashboard_json):
+    """Read-modify-write: what deserialize() and serialize_changes() add up
+    to for a PATCH of one field.
+    """
+
+    def update() -> bytes:
+        dashboard = cast(
+            models.Dashboard, serialize.deserialize(dashboard_json, models.Dashboard)
+        )
+        dashboard.title = "Sales"
+        return serialize.serialize_changes(dashboard)
+
+    assert measure(update, objects=201) == b'{"title": "Sales"}'
+
+
+def test_serialize_users(measure, users_json):
+    users = serialize.deserialize(users_json, Sequence[models.User])
+    assert measure(lambda: serialize.serialize(users), objects=50000, rounds=3)
+
+
+# name -> timestamp parser. "strptime" is what the SDK used before
+PARSERS: Dict[str, Callable[[str], object]] = {
+    "strptime": lambda value: datetime.datetime.strptime(
+        value, "%Y-%m-%dT%H:%M:%S.%f%z"
+    ),
+    "fromisoformat": timestamp.parse_isoformat,
+    "lazy": timestamp.LazyDatetime,
+}
+if timestamp.BACKEND == "ciso8601":
+    PARSERS["ciso8601"] = timestamp.parse
+
+
+@pytest.mark.parametrize("parser", sorted(PARSERS))  # type: ignore
+def test_parse_timestamps(measure, parser):
+    parse = PARSERS[parser]
+    values = [payloads.timestamp(seconds) for seconds in range(100000)]
+    result = measure(lambda: [parse(value) for value in values], objects=len(values))
+    assert len(result) == len(values)  # type: ignore
@@ -0,0 +1,84 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+import tracemalloc
+from typing import Callable
+
+import pytest  # type: ignore
+
+from benchmarks import payloads
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:  # pragma: no cover
+    # the benchmarks need its benchmark fixture: skip them, see measure()
+    collect_ignore_glob = ["bench_*.py"]
+
+
+@pytest.fixture(scope="session")  # type: ignore
+def dashboard_json() -> str:
+    """A dashboard with 200 elements, each with its query
+    """
+    return json.dumps(payloads.dashboard(1, elements=200))
+
+
+@pytest.fixture(scope="session")  # type: ignore
+def users_json() -> str:
+    return json.dumps(payloads.users(50000))
+
+
+@pytest.fixture(scope="session")  # type: ignore
+def explore_json() -> str:
+    """An explore with 60 views of 80 fields each
+    """
+    return json.dumps(payloads.lookml_model_explore(views=60, fields_per_view=80))
+
+
+def allocated_bytes(func: Callable[[], object]) -> int:
+    """Peak bytes allocated while calling func once.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture  # type: ignore
+def measure(request):
+    """Benchmark func and report objects/sec and bytes allocated.
+
+    `objects` is the number of API objects func (de)serializes per call.
+    Skips the benchmark if pytest-benchmark is not installed.
+    """
+    pytest.importorskip("pytest_benchmark")
+    benchmark = request.getfixturevalue("benchmark")
+
+    def run(func: Callable[[], object], objects: int, rounds: int = 5) -> object:
+        benchmark.extra_info["allocated_bytes"] = allocated_bytes(func)
+        result = benchmark.pedantic(func, rounds=rounds, iterations=1, warmup_rounds=1)
+        benchmark.extra_info["objects_per_sec"] = objects / benchmark.stats.stats.mean
+        return result
+
+    return run
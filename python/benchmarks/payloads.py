@@ -0,0 +1,195 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Synthetic API payloads shaped like Looker 3.1 responses
+"""
+import datetime
+import json
+import random
+from typing import Any, Dict, List
+
+TJson = Dict[str, Any]
+
+_EPOCH = datetime.datetime(2019, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def timestamp(seconds: int) -> str:
+    """Looker style timestamp, e.g. 2019-09-25T16:04:05.123+00:00
+    """
+    ts = _EPOCH + datetime.timedelta(seconds=seconds, milliseconds=seconds % 1000)
+    return ts.isoformat(timespec="milliseconds")
+
+
+def access_token(token: str = "BenchmarkAccessToken", expires_in: int = 3600) -> TJson:
+    return {"access_token": token, "token_type": "Bearer", "expires_in": expires_in}
+
+
+def user(user_id: int) -> TJson:
+    first, last = f"First{user_id}", f"Last{user_id}"
+    return {
+        "id": user_id,
+        "first_name": first,
+        "last_name": last,
+        "display_name": f"{first} {last}",
+        "email": f"{first}.{last}@example.com",
+        "is_disabled": user_id % 50 == 0,
+        "locale": "en",
+        "home_space_id": str(user_id + 1000),
+        "personal_space_id": user_id + 1000,
+        "group_ids": [1, 2, user_id % 17],
+        "role_ids": [2, user_id % 5],
+        "ui_state": None,
+        "url": f"https://localhost/api/3.1/users/{user_id}",
+        "can": {"show": True, "index": True, "edit": user_id % 3 == 0},
+    }
+
+
+def users(count: int) -> List[TJson]:
+    return [user(user_id) for user_id in range(1, count + 1)]
+
+
+def query(query_id: int) -> TJson:
+    return {
+        "id": query_id,
+        "model": "thelook",
+        "view": "order_items",
+        "fields": ["orders.created_date", "orders.count", "products.brand"],
+        "filters": {"orders.created_date": "30 days", "products.brand": "-NULL"},
+        "sorts": ["orders.created_date desc"],
+        "limit": "500",
+        "client_id": f"q{query_id:020d}",
+        "slug": f"s{query_id}",
+        "can": {"run": True, "see_results": True},
+    }
+
+
+def dashboard_element(element_id: int) -> TJson:
+    return {
+        "id": str(element_id),
+        "dashboard_id": "1",
+        "title": f"Tile {element_id}",
+        "type": "vis",
+        "query_id": element_id,
+        "query": query(element_id),
+        "result_maker": {
+            "id": element_id,
+            "filterables": [
+                {"model": "thelook", "view": "order_items", "name": "orders"}
+            ],
+            "vis_config": {"type": "looker_column", "stacking": "normal"},
+        },
+        "note_text": None,
+        "subtitle_text": "",
+        "can": {"explore": True},
+    }
+
+
+def dashboard(dashboard_id: int, elements: int = 20) -> TJson:
+    return {
+        "id": str(dashboard_id),
+        "title": f"Dashboard {dashboard_id}",
+        "description": "Synthetic dashboard",
+        "hidden": False,
+        "user_id": dashboard_id % 100,
+        "space_id": str(dashboard_id % 10),
+        "created_at": timestamp(dashboard_id),
+        "updated_at": timestamp(dashboard_id * 7),
+        "last_accessed_at": timestamp(dashboard_id * 13),
+        "dashboard_elements": [
+            dashboard_element(dashboard_id * 1000 + e) for e in range(elements)
+        ],
+        "dashboard_filters": [
+            {
+                "id": str(f),
+                "name": f"filter{f}",
+                "title": f"Filter {f}",
+                "type": "field_filter",
+                "model": "thelook",
+                "explore": "order_items",
+                "dimension": "orders.created_date",
+            }
+            for f in range(5)
+        ],
+        "can": {"show": True, "edit": True},
+    }
+
+
+def explore_field(name: str, index: int) -> TJson:
+    return {
+        "name": f"{name}.field_{index}",
+        "label": f"Field {index}",
+        "label_short": f"Field {index}",
+        "type": "string" if index % 3 else "number",
+        "category": "dimension" if index % 4 else "measure",
+        "view": name,
+        "sql": f"${{TABLE}}.field_{index}",
+        "is_filter": False,
+        "is_numeric": index % 3 == 0,
+        "tags": [],
+        "enumerations": None,
+        "suggestions": [f"value {v}" for v in range(index % 5)],
+        "map_layer": None,
+    }
+
+
+def lookml_model_explore(views: int = 30, fields_per_view: int = 40) -> TJson:
+    """An explore with views*fields_per_view fields, like a big LookML model
+    """
+    dimensions: List[TJson] = []
+    measures: List[TJson] = []
+    for v in range(views):
+        for f in range(fields_per_view):
+            field = explore_field(f"view_{v}", f)
+            (measures if field["category"] == "measure" else dimensions).append(field)
+    return {
+        "id": "thelook::order_items",
+        "name": "order_items",
+        "model_name": "thelook",
+        "label": "Order Items",
+        "scopes": [f"view_{v}" for v in range(views)],
+        "joins": [{"name": f"view_{v}", "dependent_fields": []} for v in range(views)],
+        "fields": {
+            "dimensions": dimensions,
+            "measures": measures,
+            "filters": [],
+            "parameters": [],
+        },
+        "sets": [{"name": "detail", "value": [d["name"] for d in dimensions[:50]]}],
+    }
+
+
+def query_rows(count: int, seed: int = 0) -> List[TJson]:
+    """Rows like those returned by run_inline_query with result_format=json
+    """
+    rnd = random.Random(seed)
+    return [
+        {
+            "orders.created_date": timestamp(r * 3600)[:10],
+            "orders.count": rnd.randint(0, 1000),
+            "products.brand": f"Brand {rnd.randint(0, 200)}",
+        }
+        for r in range(count)
+    ]
+
+
+def dumps(payload: Any) -> bytes:
+    return json.dumps(payload).encode("utf-8")
@@ -0,0 +1,243 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Local stand-in for a Looker server
+
+Serves synthetic (or recorded) responses so the SDK can be exercised without
+a Looker instance:
+
+    with server.MockLookerServer() as looker:
+        settings = api_settings.ApiSettings(base_url=looker.base_url)
+"""
+import argparse
+import contextlib
+import http.server
+import json
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Tuple
+
+from benchmarks import payloads
+
+TRoute = Callable[["re.Match"], Tuple[int, bytes]]
+
+
+class MockLookerServer:
+    """Threaded HTTP/1.1 keep-alive server answering a few API endpoints.
+
+    `recorded` maps "METHOD /path" (path below /api/<version>) to a response
+    body and takes precedence over the synthetic routes. `latency` is added
+    to every response to simulate a remote server.
+    """
+
+    def __init__(
+        self,
+        api_version: str = "3.1",
+        users: int = 100,
+        rows: int = 500,
+        dashboard_elements: int = 20,
+        latency: float = 0.0,
+        recorded: Optional[Dict[str, bytes]] = None,
+    ):
+        self.api_version = api_version
+        self.latency = latency
+        self.recorded = recorded or {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._routes: List[Tuple[str, Pattern[str], TRoute]] = []
+        self._cache: Dict[str, bytes] = {}
+
+        token = payloads.dumps(payloads.access_token())
+        users_body = payloads.dumps(payloads.users(users))
+        rows_body = payloads.dumps(payloads.query_rows(rows))
+        self.route("POST", r"/login", lambda m: (200, token))
+        self.route("POST", r"/login/(\d+)", lambda m: (200, token))
+        self.route("DELETE", r"/logout", lambda m: (204, b""))
+        self.route("GET", r"/me", lambda m: (200, payloads.dumps(payloads.user(1))))
+        self.route(
+            "GET",
+            r"/users/(\d+)",
+            lambda m: (200, payloads.dumps(payloads.user(int(m.group(1))))),
+        )
+        self.route("GET", r"/users/search", lambda m: (200, users_body))
+        self.route("GET", r"/users", lambda m: (200, users_body))
+        self.route(
+            "GET",
+            r"/dashboards/(\d+)",
+            lambda m: (
+                200,
+                payloads.dumps(payloads.dashboard(int(m.group(1)), dashboard_elements)),
+            ),
+        )
+        self.route(
+            "GET",
+            r"/lookml_models/(\w+)/explores/(\w+)",
+            lambda m: (200, self._cached("explore", payloads.lookml_model_explore)),
+        )
+        self.route("POST", r"/queries/run/json", lambda m: (200, rows_body))
+        self.route("GET", r"/queries/(\d+)/run/json", lambda m: (200, rows_body))
+
+        self._httpd: Optional[http.server.ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def route(self, method: str, pattern: str, handler: TRoute) -> None:
+        """Answer `method pattern` requests with handler(match) -> (status, body)
+        """
+        self._routes.append((method, re.compile(f"^{pattern}$"), handler))
+
+    def _cached(self, key: str, build: Callable[[], object]) -> bytes:
+        if key not in self._cache:
+            self._cache[key] = payloads.dumps(build())
+        return self._cache[key]
+
+    @property
+    def base_url(self) -> str:
+        assert self._httpd, "server is not running"
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, method: str, path: str) -> Tuple[int, bytes]:
+        with self._lock:
+            self.requests += 1
+        prefix = f"/api/{self.api_version}"
+        if not path.startswith(prefix):
+            return 404, b'{"message": "Not found"}'
+        path = path[len(prefix) :].split("?", 1)[0]
+        recorded = self.recorded.get(f"{method} {path}")
+        if recorded is not None:
+            return 200, recorded
+        for route_method, pattern, handler in self._routes:
+            if route_method == method:
+                match = pattern.match(path)
+                if match:
+                    return handler(match)
+        return 404, json.dumps({"message": f"No route for {method} {path}"}).encode()
+
+    def start(self) -> "MockLookerServer":
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately; avoid Nagle delays
+            disable_nagle_algorithm = True
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                if server.latency:
+                    time.sleep(server.latency)
+                status, body = server.respond(self.command, self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "MockLookerServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def load_recorded(filename: str) -> Dict[str, bytes]:
+    """Read recorded responses: a JSON object of "METHOD /path" -> response
+    """
+    with open(filename) as f:
+        recorded = json.load(f)
+    return {key: json.dumps(value).encode("utf-8") for key, value in recorded.items()}
+
+
+@contextlib.contextmanager
+def serve_in_process(
+    users: int = 100,
+    rows: int = 500,
+    latency: float = 0.0,
+    recorded: Optional[str] = None,
+) -> Iterator[str]:
+    """Run a MockLookerServer in a child process and yield its base_url.
+
+    Keeps the server off the benchmarked process' GIL so multi-threaded
+    results measure the SDK rather than the stand-in.
+    """
+    args = [
+        sys.executable,
+        "-m",
+        "benchmarks.server",
+        f"--users={users}",
+        f"--rows={rows}",
+        f"--latency={latency}",
+    ]
+    if recorded:
+        args.append(f"--recorded={recorded}")
+    child = subprocess.Popen(args, stdout=subprocess.PIPE, universal_newlines=True)
+    try:
+        assert child.stdout
+        yield child.stdout.readline().strip()
+    finally:
+        child.terminate()
+        child.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a mock Looker API")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--recorded", help="JSON file of recorded responses")
+    args = parser.parse_args()
+    recorded = load_recorded(args.recorded) if args.recorded else None
+    looker = MockLookerServer(
+        users=args.users, rows=args.rows, latency=args.latency, recorded=recorded
+    )
+    looker.start()
+    print(looker.base_url, flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        looker.stop()
+
+
+if __name__ == "__main__":
+    main()
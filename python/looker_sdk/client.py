@@ -22,26 +22,202 @@
 
 """Client entry point
 """
-from typing import Optional
+import concurrent.futures as cf
+import configparser as cp
+import importlib
+import itertools
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
 
+import requests
+
+from looker_sdk import error
 from looker_sdk.rtl import api_settings
+from looker_sdk.rtl import circuit_breaker
+from looker_sdk.rtl import hedging
+from looker_sdk.rtl import instrumentation as instr
 from looker_sdk.rtl import requests_transport
 from looker_sdk.rtl import serialize
+from looker_sdk.rtl import token_store as ts
+from looker_sdk.rtl import transport as tp
 from looker_sdk.rtl import auth_session
 from looker_sdk.sdk import methods
 
+T = TypeVar("T")
+
 
 def setup(
-    config_file: str = "looker.ini", section: Optional[str] = None
+    config_file: str = "looker.ini",
+    section: Optional[str] = None,
+    token_store: Optional[ts.TokenStore] = None,
 ) -> methods.LookerSDK:
     """Default dependency configuration
+
+    Pass a token_store (e.g. token_store.FileTokenStore) to share auth
+    tokens with other processes that use the same store.
     """
     settings = api_settings.ApiSettings.configure(config_file, section)
     settings.headers = {"Content-Type": "application/json"}
-    transport = requests_transport.RequestsTransport.configure(settings)
+    return _sdk(settings, configure_transport(settings), token_store)
+
+
+# transport implementations for the "transport" setting, imported on use
+TRANSPORTS = {
+    "requests": "looker_sdk.rtl.requests_transport:RequestsTransport",
+    "httpx": "looker_sdk.rtl.httpx_transport:HttpxTransport",
+    "urllib3": "looker_sdk.rtl.urllib3_transport:Urllib3Transport",
+}
+
+
+def configure_transport(settings: api_settings.ApiSettings) -> tp.Transport:
+    """Transport implementation chosen by settings.transport, wrapped as
+    settings.hedge and settings.circuit_breaker ask
+    """
+    return _wrap(settings, _configure(settings))
+
+
+def _configure(settings: api_settings.ApiSettings) -> tp.Transport:
+    try:
+        module, name = TRANSPORTS[settings.transport].split(":")
+    except KeyError:
+        raise error.SDKError(
+            f"Unknown transport {settings.transport!r}, "
+            f"expected one of {', '.join(TRANSPORTS)}."
+        ) from None
+    transport_class = cast(
+        Type[tp.Transport], getattr(importlib.import_module(module), name)
+    )
+    return transport_class.configure(settings)
+
+
+def _wrap(settings: api_settings.ApiSettings, transport: tp.Transport) -> tp.Transport:
+    if settings.hedge:
+        transport = hedging.HedgingTransport(transport)
+    # outside hedging, so a hedged call counts once
+    if settings.circuit_breaker:
+        transport = circuit_breaker.CircuitBreakerTransport(transport)
+    return transport
+
+
+def _sdk(
+    settings: api_settings.ApiSettings,
+    transport: tp.Transport,
+    token_store: Optional[ts.TokenStore] = None,
+) -> methods.LookerSDK:
     return methods.LookerSDK(
-        auth_session.AuthSession(settings, transport, serialize.deserialize),
+        auth_session.AuthSession(
+            settings, transport, serialize.deserialize, token_store
+        ),
         serialize.deserialize,
         serialize.serialize,
         transport,
     )
+
+
+class LookerClientPool(Mapping[str, methods.LookerSDK]):
+    """SDK clients for several Looker instances, keyed by ini section.
+
+    Every client has its own settings, session and auth, but all of them
+    report to one Instrumentation, and those using the requests transport
+    send requests through one shared connection pool. Clients of other
+    transports keep their own connections. sections defaults to every
+    section in config_file.
+    """
+
+    def __init__(
+        self,
+        config_file: str = "looker.ini",
+        sections: Optional[Iterable[str]] = None,
+        instrumentation: Optional[instr.Instrumentation] = None,
+        pool_maxsize: int = 10,
+        max_workers: Optional[int] = None,
+        token_store: Optional[ts.TokenStore] = None,
+    ):
+        if sections is None:
+            cfg_parser = cp.ConfigParser()
+            with open(config_file) as f:
+                cfg_parser.read_file(f)
+            sections = cfg_parser.sections()
+        sections = list(sections)
+        self.instrumentation = instrumentation or instr.Instrumentation()
+        # urllib3 keeps one connection pool per host inside the adapter
+        self.adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max(len(sections), 1), pool_maxsize=pool_maxsize
+        )
+        self.max_workers = max_workers or max(len(sections), 1)
+        self._clients: Dict[str, methods.LookerSDK] = {}
+        for section in sections:
+            settings = api_settings.ApiSettings.configure(config_file, section)
+            settings.headers = {"Content-Type": "application/json"}
+            if settings.transport == "requests":
+                session = requests.Session()
+                session.mount("https://", self.adapter)
+                session.mount("http://", self.adapter)
+                transport: tp.Transport = requests_transport.RequestsTransport(
+                    settings, session, self.instrumentation
+                )
+            else:
+                transport = _configure(settings)
+                transport.instrumentation = self.instrumentation
+            self._clients[section] = _sdk(
+                settings, _wrap(settings, transport), token_store
+            )
+
+    def __getitem__(self, key: str) -> methods.LookerSDK:
+        return self._clients[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._clients)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def map(
+        self,
+        call: Callable[[methods.LookerSDK], T],
+        keys: Optional[Iterable[str]] = None,
+        return_exceptions: bool = False,
+    ) -> Dict[str, T]:
+        """Run call(sdk) for every client (or those in keys) in parallel.
+
+        Returns {key: result} in key order. If a call raises, the first
+        exception is re-raised once all calls have finished, unless
+        return_exceptions is set, in which case it becomes that key's result.
+        """
+        keys = list(self._clients if keys is None else keys)
+        with cf.ThreadPoolExecutor(min(self.max_workers, len(keys) or 1)) as pool:
+            futures = [pool.submit(call, self._clients[key]) for key in keys]
+        results: Dict[str, Any] = {}
+        for key, future in zip(keys, futures):
+            exc = future.exception()
+            if exc is not None and not return_exceptions:
+                raise exc
+            results[key] = exc if exc is not None else future.result()
+        return results
+
+    def merge(
+        self,
+        call: Callable[[methods.LookerSDK], Sequence[T]],
+        keys: Optional[Iterable[str]] = None,
+    ) -> List[T]:
+        """Concatenate the sequences call(sdk) returns for each client.
+        """
+        return list(itertools.chain.from_iterable(self.map(call, keys).values()))
+
+    def close(self) -> None:
+        """Log out every client and close the shared connections.
+        """
+        self.map(lambda sdk: sdk.auth.logout(full=True), return_exceptions=True)
+        self.adapter.close()
@@ -0,0 +1,430 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Export and import looks and dashboards as newline-delimited JSON
+
+Exporter fetches looks, then dashboards (with their elements, filters and
+queries), several at a time, and writes each as one line as soon as it
+arrives, so memory use does not grow with the amount of content:
+
+    {"kind": "look", "id": 12, "data": {...}}
+
+Importer reads the file twice, creating looks and then dashboards on a
+bounded thread pool. New queries are created for looks and dashboard
+elements, and elements are pointed at the new ids of the looks they show.
+
+Both resume an interrupted run: the export file itself records what was
+exported, and the import appends the new id of everything it creates to
+a "<path>.ids" file.
+"""
+import concurrent.futures as cf
+import functools
+import json
+import logging
+import os
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+import attr
+import cattr
+
+from looker_sdk import error
+from looker_sdk.rtl import model
+from looker_sdk.rtl import paging
+from looker_sdk.sdk import methods
+from looker_sdk.sdk import models
+
+KINDS = ("look", "dashboard")
+
+T = TypeVar("T")
+TKey = Tuple[str, str]
+# a JSON object, as exported
+TData = Dict[str, object]
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class Failure:
+    kind: str
+    id: str
+    error: str
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class Report:
+    """Outcome of an export or import.
+
+    skipped counts what an earlier, interrupted run already did.
+    """
+
+    done: int = 0
+    skipped: int = 0
+    failed: List[Failure] = attr.Factory(list)
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class _Line:
+    kind: str
+    id: str
+    data: TData
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class _Result:
+    kind: str
+    id: str
+    line: Optional[str] = None
+    new_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class Exporter:
+    """Writes every look and dashboard of an instance to an NDJSON file.
+    """
+
+    def __init__(
+        self, sdk: methods.LookerSDK, concurrency: int = 8, per_page: int = 500
+    ):
+        self.sdk = sdk
+        self.concurrency = concurrency
+        self.per_page = per_page
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, path: str, resume: bool = False) -> Report:
+        """Export to path.
+
+        With resume=True, content already in path is kept and not fetched
+        again. Otherwise path is overwritten.
+        """
+        done = _exported(path) if resume else set()
+        report = Report()
+        with open(path, "a" if resume else "w", encoding="utf-8") as out:
+            for kind in KINDS:
+                ids = self._look_ids() if kind == "look" else self._dashboard_ids()
+                todo = [id for id in ids if (kind, id) not in done]
+                report.skipped += len(ids) - len(todo)
+                results = _bounded(
+                    functools.partial(self._export, kind), todo, self.concurrency
+                )
+                for result in results:
+                    if result.line is not None:
+                        out.write(result.line)
+                        out.flush()
+                        report.done += 1
+                    else:
+                        report.failed.append(_failure(result))
+        return report
+
+    def _look_ids(self) -> List[str]:
+        def fetch(page: int, per_page: int) -> Sequence[models.Look]:
+            return self.sdk.search_looks(
+                fields="id", page=page, per_page=per_page, sorts="id"
+            )
+
+        looks = paging.fetch_all(fetch, self.per_page, self.concurrency)
+        return [str(look.id) for look in looks if look.id is not None]
+
+    def _dashboard_ids(self) -> List[str]:
+        def fetch(page: int, per_page: int) -> Sequence[models.Dashboard]:
+            return self.sdk.search_dashboards(
+                fields="id", page=page, per_page=per_page, sorts="id"
+            )
+
+        dashboards = paging.fetch_all(fetch, self.per_page, self.concurrency)
+        return [str(d.id) for d in dashboards if d.id is not None]
+
+    def _export(self, kind: str, id: str) -> _Result:
+        try:
+            if kind == "look":
+                content: model.Model = self.sdk.look(int(id))
+            else:
+                content = self.sdk.dashboard(id)
+            data: object = cattr.unstructure(content)
+            record: TData = {"kind": kind, "id": id, "data": data}
+            line = json.dumps(record)
+        except (error.SDKError, IOError) as exc:
+            return self._fail(kind, id, str(exc))
+        except Exception as exc:  # pylint: disable=broad-except
+            # e.g. content that does not serialize: fail only this item
+            return self._fail(kind, id, repr(exc))
+        return _Result(kind=kind, id=id, line=line + "\n")
+
+    def _fail(self, kind: str, id: str, reason: str) -> _Result:
+        self.logger.warning("exporting %s %s failed: %s", kind, id, reason)
+        return _Result(kind=kind, id=id, error=reason)
+
+
+class Importer:
+    """Creates the looks and dashboards of an export file.
+
+    folder_ids maps folder ids of the exporting instance to folders of
+    this one; other folder ids are used as they are. Content is owned by
+    the importing user.
+    """
+
+    def __init__(
+        self,
+        sdk: methods.LookerSDK,
+        concurrency: int = 8,
+        folder_ids: Optional[Mapping[str, str]] = None,
+    ):
+        self.sdk = sdk
+        self.concurrency = concurrency
+        self.folder_ids = {str(k): str(v) for k, v in (folder_ids or {}).items()}
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, path: str) -> Report:
+        """Import path, skipping what an earlier run recorded in "<path>.ids".
+        """
+        ids_path = f"{path}.ids"
+        new_ids = _imported(ids_path)
+        report = Report()
+        with open(ids_path, "a", encoding="utf-8") as ids_file:
+            for kind in KINDS:
+                todo = self._read(path, kind, new_ids, report)
+                call = self._look if kind == "look" else self._dashboard
+                results = _bounded(
+                    functools.partial(self._import, call, new_ids=new_ids),
+                    todo,
+                    self.concurrency,
+                )
+                for result in results:
+                    if result.new_id is not None:
+                        new_ids[(result.kind, result.id)] = result.new_id
+                        record: TData = {
+                            "kind": result.kind,
+                            "id": result.id,
+                            "new_id": result.new_id,
+                        }
+                        ids_file.write(json.dumps(record) + "\n")
+                        ids_file.flush()
+                        report.done += 1
+                    else:
+                        report.failed.append(_failure(result))
+        return report
+
+    def _read(
+        self, path: str, kind: str, new_ids: Dict[TKey, str], report: Report
+    ) -> Iterator[_Line]:
+        for line in _lines(path):
+            if line["kind"] != kind:
+                continue
+            id = str(line["id"])
+            if (kind, id) in new_ids:
+                report.skipped += 1
+            else:
+                yield _Line(kind=kind, id=id, data=_object(line["data"]))
+
+    def _import(
+        self,
+        call: Callable[[TData, Dict[TKey, str]], str],
+        line: _Line,
+        new_ids: Dict[TKey, str],
+    ) -> _Result:
+        try:
+            new_id = call(line.data, new_ids)
+        except error.SDKError as exc:
+            self.logger.warning("importing %s %s failed: %s", line.kind, line.id, exc)
+            return _Result(kind=line.kind, id=line.id, error=str(exc))
+        return _Result(kind=line.kind, id=line.id, new_id=new_id)
+
+    def _look(self, data: TData, new_ids: Dict[TKey, str]) -> str:
+        look = self.sdk.create_look(
+            body=_write(
+                models.WriteLookWithQuery,
+                data,
+                drop=("query", "user_id"),
+                space_id=self._folder(data.get("space_id")),
+                query_id=self._query(data.get("query")),
+            )
+        )
+        return str(_created(look.id, "look"))
+
+    def _dashboard(self, data: TData, new_ids: Dict[TKey, str]) -> str:
+        elements = _objects(data.get("dashboard_elements"))
+        look_ids = [_look_id(element, new_ids) for element in elements]
+        dashboard = self.sdk.create_dashboard(
+            body=_write(
+                models.WriteDashboard,
+                data,
+                drop=(
+                    "dashboard_elements",
+                    "dashboard_filters",
+                    "dashboard_layouts",
+                    "user_id",
+                ),
+                space_id=self._folder(data.get("space_id")),
+            )
+        )
+        dashboard_id = _created(dashboard.id, "dashboard")
+        try:
+            for dashboard_filter in _objects(data.get("dashboard_filters")):
+                self.sdk.create_dashboard_filter(
+                    body=_write(
+                        models.WriteCreateDashboardFilter,
+                        dashboard_filter,
+                        dashboard_id=dashboard_id,
+                    )
+                )
+            for element, look_id in zip(elements, look_ids):
+                self.sdk.create_dashboard_element(
+                    body=_write(
+                        models.WriteDashboardElement,
+                        element,
+                        drop=("look", "query", "result_maker", "result_maker_id"),
+                        dashboard_id=dashboard_id,
+                        look_id=look_id,
+                        query_id=self._query(element.get("query")),
+                    )
+                )
+        except error.SDKError:
+            # so that a later run creates the whole dashboard again
+            try:
+                self.sdk.delete_dashboard(dashboard_id)
+            except error.SDKError as exc:
+                self.logger.warning(
+                    "deleting dashboard %s failed: %s", dashboard_id, exc
+                )
+            raise
+        return dashboard_id
+
+    def _query(self, data: object) -> Optional[int]:
+        if not data:
+            return None
+        query = self.sdk.create_query(
+            body=_write(models.WriteQuery, _object(data), drop=("client_id", "slug"))
+        )
+        return _created(query.id, "query")
+
+    def _folder(self, folder_id: object) -> Optional[str]:
+        if folder_id is None:
+            return None
+        return self.folder_ids.get(str(folder_id), str(folder_id))
+
+
+def _write(cls: Type[T], data: TData, drop: Iterable[str] = (), **values: object) -> T:
+    """cls built from exported data, without the dropped keys and with values
+    """
+    data = {key: value for key, value in data.items() if key not in drop}
+    data.update(values)
+    return cattr.structure(data, cls)
+
+
+def _look_id(element: TData, new_ids: Dict[TKey, str]) -> Optional[int]:
+    """New id of the look a dashboard element shows, if it shows one
+    """
+    look_id = element.get("look_id")
+    if look_id is None:
+        return None
+    key = ("look", str(look_id))
+    if key not in new_ids:
+        raise error.SDKError(f"look {look_id} was not imported")
+    return int(new_ids[key])
+
+
+def _created(id: Optional[T], kind: str) -> T:
+    if id is None:
+        raise error.SDKError(f"{kind} was created without an id")
+    return id
+
+
+def _object(value: object) -> TData:
+    if not isinstance(value, dict):
+        raise error.SDKError(f"expected a JSON object, not {value!r}")
+    return cast(TData, value)
+
+
+def _objects(value: object) -> List[TData]:
+    if not value:
+        return []
+    if not isinstance(value, list):
+        raise error.SDKError(f"expected a JSON array, not {value!r}")
+    return [_object(item) for item in cast(List[object], value)]
+
+
+def _bounded(
+    call: Callable[[T], _Result], items: Iterable[T], limit: int
+) -> Iterator[_Result]:
+    """call(item) for each item on a pool, results as they complete.
+
+    No more than limit items are taken from items ahead of the results.
+    """
+    with cf.ThreadPoolExecutor(limit) as pool:
+        running: Set["cf.Future[_Result]"] = set()
+        for item in items:
+            if len(running) >= limit:
+                done, running = cf.wait(running, return_when=cf.FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            running.add(pool.submit(call, item))
+        yield from (future.result() for future in cf.as_completed(running))
+
+
+def _lines(path: str) -> Iterator[TData]:
+    with open(path, encoding="utf-8") as lines:
+        for line in lines:
+            if line.endswith("\n"):
+                content: object = json.loads(line)
+                yield _object(content)
+
+
+def _exported(path: str) -> Set[TKey]:
+    """(kind, id) of each complete line of path, dropping a partial last line
+    """
+    if not os.path.exists(path):
+        return set()
+    exported: Set[TKey] = set()
+    with open(path, "rb+") as export:
+        complete = 0
+        for line in export:
+            if not line.endswith(b"\n"):
+                break
+            content: object = json.loads(line)
+            record = _object(content)
+            exported.add((str(record["kind"]), str(record["id"])))
+            complete += len(line)
+        export.truncate(complete)
+    return exported
+
+
+def _imported(path: str) -> Dict[TKey, str]:
+    if not os.path.exists(path):
+        return {}
+    return {
+        (str(line["kind"]), str(line["id"])): str(line["new_id"])
+        for line in _lines(path)
+    }
+
+
+def _failure(result: _Result) -> Failure:
+    return Failure(kind=result.kind, id=result.id, error=result.error or "")
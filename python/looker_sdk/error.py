@@ -27,3 +27,13 @@
 class SDKError(Exception):
     """API error class
     """
+
+
+class DeadlineExceeded(SDKError):
+    """The time allowed by an SDK deadline ran out
+    """
+
+
+class CircuitOpen(SDKError):
+    """A circuit breaker refused the request without sending it
+    """
@@ -0,0 +1,488 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Local SQLite mirror of users, folders, looks, dashboards and their queries
+
+Mirror.sync() fills the database with parallel paginated fetches, and
+Mirror.refresh() keeps it current: looks are fetched newest updated_at
+first until the last one already mirrored, looks deleted since the last
+refresh are removed, and the collections without an updated_at in API 3.1
+(users, folders and dashboards) are fetched again in full, in parallel.
+Lookups such as find_looks() or dashboards_using_explore() then run
+against indexed tables instead of the API.
+
+Reads are safe from any number of threads: each gets its own connection,
+and the database uses write-ahead logging, so a refresh never blocks them.
+"""
+import concurrent.futures as cf
+import contextlib
+import datetime
+import functools
+import sqlite3
+import threading
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import attr
+
+from looker_sdk.rtl import paging
+from looker_sdk.rtl import timestamp
+from looker_sdk.sdk import methods
+from looker_sdk.sdk import models
+
+T = TypeVar("T")
+TValue = Union[str, int, float, bytes, None]
+TRow = Dict[str, TValue]
+
+USER_FIELDS = "id,email,first_name,last_name,display_name,is_disabled"
+FOLDER_FIELDS = "id,name,parent_id"
+LOOK_FIELDS = "id,title,description,space_id,user_id,updated_at,query(id,model,view)"
+DASHBOARD_FIELDS = (
+    "id,title,description,space_id,user_id,"
+    "dashboard_elements(id,look_id,query(id,model,view))"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY, email TEXT COLLATE NOCASE, first_name TEXT,
+    last_name TEXT, display_name TEXT, is_disabled INTEGER
+);
+CREATE INDEX IF NOT EXISTS users_email ON users (email);
+CREATE TABLE IF NOT EXISTS folders (id TEXT PRIMARY KEY, name TEXT, parent_id TEXT);
+CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent_id);
+CREATE TABLE IF NOT EXISTS queries (id INTEGER PRIMARY KEY, model TEXT, view TEXT);
+CREATE INDEX IF NOT EXISTS queries_explore ON queries (model, view);
+CREATE TABLE IF NOT EXISTS looks (
+    id INTEGER PRIMARY KEY, title TEXT COLLATE NOCASE, description TEXT,
+    folder_id TEXT, user_id INTEGER, query_id INTEGER, updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS looks_title ON looks (title);
+CREATE INDEX IF NOT EXISTS looks_folder ON looks (folder_id);
+CREATE INDEX IF NOT EXISTS looks_query ON looks (query_id);
+CREATE TABLE IF NOT EXISTS dashboards (
+    id TEXT PRIMARY KEY, title TEXT COLLATE NOCASE, description TEXT,
+    folder_id TEXT, user_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS dashboards_title ON dashboards (title);
+CREATE INDEX IF NOT EXISTS dashboards_folder ON dashboards (folder_id);
+CREATE TABLE IF NOT EXISTS dashboard_elements (
+    id TEXT PRIMARY KEY, dashboard_id TEXT, look_id INTEGER, query_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS elements_dashboard ON dashboard_elements (dashboard_id);
+CREATE INDEX IF NOT EXISTS elements_look ON dashboard_elements (look_id);
+CREATE INDEX IF NOT EXISTS elements_query ON dashboard_elements (query_id);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# re-read rows this much older than the last refresh, in case clocks differ
+OVERLAP = datetime.timedelta(minutes=5)
+# sorts after every other character, to turn a prefix into a range
+_LAST = "\U0010ffff"
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class _Fetched:
+    users: Sequence[models.User]
+    folders: Sequence[models.Space]
+    looks: Sequence[models.Look]
+    dashboards: Sequence[models.Dashboard]
+    deleted_looks: Sequence[models.Look] = ()
+
+
+class Mirror:
+    """Mirror of one Looker instance in the SQLite database at path.
+    """
+
+    def __init__(
+        self,
+        sdk: methods.LookerSDK,
+        path: str,
+        concurrency: int = 8,
+        per_page: int = 500,
+        timeout: float = 30.0,
+    ):
+        self.sdk = sdk
+        self.path = path
+        self.concurrency = concurrency
+        self.per_page = per_page
+        self.timeout = timeout
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # connections cannot be shared between threads
+        connection: Optional[sqlite3.Connection] = getattr(
+            self._local, "connection", None
+        )
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.row_factory = _row
+            self._local.connection = connection
+        return connection
+
+    # filling and refreshing
+
+    def sync(self) -> None:
+        """Replace the mirror with a full copy of the instance.
+        """
+        started = _now()
+        fetched = self._fetch(self._looks)
+        with self._transaction() as connection:
+            for table in (
+                "users",
+                "folders",
+                "queries",
+                "looks",
+                "dashboards",
+                "dashboard_elements",
+            ):
+                connection.execute(f"DELETE FROM {table}")
+            self._write(connection, fetched)
+            self._set(connection, "looks_updated_at", _latest(fetched.looks) or started)
+            self._set(connection, "deleted_at", started)
+
+    def refresh(self) -> None:
+        """Bring the mirror up to date with what changed since the last sync.
+        """
+        started = _now()
+        since = self._get("looks_updated_at")
+        deleted_since = self._get("deleted_at")
+        if since is None or deleted_since is None:
+            self.sync()
+            return
+        fetched = self._fetch(
+            functools.partial(self._newer, LOOK_FIELDS, "updated_at", since),
+            functools.partial(
+                self._newer, "id,deleted_at", "deleted_at", deleted_since
+            ),
+        )
+        with self._transaction() as connection:
+            for table in ("users", "folders", "dashboards", "dashboard_elements"):
+                connection.execute(f"DELETE FROM {table}")
+            self._write(connection, fetched)
+            connection.executemany(
+                "DELETE FROM looks WHERE id = ?",
+                [(look.id,) for look in fetched.deleted_looks],
+            )
+            self._set(
+                connection, "looks_updated_at", _latest(fetched.looks) or since,
+            )
+            self._set(connection, "deleted_at", started)
+
+    def _fetch(
+        self,
+        looks: Callable[[], Sequence[models.Look]],
+        deleted_looks: Optional[Callable[[], Sequence[models.Look]]] = None,
+    ) -> _Fetched:
+        """Users, folders and dashboards, and the looks and deleted_looks
+        given, all fetched in parallel.
+        """
+        with cf.ThreadPoolExecutor(5) as pool:
+            users = pool.submit(self._users)
+            folders = pool.submit(self.sdk.all_spaces, fields=FOLDER_FIELDS)
+            dashboards = pool.submit(self._dashboards)
+            changed = pool.submit(looks)
+            deleted = pool.submit(deleted_looks) if deleted_looks else None
+        return _Fetched(
+            users=users.result(),
+            folders=folders.result(),
+            looks=changed.result(),
+            dashboards=dashboards.result(),
+            deleted_looks=deleted.result() if deleted else (),
+        )
+
+    def _fetch_all(self, fetch: paging.TFetch[T]) -> List[T]:
+        return paging.fetch_all(fetch, self.per_page, self.concurrency)
+
+    def _users(self) -> List[models.User]:
+        def fetch(page: int, per_page: int) -> Sequence[models.User]:
+            return self.sdk.all_users(
+                fields=USER_FIELDS, page=page, per_page=per_page, sorts="id"
+            )
+
+        return self._fetch_all(fetch)
+
+    def _looks(self) -> List[models.Look]:
+        def fetch(page: int, per_page: int) -> Sequence[models.Look]:
+            return self.sdk.search_looks(
+                fields=LOOK_FIELDS, page=page, per_page=per_page, sorts="id"
+            )
+
+        return self._fetch_all(fetch)
+
+    def _dashboards(self) -> List[models.Dashboard]:
+        def fetch(page: int, per_page: int) -> Sequence[models.Dashboard]:
+            return self.sdk.search_dashboards(
+                fields=DASHBOARD_FIELDS, page=page, per_page=per_page, sorts="id"
+            )
+
+        return self._fetch_all(fetch)
+
+    def _newer(self, fields: str, field: str, since: str) -> List[models.Look]:
+        """Looks whose field is at or after since, newest first.
+
+        Pages are read one at a time and reading stops at the first look
+        older than since, less OVERLAP. deleted_at searches only return
+        deleted looks.
+        """
+        cutoff = timestamp.parse(since) - OVERLAP
+        deleted = True if field == "deleted_at" else None
+        looks: List[models.Look] = []
+        page = 1
+        while True:
+            batch = self.sdk.search_looks(
+                fields=fields,
+                page=page,
+                per_page=self.per_page,
+                sorts=f"{field} desc",
+                deleted=deleted,
+            )
+            for look in batch:
+                value: Optional[datetime.datetime] = getattr(look, field)
+                if value is not None and value < cutoff:
+                    return looks
+                looks.append(look)
+            if len(batch) < self.per_page:
+                return looks
+            page += 1
+
+    def _write(self, connection: sqlite3.Connection, fetched: _Fetched) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    u.id,
+                    u.email,
+                    u.first_name,
+                    u.last_name,
+                    u.display_name,
+                    u.is_disabled,
+                )
+                for u in fetched.users
+            ],
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO folders VALUES (?, ?, ?)",
+            [(f.id, f.name, f.parent_id) for f in fetched.folders],
+        )
+        queries: Dict[int, Tuple[TValue, ...]] = {}
+        looks: List[Tuple[TValue, ...]] = []
+        for look in fetched.looks:
+            query_id = _add_query(queries, look.query)
+            looks.append(
+                (
+                    look.id,
+                    look.title,
+                    look.description,
+                    look.space_id,
+                    look.user_id,
+                    query_id,
+                    look.updated_at.isoformat() if look.updated_at else None,
+                )
+            )
+        dashboards: List[Tuple[TValue, ...]] = []
+        elements: List[Tuple[TValue, ...]] = []
+        for dashboard in fetched.dashboards:
+            dashboards.append(
+                (
+                    dashboard.id,
+                    dashboard.title,
+                    dashboard.description,
+                    dashboard.space_id,
+                    dashboard.user_id,
+                )
+            )
+            for element in dashboard.dashboard_elements or ():
+                elements.append(
+                    (
+                        element.id,
+                        dashboard.id,
+                        element.look_id,
+                        _add_query(queries, element.query),
+                    )
+                )
+        connection.executemany(
+            "INSERT OR REPLACE INTO queries VALUES (?, ?, ?)", queries.values()
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO looks VALUES (?, ?, ?, ?, ?, ?, ?)", looks
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO dashboards VALUES (?, ?, ?, ?, ?)", dashboards
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO dashboard_elements VALUES (?, ?, ?, ?)", elements
+        )
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction, one at a time within the process.
+        """
+        connection = self._connection()
+        with self._write_lock:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self._one("SELECT value FROM state WHERE key = ?", key)
+        value = row["value"] if row else None
+        return value if isinstance(value, str) else None
+
+    def _set(
+        self, connection: sqlite3.Connection, key: str, value: Optional[str]
+    ) -> None:
+        connection.execute("INSERT OR REPLACE INTO state VALUES (?, ?)", (key, value))
+
+    # local lookups
+
+    def _rows(self, sql: str, *params: TValue) -> List[TRow]:
+        rows: List[TRow] = self._connection().execute(sql, params).fetchall()
+        return rows
+
+    def _one(self, sql: str, *params: TValue) -> Optional[TRow]:
+        rows = self._rows(sql, *params)
+        return rows[0] if rows else None
+
+    def user(self, user_id: int) -> Optional[TRow]:
+        return self._one("SELECT * FROM users WHERE id = ?", user_id)
+
+    def user_by_email(self, email: str) -> Optional[TRow]:
+        return self._one("SELECT * FROM users WHERE email = ?", email)
+
+    def look(self, look_id: int) -> Optional[TRow]:
+        return self._one("SELECT * FROM looks WHERE id = ?", look_id)
+
+    def dashboard(self, dashboard_id: str) -> Optional[TRow]:
+        return self._one("SELECT * FROM dashboards WHERE id = ?", str(dashboard_id))
+
+    def find_looks(self, title_prefix: str) -> List[TRow]:
+        """Looks whose title starts with title_prefix, ignoring case.
+        """
+        return self._rows(
+            "SELECT * FROM looks WHERE title >= ? AND title < ? ORDER BY title",
+            title_prefix,
+            title_prefix + _LAST,
+        )
+
+    def find_dashboards(self, title_prefix: str) -> List[TRow]:
+        """Dashboards whose title starts with title_prefix, ignoring case.
+        """
+        return self._rows(
+            "SELECT * FROM dashboards WHERE title >= ? AND title < ? ORDER BY title",
+            title_prefix,
+            title_prefix + _LAST,
+        )
+
+    def folder_contents(self, folder_id: str) -> Dict[str, List[TRow]]:
+        """{"folders": [...], "looks": [...], "dashboards": [...]} in folder_id
+        """
+        return {
+            table: self._rows(
+                f"SELECT * FROM {table} WHERE {column} = ? ORDER BY id", str(folder_id),
+            )
+            for table, column in (
+                ("folders", "parent_id"),
+                ("looks", "folder_id"),
+                ("dashboards", "folder_id"),
+            )
+        }
+
+    def looks_using_explore(self, model: str, explore: str) -> List[TRow]:
+        return self._rows(
+            "SELECT looks.* FROM looks JOIN queries ON queries.id = looks.query_id"
+            " WHERE queries.model = ? AND queries.view = ? ORDER BY looks.id",
+            model,
+            explore,
+        )
+
+    def dashboards_using_explore(self, model: str, explore: str) -> List[TRow]:
+        """Dashboards with a tile querying the explore, directly or via a look.
+        """
+        return self._rows(
+            "SELECT * FROM dashboards WHERE id IN ("
+            " SELECT e.dashboard_id FROM dashboard_elements e"
+            " JOIN queries q ON q.id = e.query_id"
+            " WHERE q.model = ? AND q.view = ?"
+            " UNION SELECT e.dashboard_id FROM dashboard_elements e"
+            " JOIN looks l ON l.id = e.look_id JOIN queries q ON q.id = l.query_id"
+            " WHERE q.model = ? AND q.view = ?"
+            ") ORDER BY id",
+            model,
+            explore,
+            model,
+            explore,
+        )
+
+    def close(self) -> None:
+        """Close this thread's connection.
+        """
+        connection: Optional[sqlite3.Connection] = getattr(
+            self._local, "connection", None
+        )
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _row(cursor: sqlite3.Cursor, values: Tuple[TValue, ...]) -> TRow:
+    """row_factory making each row a {column: value} dict
+    """
+    columns: Sequence[Sequence[object]] = cursor.description
+    return {str(column[0]): value for column, value in zip(columns, values)}
+
+
+def _add_query(
+    queries: Dict[int, Tuple[TValue, ...]], query: Optional[models.Query]
+) -> Optional[int]:
+    if query is None or query.id is None:
+        return None
+    queries[query.id] = (query.id, query.model, query.view)
+    return query.id
+
+
+def _latest(looks: Iterable[models.Look]) -> Optional[str]:
+    values = [look.updated_at for look in looks if look.updated_at]
+    return max(values).isoformat() if values else None
@@ -0,0 +1,281 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Render many dashboards, looks or queries to files
+
+RenderEngine submits render tasks, polls all of them from one scheduler
+loop with exponential backoff, and streams finished results to disk.
+Submissions, polls and downloads share a bounded thread pool, so memory
+use does not grow with the number or size of renders.
+"""
+import concurrent.futures as cf
+import heapq
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import attr
+
+from looker_sdk import error
+from looker_sdk.sdk import methods
+from looker_sdk.sdk import models
+
+# render_task statuses that will not change any more
+SUCCESS = "success"
+FAILURE = "failure"
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class RenderJob:
+    """What to render and where to write it.
+
+    Set exactly one of dashboard_id, look_id or query_id. options holds
+    extra arguments for the create_*_render_task method, e.g.
+    pdf_paper_size or pdf_landscape.
+    """
+
+    path: str
+    dashboard_id: Optional[int] = None
+    look_id: Optional[int] = None
+    query_id: Optional[int] = None
+    result_format: str = "pdf"
+    width: int = 1920
+    height: int = 1080
+    dashboard_style: Optional[str] = None
+    dashboard_filters: Optional[str] = None
+    options: Dict[str, object] = attr.Factory(dict)
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class RenderResult:
+    """Outcome and timing of one RenderJob.
+
+    Times are seconds since RenderEngine.run started.
+    """
+
+    job: RenderJob
+    task_id: Optional[str] = None
+    ok: bool = False
+    error: Optional[str] = None
+    polls: int = 0
+    size: int = 0
+    submitted: Optional[float] = None
+    rendered: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def render_seconds(self) -> Optional[float]:
+        """Time Looker spent on the task, as observed by polling.
+        """
+        if self.submitted is None or self.rendered is None:
+            return None
+        return self.rendered - self.submitted
+
+    @property
+    def download_seconds(self) -> Optional[float]:
+        if self.rendered is None or self.finished is None:
+            return None
+        return self.finished - self.rendered
+
+
+class RenderEngine:
+    """Runs RenderJobs concurrently against one LookerSDK.
+
+    Each task is first polled poll_interval seconds after it is created,
+    then backoff times later than the previous poll, up to
+    max_poll_interval. Tasks still unfinished after timeout seconds fail.
+    Results are written to job.path + ".part" and renamed once complete.
+    """
+
+    def __init__(
+        self,
+        sdk: methods.LookerSDK,
+        concurrency: int = 8,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 15.0,
+        backoff: float = 1.5,
+        timeout: float = 600.0,
+    ):
+        self.sdk = sdk
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, jobs: Iterable[RenderJob]) -> List[RenderResult]:
+        """Render all jobs. Returns their results in the same order.
+        """
+        self._start = time.monotonic()
+        results = [RenderResult(job=job) for job in jobs]
+        # (due, sequence, result, interval): sequence breaks ties in the heap
+        polls: List[Tuple[float, int, RenderResult, float]] = []
+        sequence = 0
+        with cf.ThreadPoolExecutor(self.concurrency) as pool:
+            # future -> (step it runs, its result, poll interval)
+            running: Dict[
+                "cf.Future[bool]",
+                Tuple[Callable[[RenderResult], bool], RenderResult, float],
+            ] = {
+                pool.submit(self._submit, result): (self._submit, result, 0.0)
+                for result in results
+            }
+            while running or polls:
+                now = time.monotonic()
+                wait = max(polls[0][0] - now, 0.0) if polls else None
+                done: Set["cf.Future[bool]"] = set()
+                if running:
+                    done, _ = cf.wait(
+                        running, timeout=wait, return_when=cf.FIRST_COMPLETED
+                    )
+                else:
+                    time.sleep(wait or 0.0)
+                for future in done:
+                    step, result, interval = running.pop(future)
+                    try:
+                        finished = future.result()
+                    except (error.SDKError, IOError) as exc:
+                        self._fail(result, str(exc))
+                        continue
+                    except Exception as exc:  # pylint: disable=broad-except
+                        # e.g. a bad option in job.options: fail only this job
+                        self._fail(result, repr(exc))
+                        continue
+                    if step == self._download or not result.task_id:
+                        continue
+                    if finished:
+                        running[pool.submit(self._download, result)] = (
+                            self._download,
+                            result,
+                            0.0,
+                        )
+                    elif self._elapsed() - (result.submitted or 0.0) > self.timeout:
+                        self._fail(result, f"timed out after {self.timeout}s")
+                    else:
+                        interval = min(
+                            interval * self.backoff if interval else self.poll_interval,
+                            self.max_poll_interval,
+                        )
+                        sequence += 1
+                        heapq.heappush(
+                            polls,
+                            (time.monotonic() + interval, sequence, result, interval),
+                        )
+                now = time.monotonic()
+                while polls and polls[0][0] <= now:
+                    _, _, result, interval = heapq.heappop(polls)
+                    running[pool.submit(self._poll, result)] = (
+                        self._poll,
+                        result,
+                        interval,
+                    )
+        return results
+
+    def _elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def _fail(self, result: RenderResult, reason: str) -> None:
+        result.ok = False
+        result.error = reason
+        result.finished = self._elapsed()
+        self.logger.warning("render of %s failed: %s", result.job.path, reason)
+
+    def _submit(self, result: RenderResult) -> bool:
+        """Create the render task. Returns False: it is never done yet.
+        """
+        job = result.job
+        if job.dashboard_id is not None:
+            task = self.sdk.create_dashboard_render_task(
+                dashboard_id=job.dashboard_id,
+                result_format=job.result_format,
+                body=models.WriteCreateDashboardRenderTask(
+                    dashboard_style=job.dashboard_style,
+                    dashboard_filters=job.dashboard_filters,
+                ),
+                width=job.width,
+                height=job.height,
+                **job.options,  # type: ignore
+            )
+        elif job.look_id is not None:
+            task = self.sdk.create_look_render_task(
+                look_id=job.look_id,
+                result_format=job.result_format,
+                width=job.width,
+                height=job.height,
+                **job.options,  # type: ignore
+            )
+        elif job.query_id is not None:
+            task = self.sdk.create_query_render_task(
+                query_id=job.query_id,
+                result_format=job.result_format,
+                width=job.width,
+                height=job.height,
+                **job.options,  # type: ignore
+            )
+        else:
+            raise error.SDKError(f"Nothing to render for {job.path}")
+        result.task_id = task.id
+        result.submitted = self._elapsed()
+        return False
+
+    def _poll(self, result: RenderResult) -> bool:
+        """True once the task succeeded. Raises SDKError if it failed.
+        """
+        task = self.sdk.render_task(_task_id(result), fields="status,status_detail")
+        result.polls += 1
+        if task.status == FAILURE:
+            raise error.SDKError(task.status_detail or "render task failed")
+        if task.status == SUCCESS:
+            result.rendered = self._elapsed()
+            return True
+        return False
+
+    def _download(self, result: RenderResult) -> bool:
+        partial = f"{result.job.path}.part"
+        try:
+            with open(partial, "wb") as f:
+                self.sdk.render_task_results(_task_id(result), output=f)
+                result.size = f.tell()
+            os.replace(partial, result.job.path)
+        except BaseException:
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+        result.ok = True
+        result.finished = self._elapsed()
+        self.logger.info(
+            "rendered %s (%d bytes) in %.1fs",
+            result.job.path,
+            result.size,
+            result.finished - (result.submitted or 0.0),
+        )
+        return True
+
+
+def _task_id(result: RenderResult) -> str:
+    if result.task_id is None:
+        raise error.SDKError(f"No render task for {result.job.path}")
+    return result.task_id
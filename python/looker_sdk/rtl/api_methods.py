@@ -22,15 +22,34 @@
 
 """Functionality for making authenticated API calls
 """
+import copy
 import datetime
 import json
-from typing import MutableMapping, Optional, Sequence, Type, Union
+import os
+from typing import (
+    Callable,
+    cast,
+    ContextManager,
+    Dict,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from looker_sdk import error
+from looker_sdk.rtl import deadline as dl
 from looker_sdk.rtl import model
+from looker_sdk.rtl import profiler as prof
 from looker_sdk.rtl import serialize
+from looker_sdk.rtl import spool
+from looker_sdk.rtl import tracing
 from looker_sdk.rtl import transport
 from looker_sdk.rtl import auth_session
+from looker_sdk.rtl import versions
 
 
 TBody = Optional[
@@ -43,13 +62,73 @@ TBody = Optional[
         Sequence[model.Model],
     ]
 ]
-TStructure = Optional[Union[Type[str], serialize.TStructure]]
+# structure of endpoints returning text for some formats and bytes for others
+TTextOrBinary = Union[str, bytes]
+TStructure = Optional[Union[Type[str], Type[bytes], serialize.TStructure]]
+TOutput = transport.TOutput
 TReturn = Optional[Union[transport.TResponseValue, serialize.TDeserializeReturn]]
-TQueryParams = MutableMapping[
-    str, Union[None, bool, str, int, Sequence[int], Sequence[str], datetime.datetime]
+
+
+class EncodedQuery(Dict[str, str]):
+    """Query parameters already encoded by a QueryEncoder.
+    """
+
+
+TEncode = Callable[[object], str]
+
+
+def encode_bool(value: object) -> str:
+    if isinstance(value, str):
+        return value
+    return "true" if value else "false"
+
+
+def encode_datetime(value: object) -> str:
+    if isinstance(value, datetime.datetime):
+        return f'{value.isoformat(timespec="minutes")}Z'
+    return str(value)
+
+
+def encode_json(value: object) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, model.DelimSequence):
+        return str(value)
+    return json.dumps(value)
+
+
+class QueryEncoder:
+    """Encodes the query parameters of one generated method.
+
+    The generator knows each parameter's type, so it passes one encoder
+    per parameter (str for numbers and strings, else encode_bool,
+    encode_datetime or encode_json). Calls take the parameter values in
+    the same order and skip Nones.
+    """
+
+    def __init__(self, **encoders: TEncode):
+        self.encoders = tuple(encoders.items())
+
+    def __call__(self, *values: object) -> Optional[EncodedQuery]:
+        params = EncodedQuery()
+        for (name, encode), value in zip(self.encoders, values):
+            if value is not None:
+                params[name] = encode(value)
+        return params or None
+
+
+TQueryParams = Union[
+    EncodedQuery,
+    MutableMapping[
+        str,
+        Union[None, bool, str, int, Sequence[int], Sequence[str], datetime.datetime],
+    ],
 ]
 
 
+TAPIMethods = TypeVar("TAPIMethods", bound="APIMethods")
+
+
 class APIMethods:
     """Functionality for making authenticated API calls
     """
@@ -60,11 +139,21 @@ class APIMethods:
         deserialize: serialize.TDeserialize,
         serialize: serialize.TSerialize,
         transport: transport.Transport,
+        profile: Optional[bool] = None,
     ):
+        """profile=True keeps latency histograms per method and phase in
+        self.profiler. It defaults to the <package-prefix>_PROFILE env variable.
+        """
         self.auth = auth
         self.deserialize = deserialize
         self.serialize = serialize
         self.transport = transport
+        if profile is None:
+            env_profile = os.getenv(f"{versions.environment_prefix}_PROFILE", "")
+            profile = env_profile.lower() in ("yes", "y", "true", "t", "1")
+        self.profiler: Optional[prof.Profiler] = prof.Profiler() if profile else None
+        # (connect, read) timeouts overriding the transport's, see with_timeout()
+        self.timeout: Optional[Tuple[float, float]] = None
 
     def __enter__(self) -> "APIMethods":
         return self
@@ -75,15 +164,42 @@ class APIMethods:
     def _return(self, response: transport.Response, structure: TStructure) -> TReturn:
         if not response.ok:
             raise error.SDKError(response.value)
-        ret: TReturn
         if structure is None:
-            ret = None
-        elif structure is str:
-            ret = response.value
+            return None
+        if structure in (str, bytes, TTextOrBinary):
+            # a spool.SpooledBody if the transport spooled it
+            return response.value
+        structure = cast(serialize.TStructure, structure)
+        ret: TReturn
+        if not tracing.enabled:
+            ret = self._deserialize(response.value, structure)
         else:
-            ret = self.deserialize(response.value, structure)
+            name: Optional[str] = getattr(structure, "__name__", None)
+            attributes: Dict[str, tracing.TAttribute] = {
+                "looker.model": name or str(structure),
+                "looker.payload_size": len(response.value),
+            }
+            with tracing.span("looker.deserialize", **attributes):
+                ret = self._deserialize(response.value, structure)
         return ret
 
+    def _deserialize(
+        self, value: transport.TResponseValue, structure: serialize.TStructure
+    ) -> TReturn:
+        try:
+            return self.deserialize(value, structure)
+        finally:
+            if isinstance(value, spool.SpooledBody):
+                value.close()
+
+    def _span(
+        self, method: transport.HttpMethod, method_name: Optional[str], endpoint: str
+    ) -> ContextManager[tracing.NoopSpan]:
+        return tracing.span(
+            method_name or f"{method.name} {endpoint}",
+            **{"http.method": method.name, "looker.endpoint": endpoint},
+        )
+
     def _convert_query_params(
         self, query_params: TQueryParams
     ) -> MutableMapping[str, str]:
@@ -108,28 +224,151 @@ class APIMethods:
     def logout(self) -> None:
         self.auth.logout()
 
+    def as_user(self: TAPIMethods, user_id: int) -> TAPIMethods:
+        """Copy of this client that makes every call as user_id.
+
+        Unlike login_user() this leaves this client untouched, so many
+        threads can call as_user() for different users at once. Tokens
+        come from self.auth.sudo_tokens.
+        """
+        sdk = copy.copy(self)
+        sdk.auth = auth_session.SudoSession(self.auth.sudo_tokens, user_id)
+        return sdk
+
+    def with_timeout(
+        self: TAPIMethods, timeout: float, connect_timeout: Optional[float] = None
+    ) -> TAPIMethods:
+        """Copy of this client whose requests use these timeouts in seconds.
+
+        connect_timeout defaults to the settings' connect_timeout.
+        """
+        sdk = copy.copy(self)
+        if connect_timeout is None:
+            connect_timeout = self.auth.settings.connect_timeout
+        sdk.timeout = (connect_timeout, timeout)
+        return sdk
+
+    def deadline(self, seconds: float) -> ContextManager[None]:
+        """Limit every call made in a with block to seconds in total.
+
+        Includes logging in and reading the responses. Once the deadline
+        passes, calls raise error.DeadlineExceeded. See rtl.deadline.
+        """
+        return dl.deadline(seconds)
+
+    def _request(
+        self,
+        method: transport.HttpMethod,
+        path: str,
+        structure: TStructure,
+        query_params: Optional[TQueryParams],
+        body: TBody,
+        method_name: Optional[str],
+        endpoint: Optional[str],
+        output: Optional[TOutput] = None,
+        changes_only: bool = False,
+    ) -> TReturn:
+        endpoint = endpoint or path
+        timer = self.profiler.call(method_name or endpoint) if self.profiler else None
+        authenticator: Callable[[], Dict[str, str]] = self.auth.authenticate
+        if timer:
+            authenticator = self._timed_authenticator(timer)
+        try:
+            with self._span(method, method_name, endpoint) as span:
+                params: Optional[MutableMapping[str, str]]
+                if isinstance(query_params, EncodedQuery):
+                    params = query_params
+                elif query_params:
+                    params = self._convert_query_params(query_params)
+                else:
+                    params = None
+                if timer:
+                    timer.mark("query_params")
+                serialized = self._get_serialized(body, changes_only)
+                if serialized is not None:
+                    span.set_attribute("looker.payload_size", len(serialized))
+                if timer:
+                    timer.mark("serialize")
+                # only passed when needed, so older transports keep working
+                extra_args: Dict[str, object] = {}
+                if structure is bytes:
+                    extra_args["binary"] = True
+                elif structure == TTextOrBinary:
+                    extra_args["binary"] = None
+                if output is not None:
+                    extra_args["output"] = output
+                if self.timeout is not None:
+                    extra_args["timeout"] = self.timeout
+                response = self.transport.request(
+                    method,
+                    path,
+                    query_params=params,
+                    body=serialized,
+                    authenticator=authenticator,
+                    method_name=method_name,
+                    **extra_args,  # type: ignore
+                )
+                if timer:
+                    timer.mark("network")
+                ret = self._return(response, structure)
+                if timer:
+                    timer.mark("deserialize")
+                return ret
+        except BaseException:
+            if timer:
+                timer.fail()
+            raise
+        finally:
+            if timer:
+                timer.done()
+
+    def _timed_authenticator(
+        self, timer: prof.CallTimer
+    ) -> Callable[[], Dict[str, str]]:
+        """Charge time spent authenticating to "auth" rather than "network".
+        """
+
+        def authenticate() -> Dict[str, str]:
+            timer.mark("network")
+            try:
+                return self.auth.authenticate()
+            finally:
+                timer.mark("auth")
+
+        return authenticate
+
     def get(
         self,
         path: str,
         structure: TStructure,
         query_params: Optional[TQueryParams] = None,
+        method_name: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        output: Optional[TOutput] = None,
     ) -> TReturn:
         """GET method
+
+        A binary response is streamed into output if one is given.
         """
-        params = self._convert_query_params(query_params) if query_params else None
-        response = self.transport.request(
+        return self._request(
             transport.HttpMethod.GET,
             path,
-            query_params=params,
-            body=None,
-            authenticator=self.auth.authenticate,
+            structure,
+            query_params,
+            None,
+            method_name,
+            endpoint,
+            output,
         )
-        return self._return(response, structure)
 
-    def _get_serialized(self, body: TBody) -> Optional[bytes]:
+    def _get_serialized(
+        self, body: TBody, changes_only: bool = False
+    ) -> Optional[bytes]:
         serialized: Optional[bytes]
         if isinstance(body, str):
             serialized = body.encode("utf-8")
+        elif changes_only and isinstance(body, model.Model):
+            serialized = serialize.serialize_changes(body)
         elif isinstance(body, (list, dict, model.Model)):
             serialized = self.serialize(body)
         else:
@@ -142,19 +381,24 @@ class APIMethods:
         structure: TStructure,
         query_params: Optional[TQueryParams] = None,
         body: TBody = None,
+        method_name: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        output: Optional[TOutput] = None,
     ) -> TReturn:
         """POST method
+
+        A binary response is streamed into output if one is given.
         """
-        params = self._convert_query_params(query_params) if query_params else None
-        serialized = self._get_serialized(body)
-        response = self.transport.request(
+        return self._request(
             transport.HttpMethod.POST,
             path,
-            query_params=params,
-            body=serialized,
-            authenticator=self.auth.authenticate,
+            structure,
+            query_params,
+            body,
+            method_name,
+            endpoint,
+            output,
         )
-        return self._return(response, structure)
 
     def patch(
         self,
@@ -162,19 +406,25 @@ class APIMethods:
         structure: TStructure,
         query_params: Optional[TQueryParams] = None,
         body: TBody = None,
+        method_name: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        full: bool = False,
     ) -> TReturn:
         """PATCH method
+
+        A model body deserialized from an earlier response only sends the
+        fields changed since (see serialize.changes()), unless full is set.
         """
-        params = self._convert_query_params(query_params) if query_params else None
-        serialized = self._get_serialized(body)
-        response = self.transport.request(
+        return self._request(
             transport.HttpMethod.PATCH,
             path,
-            query_params=params,
-            body=serialized,
-            authenticator=self.auth.authenticate,
+            structure,
+            query_params,
+            body,
+            method_name,
+            endpoint,
+            changes_only=not full,
         )
-        return self._return(response, structure)
 
     def put(
         self,
@@ -182,32 +432,37 @@ class APIMethods:
         structure: TStructure = None,
         query_params: Optional[TQueryParams] = None,
         body: TBody = None,
+        method_name: Optional[str] = None,
+        endpoint: Optional[str] = None,
     ) -> TReturn:
         """PUT method
         """
-        params = self._convert_query_params(query_params) if query_params else None
-        serialized = self._get_serialized(body)
-        response = self.transport.request(
+        return self._request(
             transport.HttpMethod.PUT,
             path,
-            query_params=params,
-            body=serialized,
-            authenticator=self.auth.authenticate,
+            structure,
+            query_params,
+            body,
+            method_name,
+            endpoint,
         )
-        return self._return(response, structure)
 
     def delete(
         self,
         path: str,
         structure: TStructure = None,
-        query_params: Optional[MutableMapping[str, str]] = None,
+        query_params: Optional[TQueryParams] = None,
+        method_name: Optional[str] = None,
+        endpoint: Optional[str] = None,
     ) -> TReturn:
         """DELETE method
         """
-        response = self.transport.request(
+        return self._request(
             transport.HttpMethod.DELETE,
             path,
-            body=None,
-            authenticator=self.auth.authenticate,
+            structure,
+            query_params,
+            None,
+            method_name,
+            endpoint,
         )
-        return self._return(response, structure)
@@ -58,6 +58,13 @@ class ApiSettings(transport.TransportSettings):
     need to be supplied.
     """
 
+    # transport implementation, see client.TRANSPORTS
+    transport: str = "requests"
+    # fail fast while the instance or an endpoint is failing, see
+    # circuit_breaker.CircuitBreakerTransport
+    circuit_breaker: bool = False
+    # resend GETs slower than usual, see hedging.HedgingTransport
+    hedge: bool = False
     _filename: str = ""
     _section: Optional[str] = None
 
@@ -75,6 +82,8 @@ class ApiSettings(transport.TransportSettings):
             <package-prefix>_API_VERSION -> api_version
             <package-prefix>_BASE_URL -> base_url
             <package-prefix>_VERIFY_SSL -> verify_ssl
+            <package-prefix>_TRANSPORT -> transport
+            <package-prefix>_TIMEOUT -> timeout
         """
 
         config_data = cls.read_ini(filename, section)
@@ -95,6 +104,14 @@ class ApiSettings(transport.TransportSettings):
         if env_verify_ssl:
             config_data["verify_ssl"] = env_verify_ssl
 
+        env_transport = cast(str, os.getenv(f"{versions.environment_prefix}_TRANSPORT"))
+        if env_transport:
+            config_data["transport"] = env_transport
+
+        env_timeout = cast(str, os.getenv(f"{versions.environment_prefix}_TIMEOUT"))
+        if env_timeout:
+            config_data["timeout"] = env_timeout
+
         if not config_data.get("base_url"):
             raise error.SDKError(f"Required parameter base_url not found.")
 
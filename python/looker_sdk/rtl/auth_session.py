@@ -22,8 +22,10 @@
 
 """AuthSession to provide automatic authentication
 """
+import collections
 import os
-from typing import cast, Dict, Optional
+import threading
+from typing import cast, Callable, Dict, List, Optional, Tuple
 import urllib.parse
 
 from looker_sdk import error
@@ -31,6 +33,8 @@ from looker_sdk.rtl import api_settings
 from looker_sdk.rtl import auth_token
 from looker_sdk.rtl import transport
 from looker_sdk.rtl import serialize
+from looker_sdk.rtl import token_store as ts
+from looker_sdk.rtl import tracing
 from looker_sdk.rtl import versions
 from looker_sdk.sdk import models
 
@@ -44,13 +48,20 @@ class AuthSession:
         settings: api_settings.ApiSettings,
         transport: transport.Transport,
         deserialize: serialize.TDeserialize,
+        token_store: Optional[ts.TokenStore] = None,
     ):
+        """token_store shares the admin and pooled sudo tokens with other
+        sessions (and processes) using the same store.
+        """
         self.user_token: auth_token.AuthToken = auth_token.AuthToken()
         self.admin_token: auth_token.AuthToken = auth_token.AuthToken()
         self._sudo_id: Optional[int] = None
         self.settings = settings
         self.transport = transport
         self.deserialize = deserialize
+        self.token_store = token_store
+        self._lock = threading.Lock()
+        self._sudo_tokens: Optional[SudoTokenPool] = None
 
     def _is_authenticated(self, token: auth_token.AuthToken) -> bool:
         """Determines if current token is active."""
@@ -79,18 +90,32 @@ class AuthSession:
     def _get_admin_token(self) -> auth_token.AuthToken:
         """Returns an active admin token."""
         if not self.is_admin_authenticated:
-            self._login_admin()
+            with self._lock:
+                # another thread may have logged in while we waited
+                if not self.is_admin_authenticated:
+                    self._login_admin()
         return self.admin_token
 
+    @property
+    def sudo_tokens(self) -> "SudoTokenPool":
+        """Pool of sudo tokens for making calls as many users at once.
+        """
+        if self._sudo_tokens is None:
+            with self._lock:
+                if self._sudo_tokens is None:
+                    self._sudo_tokens = SudoTokenPool(self)
+        return self._sudo_tokens
+
     def authenticate(self) -> Dict[str, str]:
         """Return the Authorization header to authenticate each API call.
 
         Expired token renewal happens automatically.
         """
-        if self._sudo_id:
-            token = self._get_user_token()
-        else:
-            token = self._get_admin_token()
+        with tracing.span("looker.auth", **{"looker.sudo": bool(self._sudo_id)}):
+            if self._sudo_id:
+                token = self._get_user_token()
+            else:
+                token = self._get_admin_token()
 
         return {"Authorization": f"token {token.access_token}"}
 
@@ -118,7 +143,7 @@ class AuthSession:
             elif not self.is_user_authenticated:
                 self._login_user()
 
-    def _login_admin(self) -> None:
+    def _credentials(self) -> Tuple[Optional[str], Optional[str]]:
         config_data = self.settings.read_ini(
             self.settings._filename, self.settings._section
         )
@@ -128,6 +153,13 @@ class AuthSession:
         client_secret = os.getenv(
             f"{versions.environment_prefix}_CLIENT_SECRET"
         ) or config_data.get("client_secret")
+        return client_id, client_secret
+
+    def _login_admin(self) -> None:
+        self.admin_token = self._shared_token("admin", self._request_admin_token)
+
+    def _request_admin_token(self) -> auth_token.AuthToken:
+        client_id, client_secret = self._credentials()
 
         if not (client_id and client_secret):
             raise error.SDKError("Required auth credentials not found.")
@@ -150,7 +182,31 @@ class AuthSession:
 
         access_token = self.deserialize(response, models.AccessToken)
         assert isinstance(access_token, models.AccessToken)
-        self.admin_token = auth_token.AuthToken(access_token)
+        return auth_token.AuthToken(access_token)
+
+    def _store_key(self, name: str) -> str:
+        return f"{self.settings.base_url} {self._credentials()[0]} {name}"
+
+    def _shared_token(
+        self, name: str, login: Callable[[], auth_token.AuthToken], margin: float = 0.0,
+    ) -> auth_token.AuthToken:
+        """Token from token_store if it has an active one, else login().
+
+        login() is called holding the store's lock for the token, so
+        sessions sharing the store log in one at a time and then reuse
+        the first one's token.
+        """
+        if self.token_store is None:
+            return login()
+        key = self._store_key(name)
+        token = self.token_store.get(key)
+        if token is None or not token.is_active_for(margin):
+            with self.token_store.lock(key):
+                token = self.token_store.get(key)
+                if token is None or not token.is_active_for(margin):
+                    token = login()
+                    self.token_store.put(key, token)
+        return token
 
     def _login_user(self) -> None:
         response = self._ok(
@@ -174,7 +230,8 @@ class AuthSession:
         the current admin/api3credential session is active at which point
         you can continue to make API calls as the admin/api3credential user
         or logout(). If you want to logout completely in one step pass
-        full=True
+        full=True. An admin token shared through token_store is not
+        deactivated, only dropped, as other sessions may be using it.
         """
         if self._sudo_id:
             self._sudo_id = None
@@ -199,15 +256,18 @@ class AuthSession:
         self._reset_user_token()
 
     def _logout_admin(self) -> None:
-        self._ok(
-            self.transport.request(
-                transport.HttpMethod.DELETE,
-                "/logout",
-                authenticator=lambda: {
-                    "Authorization": f"token {self.admin_token.access_token}"
-                },
+        # a shared admin token may still be in use by other sessions, so
+        # it is only dropped here and left to expire
+        if self.token_store is None:
+            self._ok(
+                self.transport.request(
+                    transport.HttpMethod.DELETE,
+                    "/logout",
+                    authenticator=lambda: {
+                        "Authorization": f"token {self.admin_token.access_token}"
+                    },
+                )
             )
-        )
 
         self._reset_admin_token()
 
@@ -221,3 +281,149 @@ class AuthSession:
         if not response.ok:
             raise error.SDKError(response.value)
         return response.value
+
+
+class SudoTokenPool:
+    """Sudo tokens for many users at once, safe to use from many threads.
+
+    A user is logged in on first use and again when their token is within
+    refresh_margin seconds of expiring. Once more than max_size users have
+    tokens, the least recently used one is logged out, unless tokens are
+    shared through auth.token_store, in which case it is only dropped. The
+    same goes for logout() and clear().
+    """
+
+    def __init__(
+        self, auth: AuthSession, max_size: int = 1000, refresh_margin: float = 60.0
+    ):
+        self.auth = auth
+        self.max_size = max_size
+        self.refresh_margin = refresh_margin
+        self._tokens: "collections.OrderedDict[int, auth_token.AuthToken]" = (
+            collections.OrderedDict()
+        )
+        # held while logging a user in, so each user logs in only once
+        self._logins: Dict[int, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._tokens
+
+    def authenticate(self, user_id: int) -> Dict[str, str]:
+        """Return the Authorization header to make an API call as user_id.
+        """
+        return {"Authorization": f"token {self.token(user_id).access_token}"}
+
+    def token(self, user_id: int) -> auth_token.AuthToken:
+        """Returns a fresh token for user_id, logging them in if needed.
+        """
+        with self._lock:
+            token = self._fresh(user_id)
+            if token is not None:
+                self._tokens.move_to_end(user_id)
+                return token
+            login = self._logins.setdefault(user_id, threading.Lock())
+        with login:
+            with self._lock:
+                token = self._fresh(user_id)
+            if token is None:
+                token = self.auth._shared_token(
+                    f"user {user_id}",
+                    lambda: self._login(user_id),
+                    self.refresh_margin,
+                )
+            with self._lock:
+                self._tokens[user_id] = token
+                self._tokens.move_to_end(user_id)
+                self._logins.pop(user_id, None)
+                evicted: List[auth_token.AuthToken] = []
+                while len(self._tokens) > self.max_size:
+                    evicted.append(self._tokens.popitem(last=False)[1])
+        # other sessions sharing the store may still be using them
+        if self.auth.token_store is None:
+            for old in evicted:
+                self._logout(old)
+        return token
+
+    def logout(self, user_id: int) -> None:
+        """Log out user_id, or only drop their token if it is shared.
+        """
+        with self._lock:
+            token = self._tokens.pop(user_id, None)
+        if token is not None and self.auth.token_store is None:
+            self._logout(token)
+
+    def clear(self) -> None:
+        """Log out every user in the pool, or only drop shared tokens.
+        """
+        with self._lock:
+            tokens = list(self._tokens.values())
+            self._tokens.clear()
+        if self.auth.token_store is None:
+            for token in tokens:
+                self._logout(token)
+
+    def _fresh(self, user_id: int) -> Optional[auth_token.AuthToken]:
+        token = self._tokens.get(user_id)
+        if token is None or not token.is_active_for(self.refresh_margin):
+            return None
+        return token
+
+    def _login(self, user_id: int) -> auth_token.AuthToken:
+        response = self.auth._ok(
+            self.auth.transport.request(
+                transport.HttpMethod.POST,
+                f"/login/{user_id}",
+                authenticator=lambda: {
+                    "Authorization": (
+                        f"token {self.auth._get_admin_token().access_token}"
+                    )
+                },
+            )
+        )
+        access_token = self.auth.deserialize(response, models.AccessToken)
+        assert isinstance(access_token, models.AccessToken)
+        return auth_token.AuthToken(access_token)
+
+    def _logout(self, token: auth_token.AuthToken) -> None:
+        # best effort: the token expires on its own anyway
+        self.auth.transport.request(
+            transport.HttpMethod.DELETE,
+            "/logout",
+            authenticator=lambda: {"Authorization": f"token {token.access_token}"},
+        )
+
+
+class SudoSession(AuthSession):
+    """AuthSession that always acts as one user, with a token from a
+    SudoTokenPool.
+    """
+
+    def __init__(self, pool: SudoTokenPool, sudo_id: int):
+        super().__init__(pool.auth.settings, pool.auth.transport, pool.auth.deserialize)
+        self.pool = pool
+        self._sudo_id = sudo_id
+
+    @property
+    def is_user_authenticated(self) -> bool:
+        return self._sudo_id in self.pool
+
+    def authenticate(self) -> Dict[str, str]:
+        with tracing.span("looker.auth", **{"looker.sudo": True}):
+            return self.pool.authenticate(cast(int, self._sudo_id))
+
+    def login_user(self, sudo_id: int) -> None:
+        if sudo_id != self._sudo_id:
+            raise error.SDKError(
+                f"This session always acts as user {self._sudo_id}. "
+                "Use as_user() for another user."
+            )
+        self.pool.token(sudo_id)
+
+    def logout(self, full: bool = False) -> None:
+        """Log the user out of the pool.
+        """
+        self.pool.logout(cast(int, self._sudo_id))
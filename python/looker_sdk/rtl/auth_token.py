@@ -31,7 +31,7 @@ from looker_sdk.sdk import models as ml
 class AuthToken:
     """Used to instantiate or check expiry of an AccessToken object"""
 
-    def __init__(self, token: Optional[ml.AccessToken] = None):
+    def __init__(self, token: Optional["ml.AccessToken"] = None):
         self.access_token: str = ""
         self.token_type: str = ""
         self.expires_in: int = 0
@@ -40,7 +40,7 @@ class AuthToken:
             token = ml.AccessToken()
         self.set_token(token)
 
-    def set_token(self, token: ml.AccessToken):
+    def set_token(self, token: "ml.AccessToken"):
         """Assign the token and set its expiration."""
         self.access_token = token.access_token or ""
         self.token_type = token.token_type or ""
@@ -61,3 +61,9 @@ class AuthToken:
         if not self.expires_at:
             return False
         return self.expires_at > datetime.datetime.now()
+
+    def is_active_for(self, seconds: float) -> bool:
+        """True if authentication token will not time out within seconds"""
+        return self.expires_at > datetime.datetime.now() + datetime.timedelta(
+            seconds=seconds
+        )
@@ -0,0 +1,245 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Fail fast while a Looker instance or one of its endpoints is failing
+
+CircuitBreakerTransport wraps another transport and keeps a CircuitBreaker
+for the instance as a whole and one for each endpoint (SDK method). A
+breaker opens when, over its last `window` calls, the share that failed
+(no response, HTTP 5xx or 429) or took longer than `slow_call` seconds
+reaches `failure_rate`. While open, requests raise error.CircuitOpen
+straight away instead of waiting on a struggling server. After
+`reset_timeout` seconds the breaker is half-open: `half_open_calls` probe
+requests go through, and it closes again once they all succeed, or
+re-opens as soon as one fails.
+"""
+import collections
+import re
+import threading
+import time
+from typing import Deque, Dict, MutableMapping, Optional
+
+from looker_sdk import error
+from looker_sdk.rtl import transport
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed/open/half-open state machine over the outcomes of recent calls.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        minimum_calls: int = 10,
+        failure_rate: float = 0.5,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+    ):
+        self.name = name
+        self.minimum_calls = minimum_calls
+        self.failure_rate = failure_rate
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        # True for each failed call, oldest first
+        self._outcomes: Deque[bool] = collections.deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Admit a call, or raise error.CircuitOpen if the breaker is open.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise error.CircuitOpen(f"Circuit open for {self.name}")
+                self.state = HALF_OPEN
+                self._probes = self._probe_successes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    raise error.CircuitOpen(f"Circuit half-open for {self.name}")
+                self._probes += 1
+
+    def release(self) -> None:
+        """Give back an admitted call that was never made.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record(self, failed: bool) -> None:
+        """Report the outcome of an admitted call.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self.state = CLOSED
+                        self._outcomes.clear()
+            elif self.state == CLOSED:
+                self._outcomes.append(failed)
+                calls = len(self._outcomes)
+                if (
+                    calls >= self.minimum_calls
+                    and sum(self._outcomes) >= self.failure_rate * calls
+                ):
+                    self._open()
+            # calls admitted before the breaker opened are ignored
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+
+# ids in paths of calls made without a method name, e.g. /login/42
+_ID = re.compile(r"/\d+(?=/|$)")
+
+
+class CircuitBreakerTransport(transport.Transport):
+    """Passes requests to transport unless its instance or endpoint is failing.
+
+    window, minimum_calls, failure_rate, reset_timeout and half_open_calls
+    configure each endpoint's CircuitBreaker. The instance breaker waits for
+    more calls by default, so that one failing endpoint opens its own
+    breaker well before the instance's.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        transport: transport.Transport,
+        slow_call: Optional[float] = None,
+        instance: Optional[CircuitBreaker] = None,
+        window: int = 20,
+        minimum_calls: int = 10,
+        failure_rate: float = 0.5,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+    ):
+        self.transport = transport
+        self.instrumentation = transport.instrumentation
+        self.slow_call = slow_call
+        self.window = window
+        self.minimum_calls = minimum_calls
+        self.failure_rate = failure_rate
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.instance = instance or CircuitBreaker(
+            "instance", window=100, minimum_calls=20
+        )
+        self.endpoints: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, settings: transport.TransportSettings) -> transport.Transport:
+        """RequestsTransport with circuit breakers.
+        """
+        from looker_sdk.rtl import requests_transport
+
+        return cls(requests_transport.RequestsTransport.configure(settings))
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """The breaker for endpoint, created on first use.
+        """
+        breaker = self.endpoints.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self.endpoints.setdefault(
+                    endpoint,
+                    CircuitBreaker(
+                        endpoint,
+                        window=self.window,
+                        minimum_calls=self.minimum_calls,
+                        failure_rate=self.failure_rate,
+                        reset_timeout=self.reset_timeout,
+                        half_open_calls=self.half_open_calls,
+                    ),
+                )
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """{"instance" or endpoint: state} of the breakers created so far.
+        """
+        states = {"instance": self.instance.state}
+        states.update((name, b.state) for name, b in list(self.endpoints.items()))
+        return states
+
+    def request(
+        self,
+        method: transport.HttpMethod,
+        path: str,
+        query_params: Optional[MutableMapping[str, str]] = None,
+        body: Optional[bytes] = None,
+        authenticator: transport.TAuthenticator = None,
+        headers: Optional[MutableMapping[str, str]] = None,
+        method_name: Optional[str] = None,
+        binary: Optional[bool] = False,
+        output: Optional[transport.TOutput] = None,
+        timeout: Optional[transport.TTimeout] = None,
+    ) -> transport.Response:
+        endpoint = self.breaker(method_name or f"{method.name} {_ID.sub('/:id', path)}")
+        self.instance.acquire()
+        try:
+            endpoint.acquire()
+        except error.CircuitOpen:
+            self.instance.release()
+            raise
+        start = time.monotonic()
+        failed = True
+        try:
+            response = self.transport.request(
+                method,
+                path,
+                query_params=query_params,
+                body=body,
+                authenticator=authenticator,
+                headers=headers,
+                method_name=method_name,
+                binary=binary,
+                output=output,
+                timeout=timeout,
+            )
+            failed = self._failed(response, time.monotonic() - start)
+        finally:
+            endpoint.record(failed)
+            self.instance.record(failed)
+        return response
+
+    def _failed(self, response: transport.Response, elapsed: float) -> bool:
+        if self.slow_call is not None and elapsed > self.slow_call:
+            return True
+        if response.ok:
+            return False
+        status = response.status_code
+        return status is None or status >= 500 or status == 429
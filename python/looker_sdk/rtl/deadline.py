@@ -0,0 +1,88 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Deadlines shared by every request made within them
+
+    with deadline.deadline(5.0):
+        sdk.me()  # auth, the request and reading the response share 5s
+
+Transports shorten their timeouts to the time left, check the deadline
+between chunks of a response, and raise error.DeadlineExceeded once it
+has passed, closing the connection rather than finishing the read.
+Deadlines follow contextvars, so each thread (and asyncio task) has its
+own; nested deadlines can only shorten the enclosing one.
+"""
+import contextlib
+import contextvars
+import time
+from typing import Iterator, Optional
+
+from looker_sdk import error
+from looker_sdk.rtl import transport
+
+# time.monotonic() at which the current deadline passes
+_expires: "contextvars.ContextVar[Optional[float]]" = contextvars.ContextVar(
+    "looker_sdk_deadline", default=None
+)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Allow the requests made in this block seconds in total.
+    """
+    expires = time.monotonic() + seconds
+    current = _expires.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _expires.set(expires)
+    try:
+        yield
+    finally:
+        _expires.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, None if there is none.
+    """
+    expires = _expires.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
+
+
+def check() -> None:
+    """Raise error.DeadlineExceeded if the current deadline has passed.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise error.DeadlineExceeded("Deadline exceeded")
+
+
+def clip(timeout: transport.TTimeout) -> transport.TTimeout:
+    """timeout shortened to the time left before the current deadline.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    check()
+    connect, read = timeout
+    return (min(connect, left), min(read, left))
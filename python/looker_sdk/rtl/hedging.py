@@ -0,0 +1,207 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Hedged GET requests to cut tail latency
+
+HedgingTransport wraps another transport and keeps a latency histogram per
+SDK method, fed by the transport's instrumentation events. When a GET has
+not answered within the `percentile` latency of its method, an identical
+request is sent and whichever answers first is returned. The other one is
+left to finish in the background and its response is dropped.
+
+Hedges are limited to `max_extra` of the GETs that could be hedged (5% by
+default), and a method is only hedged once `min_samples` of its responses
+have been seen. Requests writing to an output are never hedged.
+"""
+import concurrent.futures as cf
+import contextvars
+import threading
+from typing import Callable, Collection, Dict, MutableMapping, Optional
+
+from looker_sdk.rtl import instrumentation as instr
+from looker_sdk.rtl import profiler
+from looker_sdk.rtl import transport
+
+# the HedgingTransport making the current request, so that one sharing its
+# Instrumentation with others (see client.LookerClientPool) only learns
+# from its own requests' events
+_sender: "contextvars.ContextVar[Optional[HedgingTransport]]" = contextvars.ContextVar(
+    "looker_sdk_hedger", default=None
+)
+
+
+class HedgingTransport(transport.Transport):
+    """Passes requests to transport, hedging slow GETs.
+
+    method_names limits hedging to those SDK methods. By default every GET
+    made by an SDK method can be hedged.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(
+        self,
+        transport: transport.Transport,
+        percentile: float = 95.0,
+        max_extra: float = 0.05,
+        min_samples: int = 20,
+        method_names: Optional[Collection[str]] = None,
+        max_workers: int = 16,
+    ):
+        self.transport = transport
+        self.instrumentation = transport.instrumentation
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.method_names = method_names
+        self.histograms: Dict[str, profiler.Histogram] = {}
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+        self._pool = cf.ThreadPoolExecutor(
+            max_workers, thread_name_prefix="looker_sdk_hedge"
+        )
+        self._lock = threading.Lock()
+        self.instrumentation.subscribe(self._observe)
+
+    @classmethod
+    def configure(cls, settings: transport.TransportSettings) -> transport.Transport:
+        """RequestsTransport with hedged GETs.
+        """
+        from looker_sdk.rtl import requests_transport
+
+        return cls(requests_transport.RequestsTransport.configure(settings))
+
+    def _observe(self, event: instr.RequestEvent) -> None:
+        if event.method != "GET" or not event.method_name or not event.ok:
+            return
+        if _sender.get() is not self:
+            return
+        with self._lock:
+            histogram = self.histograms.get(event.method_name)
+            if histogram is None:
+                histogram = self.histograms[event.method_name] = profiler.Histogram()
+            histogram.record(event.total)
+
+    def hedge_delay(self, method_name: str) -> Optional[float]:
+        """Seconds to wait before hedging a call to method_name, None for never.
+        """
+        if self.method_names is not None and method_name not in self.method_names:
+            return None
+        with self._lock:
+            histogram = self.histograms.get(method_name)
+            if histogram is None or histogram.count < self.min_samples:
+                return None
+            return histogram.percentile(self.percentile)
+
+    def _may_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.max_extra * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def request(
+        self,
+        method: transport.HttpMethod,
+        path: str,
+        query_params: Optional[MutableMapping[str, str]] = None,
+        body: Optional[bytes] = None,
+        authenticator: transport.TAuthenticator = None,
+        headers: Optional[MutableMapping[str, str]] = None,
+        method_name: Optional[str] = None,
+        binary: Optional[bool] = False,
+        output: Optional[transport.TOutput] = None,
+        timeout: Optional[transport.TTimeout] = None,
+    ) -> transport.Response:
+        # only passed when needed, so older transports keep working
+        kwargs: Dict[str, object] = {}
+        if binary is not False:
+            kwargs["binary"] = binary
+        if output is not None:
+            kwargs["output"] = output
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        def send() -> transport.Response:
+            return self.transport.request(
+                method,
+                path,
+                query_params=query_params,
+                body=body,
+                authenticator=authenticator,
+                headers=headers,
+                method_name=method_name,
+                **kwargs,  # type: ignore
+            )
+
+        delay = None
+        if method == transport.HttpMethod.GET and method_name and output is None:
+            with self._lock:
+                self.requests += 1
+            delay = self.hedge_delay(method_name)
+        token = _sender.set(self)
+        try:
+            if delay is None:
+                return send()
+            return self._hedged(delay, send)
+        finally:
+            _sender.reset(token)
+
+    def _hedged(
+        self, delay: float, send: Callable[[], transport.Response]
+    ) -> transport.Response:
+        first = self._submit(send)
+        try:
+            return first.result(timeout=delay)
+        except cf.TimeoutError:
+            pass
+        if not self._may_hedge():
+            return first.result()
+        second = self._submit(send)
+        done, _ = cf.wait((first, second), return_when=cf.FIRST_COMPLETED)
+        winner = second if second in done else first
+        if not _succeeded(winner):
+            # wait for the other one in case it brings a successful answer
+            other = first if winner is second else second
+            if _succeeded(other):
+                winner = other
+        if winner is second:
+            with self._lock:
+                self.wins += 1
+        return winner.result()
+
+    def _submit(
+        self, send: Callable[[], transport.Response]
+    ) -> "cf.Future[transport.Response]":
+        # run in a copy of this context to keep the deadline and trace
+        context = contextvars.copy_context()
+        return self._pool.submit(lambda: context.run(send))
+
+    def close(self) -> None:
+        """Stop the hedging threads once requests in flight finish.
+        """
+        self._pool.shutdown(wait=False)
+        self.instrumentation.unsubscribe(self._observe)
+
+
+def _succeeded(future: "cf.Future[transport.Response]") -> bool:
+    return future.exception() is None and future.result().ok
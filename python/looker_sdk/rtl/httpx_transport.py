@@ -0,0 +1,181 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Transport implementation using the httpx package, over HTTP/2.
+
+HTTP/2 multiplexes concurrent requests from many threads over a few
+connections, instead of opening one connection (and TLS handshake) per
+request in flight. Needs httpx with h2: pip install looker_sdk[http2]
+"""
+
+import logging
+import time
+from typing import Callable, Dict, MutableMapping, Optional, Tuple
+
+try:
+    import httpx  # type: ignore
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore
+
+from looker_sdk import error
+from looker_sdk.rtl import deadline
+from looker_sdk.rtl import instrumentation as instr
+from looker_sdk.rtl import tracing
+from looker_sdk.rtl import transport
+
+
+class HttpxTransport(transport.Transport):
+    """HttpxTransport implementation of Transport.
+    """
+
+    # bytes read from the socket at a time when streaming to an output
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        settings: transport.TransportSettings,
+        client: "httpx.Client",
+        instrumentation: Optional[instr.Instrumentation] = None,
+    ):
+
+        if settings.spool_threshold is not None:
+            raise error.SDKError("spool_threshold needs the requests transport.")
+
+        headers: Dict[str, str] = {"User-Agent": settings.agent_tag}
+        if settings.headers:
+            headers.update(settings.headers)
+        client.headers.update(headers)
+        self.client = client
+        self.timeout = settings.timeouts
+
+        self.api_path: str = f"{settings.base_url}/api/{settings.api_version}"
+        self.logger = logging.getLogger(__name__)
+        self.instrumentation = instrumentation or instr.Instrumentation()
+
+    @classmethod
+    def configure(cls, settings: transport.TransportSettings) -> transport.Transport:
+        if httpx is None:
+            raise error.SDKError(
+                "The httpx transport needs httpx: pip install looker_sdk[http2]"
+            )
+        return cls(settings, httpx.Client(http2=True, verify=settings.verify_ssl))
+
+    def request(
+        self,
+        method: transport.HttpMethod,
+        path: str,
+        query_params: Optional[MutableMapping[str, str]] = None,
+        body: Optional[bytes] = None,
+        authenticator: Optional[Callable[[], Dict[str, str]]] = None,
+        headers: Optional[MutableMapping[str, str]] = None,
+        method_name: Optional[str] = None,
+        binary: Optional[bool] = False,
+        output: Optional[transport.TOutput] = None,
+        timeout: Optional[transport.TTimeout] = None,
+    ) -> transport.Response:
+
+        connect, read = deadline.clip(timeout or self.timeout)
+        url = f"{self.api_path}{path}"
+        if headers is None:
+            headers = {}
+        if authenticator:
+            headers.update(authenticator())
+        self.logger.info("%s(%s)", method.name, url)
+        event: Optional[instr.RequestEvent] = None
+        if self.instrumentation.enabled:
+            event = instr.RequestEvent(
+                method=method.name,
+                path=path,
+                url=url,
+                method_name=method_name,
+                request_bytes=len(body) if body else 0,
+            )
+            start = time.perf_counter()
+        with tracing.span(
+            f"HTTP {method.name}", **{"http.method": method.name, "http.url": url}
+        ) as span:
+            tracing.inject(headers)
+            try:
+                with self.client.stream(
+                    method.name,
+                    url,
+                    params=query_params,
+                    content=body,
+                    headers=headers,
+                    timeout=httpx.Timeout(read, connect=connect),
+                ) as resp:
+                    span.set_attribute("http.status_code", resp.status_code)
+                    if event:
+                        event.ttfb = time.perf_counter() - start
+                    value, size = self._read(resp, binary, output)
+            except (httpx.HTTPError, IOError) as exc:
+                deadline.check()
+                ret = transport.Response(False, str(exc))
+                if event:
+                    event.error = str(exc)
+            else:
+                ok = resp.status_code < 400
+                ret = transport.Response(ok, value, resp.status_code)
+                if event:
+                    event.status_code = resp.status_code
+                    event.response_bytes = size
+                    event.http_version = resp.http_version
+        if event:
+            event.total = time.perf_counter() - start
+            event.ok = ret.ok
+            self.instrumentation.emit(event)
+
+        return ret
+
+    def _read(
+        self,
+        resp: "httpx.Response",
+        binary: Optional[bool],
+        output: Optional[transport.TOutput],
+    ) -> Tuple[transport.TResponseValue, int]:
+        """Response value and body size in bytes.
+        """
+        if resp.status_code >= 400 or output is None:
+            if deadline.remaining() is None:
+                content = resp.read()
+            else:
+                chunks = []
+                for chunk in resp.iter_bytes(self.chunk_size):
+                    deadline.check()
+                    chunks.append(chunk)
+                content = b"".join(chunks)
+            if resp.status_code < 400:
+                if binary is None:
+                    content_type: str = resp.headers.get("Content-Type", "")
+                    binary = not transport.is_text(content_type)
+                if binary:
+                    return content, len(content)
+            return content.decode(resp.encoding or "utf-8", "replace"), len(content)
+        size = 0
+        for chunk in resp.iter_bytes(self.chunk_size):
+            deadline.check()
+            size += len(chunk)
+            if isinstance(output, bytearray):
+                output.extend(chunk)
+            else:
+                output.write(chunk)
+        return b"", size
@@ -0,0 +1,100 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Structured events describing each transport request
+"""
+import logging
+import threading
+from typing import Callable, Optional, Tuple
+
+import attr
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class RequestEvent:
+    """Timing, size and status of a single transport request.
+
+    Timings are in seconds. Phases a transport implementation cannot
+    observe (e.g. dns/connect/tls when the connection was reused) are
+    left as None.
+    """
+
+    method: str
+    path: str
+    url: str
+    method_name: Optional[str] = None
+    ok: bool = False
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    connection_reused: Optional[bool] = None
+    http_version: Optional[str] = None
+    dns: Optional[float] = None
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+    ttfb: Optional[float] = None
+    total: float = 0.0
+
+
+TListener = Callable[[RequestEvent], None]
+
+
+class Instrumentation:
+    """Dispatches RequestEvents to subscribed listeners.
+
+    A single Instrumentation can be shared by several transports so that
+    exporters (Prometheus, StatsD, OpenTelemetry...) are attached once.
+    Listener errors are logged and never propagate into the API call.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: Tuple[TListener, ...] = ()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def enabled(self) -> bool:
+        """True if at least one listener is subscribed.
+        """
+        return bool(self._listeners)
+
+    def subscribe(self, listener: TListener) -> TListener:
+        """Add listener. Returns it so this can be used as a decorator.
+        """
+        with self._lock:
+            self._listeners = self._listeners + (listener,)
+        return listener
+
+    def unsubscribe(self, listener: TListener) -> None:
+        with self._lock:
+            self._listeners = tuple(
+                lstn for lstn in self._listeners if lstn != listener
+            )
+
+    def emit(self, event: RequestEvent) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception("instrumentation listener %r failed", listener)
@@ -24,7 +24,24 @@
 """
 
 import collections
-from typing import Any, cast, Iterable, MutableSequence, Optional, TypeVar
+import importlib
+import types
+from typing import (
+    Any,
+    cast,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Set,
+    Type,
+    TypeVar,
+    TYPE_CHECKING,
+)
 
 
 EXPLICIT_NULL = cast(Any, "EXPLICIT_NULL")  # type:ignore
@@ -32,7 +49,93 @@ EXPLICIT_NULL = cast(Any, "EXPLICIT_NULL")  # type:ignore
 
 class Model:
     """Base model for all generated models.
+
+    A deserialized model records the fields assigned since, see
+    serialize.changes().
+    """
+
+    # attributes assigned since the model was deserialized, None if it was
+    # not deserialized
+    _changed: Optional[Set[str]] = None
+    # shallow copies of the list, dict and model fields as deserialized
+    _loaded: Optional[Dict[str, object]] = None
+
+    if not TYPE_CHECKING:
+        # hidden from mypy, which would accept any attribute name otherwise
+        def __setattr__(self, name, value):
+            changed = self._changed
+            if changed is not None and name[0] != "_":
+                changed.add(name)
+            object.__setattr__(self, name, value)
+
+
+TModel = TypeVar("TModel", bound=Model)
+
+
+def send_all(api_model: TModel) -> TModel:
+    """Stop tracking changes to api_model, so that it is sent in full.
+
+    A deserialized model only sends the fields changed since it was loaded
+    when used as a PATCH body.
     """
+    api_model._changed = None
+    api_model._loaded = None
+    return api_model
+
+
+class LazyModels(Mapping[str, Type[Model]]):
+    """Model classes of a package, imported from their module on first use.
+
+    namespace is the package's globals(): loaded classes are cached there
+    so later lookups, and attribute access on the package, are plain dict
+    hits. modules maps each model name to its module in the package. The
+    getattr and dir methods implement the package's PEP 562 __getattr__
+    and __dir__.
+    """
+
+    def __init__(
+        self, namespace: MutableMapping[str, object], modules: Mapping[str, str]
+    ):
+        self.namespace = namespace
+        self.package = str(namespace["__name__"])
+        self.modules = modules
+        self.imported: Dict[str, types.ModuleType] = {}
+        self.loaded: Dict[str, Type[Model]] = {}
+
+    def __getitem__(self, name: str) -> Type[Model]:
+        if name not in self.modules:
+            raise KeyError(name)
+        try:
+            return self.loaded[name]
+        except KeyError:
+            pass
+        module_name = self.modules[name]
+        try:
+            module = self.imported[module_name]
+        except KeyError:
+            module = self.imported[module_name] = importlib.import_module(
+                f"{self.package}.{module_name}"
+            )
+        value: Type[Model] = getattr(module, name)
+        self.loaded[name] = self.namespace[name] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.modules)
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def getattr(self, name: str) -> Type[Model]:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {self.package!r} has no attribute {name!r}"
+            ) from None
+
+    def dir(self) -> List[str]:
+        return sorted(set(self.namespace) | set(self.modules))
 
 
 T = TypeVar("T")
@@ -64,9 +167,6 @@ class DelimSequence(collections.UserList, MutableSequence[T]):
     def remove(self, elem: T):
         super().remove(elem)
 
-    def index(self, x: T, *args):
-        super().index(x, *args)
-
     def count(self, elem: T):
         super().count(elem)
 
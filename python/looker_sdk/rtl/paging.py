@@ -0,0 +1,62 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Fetch every page of a paginated endpoint in parallel
+"""
+import concurrent.futures as cf
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+# fetch(page, per_page) returns the rows of that page, numbered from 1
+TFetch = Callable[[int, int], Sequence[T]]
+
+
+def fetch_all(fetch: TFetch[T], per_page: int = 500, concurrency: int = 8) -> List[T]:
+    """Rows of every page, in order.
+
+    Keeps up to concurrency pages in flight and stops requesting more
+    once a page comes back with fewer than per_page rows.
+    """
+    pages: Dict[int, Sequence[T]] = {}
+    last: Optional[int] = None
+    with cf.ThreadPoolExecutor(concurrency) as pool:
+        running = {
+            pool.submit(fetch, page, per_page): page
+            for page in range(1, concurrency + 1)
+        }
+        next_page = concurrency + 1
+        while running:
+            done, _ = cf.wait(running, return_when=cf.FIRST_COMPLETED)
+            for future in done:
+                page = running.pop(future)
+                rows = pages[page] = future.result()
+                if len(rows) < per_page and (last is None or page < last):
+                    last = page
+            while last is None and len(running) < concurrency:
+                running[pool.submit(fetch, next_page, per_page)] = next_page
+                next_page += 1
+    return [
+        row
+        for page in sorted(pages)
+        if last is None or page <= last
+        for row in pages[page]
+    ]
@@ -0,0 +1,212 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Latency histograms per SDK method and call phase
+"""
+import math
+import threading
+import time
+from typing import Dict, List, MutableMapping, Tuple
+
+# Phases of an API call, in the order they happen
+PHASES = ("auth", "query_params", "serialize", "network", "deserialize", "total")
+# the phase running after each one is marked, "" being the start of a call
+_NEXT = {
+    "": "query_params",
+    "query_params": "serialize",
+    "serialize": "network",
+    "auth": "network",
+    "network": "deserialize",
+    "deserialize": "deserialize",
+}
+
+TStats = Dict[str, float]
+
+
+class Histogram:
+    """Running latency histogram with logarithmic buckets.
+
+    Memory is bounded by the number of distinct buckets used (each bucket
+    is GROWTH wider than the previous one), so percentiles are accurate to
+    within about 2.5%.
+    """
+
+    GROWTH = 1.05
+    MINIMUM = 1e-6
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+        self._log_growth = math.log(self.GROWTH)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        index = int(
+            math.log(max(seconds, self.MINIMUM) / self.MINIMUM) / self._log_growth
+        )
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, pct: float) -> float:
+        """Estimated latency below which pct percent of samples fall.
+        """
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                # geometric middle of the bucket
+                value = self.MINIMUM * math.pow(self.GROWTH, index + 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def stats(self) -> TStats:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class CallTimer:
+    """Splits the wall time of one API call into phases.
+
+    mark(phase) charges the time elapsed since the previous mark to phase.
+    A call that raises calls fail() before done(), to be counted as an error.
+    """
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.phases: Dict[str, float] = {}
+        self.start = self.last = time.perf_counter()
+        self.current = ""
+        self.failed = False
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.last
+        self.last = now
+        self.current = phase
+
+    def fail(self) -> None:
+        """Charge the time since the last mark to the phase that failed.
+        """
+        self.failed = True
+        self.mark(_NEXT[self.current])
+
+    def done(self) -> None:
+        self.phases["total"] = self.last - self.start
+        self.profiler.record(self.name, self.phases, self.failed)
+
+
+class Profiler:
+    """Collects per-method, per-phase latency histograms.
+
+    Failed calls are timed too, up to the phase they failed in, and
+    counted as errors of their method.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def call(self, name: str) -> CallTimer:
+        """Start timing a call to SDK method name.
+        """
+        return CallTimer(self, name)
+
+    def record(
+        self, name: str, phases: MutableMapping[str, float], failed: bool = False
+    ) -> None:
+        with self._lock:
+            if failed:
+                self._errors[name] = self._errors.get(name, 0) + 1
+            histograms = self._histograms.setdefault(name, {})
+            for phase, seconds in phases.items():
+                if phase not in histograms:
+                    histograms[phase] = Histogram()
+                histograms[phase].record(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {}
+            self._errors = {}
+
+    def stats(self) -> Dict[str, Dict[str, TStats]]:
+        """{method: {phase: {count, mean, p50, p95, p99, max}}} in seconds.
+
+        The "total" phase also has the method's count of errors.
+        """
+        with self._lock:
+            stats = {
+                name: {
+                    phase: histograms[phase].stats()
+                    for phase in PHASES
+                    if phase in histograms
+                }
+                for name, histograms in self._histograms.items()
+            }
+            for name, phases in stats.items():
+                phases["total"]["errors"] = self._errors.get(name, 0)
+            return stats
+
+    def report(self) -> str:
+        """Printable table of the stats, slowest methods first, in milliseconds.
+        """
+        stats = self.stats()
+        lines: List[str] = [
+            f"{'method':<32} {'phase':<13} {'count':>7} {'errors':>7} "
+            f"{'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+        ]
+        for name, phases in sorted(stats.items(), key=_time_spent, reverse=True):
+            for phase, phase_stats in phases.items():
+                timings = " ".join(
+                    f"{phase_stats[key] * 1000:>9.3f}"
+                    for key in ("mean", "p50", "p95", "p99", "max")
+                )
+                errors = int(phase_stats["errors"]) if "errors" in phase_stats else ""
+                lines.append(
+                    f"{name:<32} {phase:<13} {int(phase_stats['count']):>7} "
+                    f"{errors:>7} {timings}"
+                )
+        return "\n".join(lines)
+
+
+def _time_spent(item: Tuple[str, Dict[str, TStats]]) -> float:
+    total = item[1].get("total")
+    return total["mean"] * total["count"] if total else 0.0
@@ -0,0 +1,348 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Record API traffic to a file and replay it offline
+
+RecordingTransport wraps another transport and appends each request and
+its response, with timings, to a JSON lines file (gzip compressed if the
+name ends in .gz). ReplayTransport serves those responses back without a
+network, taking the recorded time, a scaled time or no time at all.
+
+Authorization headers are never recorded, and credentials and access
+tokens are removed from /login requests and responses.
+"""
+import base64
+import collections
+import gzip
+import json
+import os
+import threading
+import time
+from typing import (
+    cast,
+    IO,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from looker_sdk import error
+from looker_sdk.rtl import deadline
+from looker_sdk.rtl import instrumentation as instr
+from looker_sdk.rtl import spool
+from looker_sdk.rtl import transport
+from looker_sdk.rtl import versions
+
+# file to record to or replay from when built with configure()
+RECORDING_ENV = f"{versions.environment_prefix}_RECORDING"
+
+TRecord = Dict[str, object]
+TKey = Tuple[str, str, str, Optional[str]]
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore
+    return cast(IO[str], open(path, mode, encoding="utf-8"))
+
+
+def _encode(
+    record: TRecord, name: str, value: Optional[transport.TResponseValue]
+) -> None:
+    """Store value under name, or base64 encoded under name_b64 if bytes.
+    """
+    if isinstance(value, spool.SpooledBody):
+        value = value[:]
+    if isinstance(value, bytes):
+        try:
+            record[name] = value.decode("utf-8")
+        except UnicodeDecodeError:
+            record[f"{name}_b64"] = base64.b64encode(value).decode("ascii")
+            return
+        record[f"{name}_bytes"] = True
+    else:
+        record[name] = value
+
+
+def _decode(record: TRecord, name: str) -> Optional[Union[str, bytes]]:
+    encoded = record.get(f"{name}_b64")
+    if isinstance(encoded, str):
+        return base64.b64decode(encoded)
+    value = record.get(name)
+    if not isinstance(value, str):
+        return None
+    if record.get(f"{name}_bytes"):
+        return value.encode("utf-8")
+    return value
+
+
+def _redact_login(record: TRecord) -> None:
+    if not str(record["path"]).startswith("/login"):
+        return
+    record.pop("body", None)
+    record.pop("body_b64", None)
+    value = record.get("value")
+    if record.get("ok") and isinstance(value, str):
+        try:
+            token = cast(Dict[str, object], json.loads(value))
+        except ValueError:
+            return
+        if isinstance(token, dict) and "access_token" in token:
+            token["access_token"] = "recorded"
+            record["value"] = json.dumps(token)
+
+
+def read(path: str) -> Iterator[TRecord]:
+    """Records in the file at path, in the order they were made.
+    """
+    with _open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield cast(TRecord, json.loads(line))
+
+
+class RecordingTransport(transport.Transport):
+    """Passes requests to transport and appends them to the file at path.
+    """
+
+    def __init__(self, transport: transport.Transport, path: str):
+        self.transport = transport
+        self.path = path
+        self.instrumentation = transport.instrumentation
+        self._file = _open(path, "a")
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+
+    @classmethod
+    def configure(cls, settings: transport.TransportSettings) -> transport.Transport:
+        """RequestsTransport recording to the file named in LOOKERSDK_RECORDING.
+        """
+        from looker_sdk.rtl import requests_transport
+
+        path = os.getenv(RECORDING_ENV)
+        if not path:
+            raise error.SDKError(f"{RECORDING_ENV} must name the recording file.")
+        return cls(requests_transport.RequestsTransport.configure(settings), path)
+
+    def request(
+        self,
+        method: transport.HttpMethod,
+        path: str,
+        query_params: Optional[MutableMapping[str, str]] = None,
+        body: Optional[bytes] = None,
+        authenticator: transport.TAuthenticator = None,
+        headers: Optional[MutableMapping[str, str]] = None,
+        method_name: Optional[str] = None,
+        binary: Optional[bool] = False,
+        output: Optional[transport.TOutput] = None,
+        timeout: Optional[transport.TTimeout] = None,
+    ) -> transport.Response:
+        # only passed when needed, so older transports keep working
+        kwargs: Dict[str, object] = {}
+        if binary is not False:
+            kwargs["binary"] = binary
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        # buffer the body so it can be recorded as well as delivered
+        buffer = bytearray()
+        if output is not None:
+            kwargs["output"] = buffer
+        start = time.monotonic()
+        response = self.transport.request(
+            method,
+            path,
+            query_params=query_params,
+            body=body,
+            authenticator=authenticator,
+            headers=headers,
+            method_name=method_name,
+            **kwargs,  # type: ignore
+        )
+        elapsed = time.monotonic() - start
+        value = response.value
+        if output is not None and response.ok:
+            value = bytes(buffer)
+            if isinstance(output, bytearray):
+                output.extend(value)
+            else:
+                output.write(value)
+        record: TRecord = {
+            "start": round(start - self._start, 6),
+            "elapsed": round(elapsed, 6),
+            "method": method.name,
+            "path": path,
+            "query": dict(query_params) if query_params else None,
+            "method_name": method_name,
+            "ok": response.ok,
+            "status_code": response.status_code,
+        }
+        _encode(record, "body", body)
+        _encode(record, "value", value)
+        _redact_login(record)
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class ReplayTransport(transport.Transport):
+    """Answers requests with responses from a recording.
+
+    A request gets the recorded response to the same method, path, query
+    and body, or failing that the same method, path and query. Repeated
+    requests cycle through all matching responses in recorded order.
+
+    speed scales the recorded response times: 1.0 replays them as
+    recorded, 2.0 twice as fast, and None returns immediately. Requests
+    with no recorded response get a not-ok Response.
+    """
+
+    def __init__(
+        self,
+        records: List[TRecord],
+        speed: Optional[float] = 1.0,
+        instrumentation: Optional[instr.Instrumentation] = None,
+    ):
+        self.speed = speed
+        self.instrumentation = instrumentation or instr.Instrumentation()
+        self._exact: Dict[TKey, Deque[TRecord]] = collections.defaultdict(
+            collections.deque
+        )
+        self._loose: Dict[TKey, Deque[TRecord]] = collections.defaultdict(
+            collections.deque
+        )
+        for record in records:
+            self._exact[self._key(record, record.get("body"))].append(record)
+            self._loose[self._key(record, None)].append(record)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, speed: Optional[float] = 1.0) -> "ReplayTransport":
+        return cls(list(read(path)), speed)
+
+    @classmethod
+    def configure(cls, settings: transport.TransportSettings) -> transport.Transport:
+        """Replay the file named in LOOKERSDK_RECORDING.
+        """
+        path = os.getenv(RECORDING_ENV)
+        if not path:
+            raise error.SDKError(f"{RECORDING_ENV} must name the recording file.")
+        return cls.load(path)
+
+    @staticmethod
+    def _key(record: TRecord, body: object) -> TKey:
+        query = json.dumps(record.get("query") or {}, sort_keys=True)
+        return (
+            str(record["method"]),
+            str(record["path"]),
+            query,
+            body if isinstance(body, str) else None,
+        )
+
+    def _match(self, request: TRecord) -> Optional[TRecord]:
+        with self._lock:
+            for candidates, body in (
+                (self._exact, request.get("body")),
+                (self._loose, None),
+            ):
+                matches = candidates.get(self._key(request, body))
+                if matches:
+                    matches.rotate(-1)
+                    return matches[-1]
+        return None
+
+    def request(
+        self,
+        method: transport.HttpMethod,
+        path: str,
+        query_params: Optional[MutableMapping[str, str]] = None,
+        body: Optional[bytes] = None,
+        authenticator: transport.TAuthenticator = None,
+        headers: Optional[MutableMapping[str, str]] = None,
+        method_name: Optional[str] = None,
+        binary: Optional[bool] = False,
+        output: Optional[transport.TOutput] = None,
+        timeout: Optional[transport.TTimeout] = None,
+    ) -> transport.Response:
+        deadline.check()
+        start = time.perf_counter()
+        if authenticator:
+            authenticator()
+        request: TRecord = {
+            "method": method.name,
+            "path": path,
+            "query": dict(query_params) if query_params else None,
+        }
+        _encode(request, "body", body)
+        record = self._match(request)
+        ok = False
+        value: Union[str, bytes] = f"No recorded response for {method.name} {path}"
+        status_code: Optional[int] = None
+        if record is not None:
+            if self.speed:
+                delay = cast(float, record["elapsed"]) / self.speed
+                left = deadline.remaining()
+                if left is not None and left < delay:
+                    time.sleep(max(left, 0))
+                    raise error.DeadlineExceeded("Deadline exceeded")
+                time.sleep(delay)
+            ok = bool(record["ok"])
+            value = _decode(record, "value") or ""
+            status_code = cast(Optional[int], record.get("status_code"))
+        if ok:
+            if binary and isinstance(value, str):
+                value = value.encode("utf-8")
+            elif binary is False and isinstance(value, bytes):
+                value = value.decode("utf-8")
+            if output is not None:
+                data = value.encode("utf-8") if isinstance(value, str) else value
+                if isinstance(output, bytearray):
+                    output.extend(data)
+                else:
+                    output.write(data)
+                value = b""
+        response = transport.Response(ok, value, status_code)
+        if self.instrumentation.enabled:
+            self.instrumentation.emit(
+                instr.RequestEvent(
+                    method=method.name,
+                    path=path,
+                    url=path,
+                    method_name=method_name,
+                    ok=response.ok,
+                    status_code=status_code,
+                    request_bytes=len(body) if body else 0,
+                    response_bytes=len(response.value),
+                    total=time.perf_counter() - start,
+                )
+            )
+        return response
@@ -24,10 +24,15 @@
 """
 
 import logging
-from typing import Callable, Dict, MutableMapping, Optional
+import time
+from typing import Callable, Dict, Iterator, MutableMapping, Optional, Tuple
 
 import requests
 
+from looker_sdk.rtl import deadline
+from looker_sdk.rtl import instrumentation as instr
+from looker_sdk.rtl import spool
+from looker_sdk.rtl import tracing
 from looker_sdk.rtl import transport
 
 
@@ -35,8 +40,14 @@ class RequestsTransport(transport.Transport):
     """RequestsTransport implementation of Transport.
     """
 
+    # bytes read from the socket at a time when streaming to an output
+    chunk_size = 64 * 1024
+
     def __init__(
-        self, settings: transport.TransportSettings, session: requests.Session
+        self,
+        settings: transport.TransportSettings,
+        session: requests.Session,
+        instrumentation: Optional[instr.Instrumentation] = None,
     ):
 
         headers: Dict[str, str] = {"User-Agent": settings.agent_tag}
@@ -45,10 +56,13 @@ class RequestsTransport(transport.Transport):
         session.headers.update(headers)
         session.verify = settings.verify_ssl
         self.session = session
+        self.timeout = settings.timeouts
+        self.spool_threshold = settings.spool_threshold
 
         self.api_path: str = f"{settings.base_url}/api/{settings.api_version}"
         self.agent: str = f"LookerSDK Python {settings.api_version}"
         self.logger = logging.getLogger(__name__)
+        self.instrumentation = instrumentation or instr.Instrumentation()
 
     @classmethod
     def configure(cls, settings: transport.TransportSettings) -> transport.Transport:
@@ -62,24 +76,150 @@ class RequestsTransport(transport.Transport):
         body: Optional[bytes] = None,
         authenticator: Optional[Callable[[], Dict[str, str]]] = None,
         headers: Optional[MutableMapping[str, str]] = None,
+        method_name: Optional[str] = None,
+        binary: Optional[bool] = False,
+        output: Optional[transport.TOutput] = None,
+        timeout: Optional[transport.TTimeout] = None,
     ) -> transport.Response:
 
+        timeout = deadline.clip(timeout or self.timeout)
         url = f"{self.api_path}{path}"
         if headers is None:
             headers = {}
         if authenticator:
             headers.update(authenticator())
-        logging.info("%s(%s)", method.name, url)
-        try:
-            resp = self.session.request(
-                method.name, url, params=query_params, data=body, headers=headers
+        self.logger.info("%s(%s)", method.name, url)
+        event: Optional[instr.RequestEvent] = None
+        if self.instrumentation.enabled:
+            event = instr.RequestEvent(
+                method=method.name,
+                path=path,
+                url=url,
+                method_name=method_name,
+                request_bytes=len(body) if body else 0,
             )
-        except IOError as exc:
-            ret = transport.Response(False, str(exc))
-        else:
-            if resp.ok:
-                ret = transport.Response(True, resp.text)
+            connections = self._connection_count(url)
+            start = time.perf_counter()
+        with tracing.span(
+            f"HTTP {method.name}", **{"http.method": method.name, "http.url": url}
+        ) as span:
+            tracing.inject(headers)
+            try:
+                resp = self.session.request(
+                    method.name,
+                    url,
+                    params=query_params,
+                    data=body,
+                    headers=headers,
+                    # read in chunks to stop at the deadline or to spool
+                    stream=output is not None
+                    or deadline.remaining() is not None
+                    or self.spool_threshold is not None,
+                    timeout=timeout,
+                )
+                span.set_attribute("http.status_code", resp.status_code)
+                value, size = self._read(resp, binary, output)
+            except IOError as exc:
+                deadline.check()
+                ret = transport.Response(False, str(exc))
+                if event:
+                    event.error = str(exc)
             else:
-                ret = transport.Response(False, resp.text)
+                ret = transport.Response(resp.ok, value, resp.status_code)
+                if event:
+                    self._describe(event, resp, connections, size)
+        if event:
+            event.total = time.perf_counter() - start
+            event.ok = ret.ok
+            self.instrumentation.emit(event)
 
         return ret
+
+    def _read(
+        self,
+        resp: requests.Response,
+        binary: Optional[bool],
+        output: Optional[transport.TOutput],
+    ) -> Tuple[transport.TResponseValue, Optional[int]]:
+        """Response value and, if it was streamed, body size in bytes.
+        """
+        if output is None and self.spool_threshold is not None and resp.ok:
+            return self._spool(resp, binary)
+        if output is None:
+            self._load(resp)
+        if not resp.ok:
+            return resp.text, None
+        if output is not None:
+            size = 0
+            with resp:
+                for chunk in resp.iter_content(self.chunk_size):
+                    deadline.check()
+                    size += len(chunk)
+                    if isinstance(output, bytearray):
+                        output.extend(chunk)
+                    else:
+                        output.write(chunk)
+            return b"", size
+        if binary is None:
+            binary = not transport.is_text(resp.headers.get("Content-Type", ""))
+        return resp.content if binary else resp.text, None
+
+    def _load(self, resp: requests.Response) -> None:
+        """Read the body of a streamed response, unless the deadline passes.
+        """
+        if deadline.remaining() is None:
+            return
+        with resp:
+            # where requests keeps the body for .content and .text
+            resp._content = b"".join(self._chunks(resp))
+
+    def _spool(
+        self, resp: requests.Response, binary: Optional[bool]
+    ) -> Tuple[transport.TResponseValue, int]:
+        """Like _load() but large bodies go to a spool.SpooledBody.
+        """
+        with resp:
+            value = spool.read(
+                self._chunks(resp), self.spool_threshold, resp.encoding  # type: ignore
+            )
+        if isinstance(value, spool.SpooledBody):
+            return value, len(value)
+        resp._content = value
+        if binary is None:
+            binary = not transport.is_text(resp.headers.get("Content-Type", ""))
+        return value if binary else resp.text, len(value)
+
+    def _chunks(self, resp: requests.Response) -> Iterator[bytes]:
+        for chunk in resp.iter_content(self.chunk_size):
+            deadline.check()
+            yield chunk
+
+    def _connection_count(self, url: str) -> Optional[int]:
+        """Number of connections the urllib3 pool for url has opened so far.
+        """
+        try:
+            adapter = self.session.get_adapter(url)
+            pool = adapter.poolmanager.connection_from_url(url)  # type: ignore
+            return int(pool.num_connections)
+        except (AttributeError, requests.exceptions.RequestException):
+            return None
+
+    def _describe(
+        self,
+        event: instr.RequestEvent,
+        resp: requests.Response,
+        connections: Optional[int],
+        size: Optional[int],
+    ) -> None:
+        """Fill in event fields that are known once the response arrives.
+        """
+        event.status_code = resp.status_code
+        event.response_bytes = len(resp.content) if size is None else size
+        # requests measures elapsed from sending until headers are parsed
+        event.ttfb = resp.elapsed.total_seconds()
+        retries = getattr(resp.raw, "retries", None)
+        if retries is not None:
+            event.retries = len(retries.history)
+        after = self._connection_count(event.url)
+        if connections is not None and after is not None:
+            event.connection_reused = after == connections
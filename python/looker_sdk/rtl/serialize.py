@@ -26,21 +26,34 @@ import datetime
 import functools
 import json
 import keyword
+import os
 
 # ignoring "Module 'typing' has no attribute 'ForwardRef'"
 from typing import (  # type: ignore
     Callable,
+    cast,
+    Collection,
+    Dict,
     ForwardRef,
+    Iterable,
+    List,
+    Mapping,
     MutableMapping,
+    Optional,
     Sequence,
+    Tuple,
     Type,
     Union,
 )
 
+import attr
 import cattr
 
 from looker_sdk.rtl import model
+from looker_sdk.rtl import spool
+from looker_sdk.rtl import timestamp
 from looker_sdk.rtl import transport
+from looker_sdk.rtl import versions
 
 
 class DeserializeError(Exception):
@@ -66,14 +79,18 @@ def deserialize(
 ) -> TDeserializeReturn:
     """Translate API data into models.
     """
+    # json.loads needs the whole body: a spooled one is copied into memory
+    body = bytes(data) if isinstance(data, spool.SpooledBody) else data
     try:
-        data = json.loads(data)
+        data = json.loads(body)
     except json.JSONDecodeError:
         raise DeserializeError("Bad data")
     try:
         response: TDeserializeReturn = cattr.structure(data, structure)  # type: ignore
     except (TypeError, AttributeError):
         raise DeserializeError("Bad data")
+    # so that a PATCH can send only what changed
+    _track(response)
     return response
 
 
@@ -84,6 +101,328 @@ def serialize(api_model: TModelOrSequence) -> bytes:
     return json.dumps(data).encode("utf-8")  # type: ignore
 
 
+def changes(api_model: model.Model) -> Optional[List[str]]:
+    """JSON keys of the fields of api_model changed since it was deserialized.
+
+    A field changed if it was assigned, or if it holds a list, dict or
+    model that was changed in place. None if api_model was not
+    deserialized, or model.send_all() was called on it.
+    """
+    changed = api_model._changed
+    if changed is None:
+        return None
+    loaded = api_model._loaded or {}
+    keys = []
+    for key, attribute in _keys(api_model):
+        value: object = getattr(api_model, attribute)
+        if value is None:
+            # never sent
+            continue
+        if attribute in changed or (
+            isinstance(value, NESTED) and _differs(value, loaded.get(attribute))
+        ):
+            keys.append(key)
+    return keys
+
+
+def serialize_changes(api_model: TModelOrSequence) -> bytes:
+    """Like serialize(), but only the fields changes() lists for a model.
+    """
+    if not isinstance(api_model, model.Model):
+        return serialize(api_model)
+    keys = changes(api_model)
+    if keys is None:
+        return serialize(api_model)
+    converter = converters.get(type(api_model))
+    if converter:
+        data = converter.unstructure(api_model, keys)
+    else:
+        data = cast(Dict[str, object], unstructure_hook(api_model))
+        data = {key: value for key, value in data.items() if key in keys}
+    return json.dumps(data).encode("utf-8")
+
+
+def _keys(api_model: model.Model) -> List[Tuple[str, str]]:
+    """(JSON key, attribute) of each field of api_model
+    """
+    converter = converters.get(type(api_model))
+    if converter:
+        return [(key, attribute) for key, (attribute, _) in converter.fields.items()]
+    keys = []
+    for attribute in cast(Dict[str, object], attr.fields_dict(type(api_model))):
+        key = attribute
+        if key.endswith("_") and key[:-1] in keyword.kwlist:
+            key = key[:-1]
+        keys.append((key, attribute))
+    return keys
+
+
+def _track(value: object) -> None:
+    """Start recording changes to the models in value.
+
+    Models built by a ModelConverter are tracked from the start.
+    """
+    if isinstance(value, list):
+        for item in cast(List[object], value):
+            _track(item)
+    elif isinstance(value, dict):
+        for item in cast(Dict[str, object], value).values():
+            _track(item)
+    elif isinstance(value, model.Model) and value._changed is None:
+        loaded: Dict[str, object] = {}
+        for _, attribute in _keys(value):
+            field: object = getattr(value, attribute)
+            if isinstance(field, NESTED):
+                loaded[attribute] = _snapshot(field)
+                _track(field)
+        value._loaded = loaded
+        value._changed = set()
+
+
+def _snapshot(value: object) -> object:
+    """Shallow copy of value, sharing the models and scalars in it.
+    """
+    if isinstance(value, list):
+        return tuple(
+            [
+                _snapshot(item) if isinstance(item, (list, dict)) else item
+                for item in cast(List[object], value)
+            ]
+        )
+    if isinstance(value, dict):
+        return {
+            k: _snapshot(item) if isinstance(item, (list, dict)) else item
+            for k, item in cast(Dict[str, object], value).items()
+        }
+    return value
+
+
+def _differs(value: object, loaded: object) -> bool:
+    """True if value is not loaded, its snapshot, or was changed in place.
+    """
+    if isinstance(value, model.Model):
+        return value is not loaded or changes(value) != []
+    if isinstance(value, list):
+        items = cast(List[object], value)
+        if not isinstance(loaded, tuple) or len(items) != len(loaded):
+            return True
+        return any(map(_differs, items, cast(Tuple[object, ...], loaded)))
+    if isinstance(value, dict):
+        mapping = cast(Dict[str, object], value)
+        if not isinstance(loaded, dict) or mapping.keys() != loaded.keys():
+            return True
+        snapshot = cast(Dict[str, object], loaded)
+        return any(_differs(item, snapshot[k]) for k, item in mapping.items())
+    return value is not loaded and value != loaded
+
+
+# (attribute, json key, type) of a generated model field. type is a scalar
+# name ("int", "str", "datetime.datetime"...), a model name or a
+# ("Sequence" | "MutableMapping", type) pair.
+TFieldType = Union[str, Tuple[str, "TFieldType"]]
+TField = Tuple[str, str, TFieldType]
+# JSON value of a field, never null, -> attribute value
+TConvert = Callable[[object], object]
+
+# the JSON values of a scalar field are ones its type accepts
+SCALARS: Dict[str, TConvert] = {
+    "int": cast(TConvert, int),
+    "float": cast(TConvert, float),
+    "str": str,
+    "bool": bool,
+    "datetime.datetime": cast(TConvert, timestamp.parse),
+}
+PRIMITIVES = (str, int, float, bool)
+# field values that can change in place
+NESTED = (list, dict, model.Model)
+
+
+class ModelConverter:
+    """Structures and unstructures one generated model class.
+    """
+
+    def __init__(
+        self,
+        cls: Type[model.Model],
+        fields: Dict[str, Tuple[str, TConvert]],
+        nested: Collection[str] = (),
+    ):
+        self.cls = cls
+        # json key -> (attribute, convert)
+        self.fields = fields
+        # attributes of the list, dict and model fields
+        self.nested = frozenset(nested)
+        self.defaults = _defaults(cls)
+
+    def structure(self, data: Mapping[str, object]) -> model.Model:
+        """Model from JSON data, tracking changes from the start.
+        """
+        kwargs: Dict[str, object] = {}
+        for key, value in data.items():
+            field = self.fields.get(key)
+            if field:
+                attribute, convert = field
+                kwargs[attribute] = value if value is None else convert(value)
+        if self.defaults is None:
+            api_model = self.cls(**kwargs)  # type: ignore
+            state = cast(Dict[str, object], api_model.__dict__)
+        else:
+            # skips __init__, which would call Model.__setattr__ per field
+            api_model = self.cls.__new__(self.cls)
+            state = cast(Dict[str, object], api_model.__dict__)
+            state.update(self.defaults)
+            state.update(kwargs)
+        state["_loaded"] = {
+            attribute: _snapshot(kwargs[attribute])
+            for attribute in self.nested.intersection(kwargs)
+        }
+        state["_changed"] = set()
+        return api_model
+
+    def unstructure(
+        self, api_model: model.Model, keys: Optional[Iterable[str]] = None
+    ) -> Dict[str, object]:
+        """JSON data of api_model, or of just the fields with these JSON keys.
+        """
+        data: Dict[str, object] = {}
+        fields: Iterable[Tuple[str, Tuple[str, TConvert]]] = self.fields.items()
+        if keys is not None:
+            fields = [(key, self.fields[key]) for key in keys]
+        for key, (attribute, _) in fields:
+            value: object = getattr(api_model, attribute)
+            if value is None:
+                continue
+            if isinstance(value, PRIMITIVES):
+                data[key] = None if value == cast(str, model.EXPLICIT_NULL) else value
+            else:
+                data[key] = cattr.unstructure(value)  # type: ignore
+        return data
+
+
+def _defaults(cls: Type[model.Model]) -> Optional[Dict[str, object]]:
+    """attribute -> default value of each field of cls.
+
+    None if cls must be built by its __init__: a field is required, or has
+    a factory, validator or converter.
+    """
+    defaults: Dict[str, object] = {}
+    for field in cast(Sequence[object], attr.fields(cls)):
+        name: str = getattr(field, "name")
+        default: object = getattr(field, "default")
+        validator: object = getattr(field, "validator")
+        converter: object = getattr(field, "converter")
+        if (
+            default is attr.NOTHING
+            or isinstance(default, attr.Factory)  # type: ignore
+            or validator
+            or converter
+        ):
+            return None
+        defaults[name] = default
+    return defaults
+
+
+class ConverterRegistry:
+    """Converters for generated models, built from precomputed fields.
+
+    The generator writes every model's fields to sdk/converters.py, so
+    models in the registry are converted without attrs reflection,
+    ForwardRef eval or reserved word lookups. Each model's converter is
+    built the first time it is needed.
+    """
+
+    def __init__(self) -> None:
+        # model name -> (name -> class, name -> fields)
+        self._sources: Dict[
+            str, Tuple[Mapping[str, Type[model.Model]], Mapping[str, Sequence[TField]]]
+        ] = {}
+        self._by_name: Dict[str, ModelConverter] = {}
+        self._by_class: Dict[Type[model.Model], Optional[ModelConverter]] = {}
+
+    def register(
+        self,
+        models: Mapping[str, Type[model.Model]],
+        fields: Mapping[str, Sequence[TField]],
+    ) -> None:
+        """Add models, a mapping of model name to class, described by fields.
+        """
+        for name in fields:
+            self._sources[name] = (models, fields)
+        self.reset()
+
+    def get(self, cls: Type[model.Model]) -> Optional[ModelConverter]:
+        """Converter for cls or None if it is not a registered model.
+        """
+        try:
+            return self._by_class[cls]
+        except KeyError:
+            pass
+        name = cls.__name__
+        source = self._sources.get(name)
+        converter = None
+        if source and source[0].get(name) is cls:
+            converter = self.converter(name)
+        self._by_class[cls] = converter
+        return converter
+
+    def reset(self) -> None:
+        """Drop built converters, e.g. after SCALARS changed.
+        """
+        self._by_name.clear()
+        self._by_class.clear()
+
+    def converter(self, name: str) -> ModelConverter:
+        try:
+            return self._by_name[name]
+        except KeyError:
+            pass
+        models, fields = self._sources[name]
+        converter = self._by_name[name] = ModelConverter(
+            models[name],
+            {key: (attribute, self._convert(t)) for attribute, key, t in fields[name]},
+            [attribute for attribute, _, t in fields[name] if t not in SCALARS],
+        )
+        return converter
+
+    def _convert(self, type_: TFieldType) -> TConvert:
+        if isinstance(type_, tuple):
+            container, item_type = type_
+            item = self._convert(item_type)
+            if container == "Sequence":
+                return lambda value: [item(v) for v in cast(List[object], value)]
+            return lambda value: {
+                k: item(v) for k, v in cast(Dict[str, object], value).items()
+            }
+        if type_ in SCALARS:
+            return SCALARS[type_]
+        if type_ in self._sources:
+            name = type_
+            # resolved per call: the model may refer back to itself
+            return lambda value: self.converter(name).structure(
+                cast(Mapping[str, object], value)
+            )
+        return _identity
+
+
+def _identity(value: object) -> object:
+    return value
+
+
+converters = ConverterRegistry()
+
+
+def lazy_datetimes(enabled: bool = True) -> None:
+    """Keep timestamps as raw strings, parsed on first use.
+
+    Deserialized datetime fields become timestamp.LazyDatetime values.
+    Defaults to the <package-prefix>_LAZY_DATETIMES env variable.
+    """
+    SCALARS["datetime.datetime"] = cast(
+        TConvert, timestamp.LazyDatetime if enabled else timestamp.parse
+    )
+    converters.reset()
+
+
 def structure_hook(context, data, type_):
     """cattr structure hook
 
@@ -91,13 +430,17 @@ def structure_hook(context, data, type_):
     - handle ForwardRef types until github.com/Tinche/cattrs/pull/42/ is fixed
        Note: this is the reason we need a "context" param and have to use a
        partial func to register the hook. Once the issue is resolved we can
-       remove "context" and the partial.
+       remove "context" and the partial. context is any mapping of names
+       to models, e.g. a module's globals() or model.LazyModels.
     """
+    if isinstance(type_, ForwardRef):
+        type_ = context[type_.__forward_arg__]
+    converter = converters.get(type_)
+    if converter:
+        return converter.structure(data)
     for reserved in keyword.kwlist:
         if reserved in data:
             data[f"{reserved}_"] = data.pop(reserved)
-    if isinstance(type_, ForwardRef):
-        type_ = eval(type_.__forward_arg__, context, locals())
     instance = cattr.structure_attrs_fromdict(data, type_)
     return instance
 
@@ -110,6 +453,9 @@ def unstructure_hook(api_model):
     EXPLICIT_NULL fields to None so that we only send null
     in the json for fields the caller set EXPLICIT_NULL on.
     """
+    converter = converters.get(type(api_model))
+    if converter:
+        return converter.unstructure(api_model)
     data = cattr.global_converter.unstructure_attrs_asdict(api_model)
     for key, value in data.copy().items():
         if value is None:
@@ -125,9 +471,13 @@ def unstructure_hook(api_model):
 structure_hook_func = functools.partial(structure_hook, globals())  # type: ignore
 cattr.register_structure_hook(model.Model, structure_hook_func)  # type: ignore
 cattr.register_structure_hook(
-    datetime.datetime,
-    lambda d, _: datetime.datetime.strptime(  # type: ignore
-        d, "%Y-%m-%dT%H:%M:%S.%f%z"
-    ),
+    datetime.datetime, lambda d, _: SCALARS["datetime.datetime"](d)  # type: ignore
 )
 cattr.register_unstructure_hook(model.Model, unstructure_hook)  # type: ignore
+cattr.register_unstructure_hook(
+    datetime.datetime, lambda d: d.isoformat()  # type: ignore
+)
+lazy_datetimes(
+    os.getenv(f"{versions.environment_prefix}_LAZY_DATETIMES", "").lower()
+    in ("yes", "y", "true", "t", "1")
+)
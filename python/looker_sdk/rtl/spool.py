@@ -0,0 +1,113 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Large response bodies kept in a temporary file instead of memory
+"""
+import mmap
+import tempfile
+from typing import IO, Iterable, Iterator, Optional, Union
+
+
+class SpooledBody:
+    """A response body in an unlinked temporary file, read through mmap.
+
+    It reads like bytes: len(), indexing and slicing (body[:] copies it
+    all into memory), find() and lines(). decode() returns the text. The
+    pages are file backed, so the OS can drop them under memory pressure.
+    Call close(), or use it as a context manager, to free the file early.
+    """
+
+    def __init__(self, file: IO[bytes], encoding: Optional[str] = None):
+        self.file = file
+        self.encoding = encoding or "utf-8"
+        self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.mmap)
+
+    def __getitem__(self, index):
+        return self.mmap[index]
+
+    def __bytes__(self) -> bytes:
+        return self.mmap[:]
+
+    def __repr__(self) -> str:
+        return f"<SpooledBody {len(self)} bytes>"
+
+    def __enter__(self) -> "SpooledBody":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def find(self, sub: bytes, start: int = 0) -> int:
+        return self.mmap.find(sub, start)
+
+    def lines(self) -> Iterator[bytes]:
+        """Each line, with its b"\\n", one at a time.
+        """
+        start, size = 0, len(self)
+        while start < size:
+            end = self.mmap.find(b"\n", start)
+            end = size if end == -1 else end + 1
+            yield self.mmap[start:end]
+            start = end
+
+    def decode(self, encoding: Optional[str] = None, errors: str = "replace") -> str:
+        """The body as str, by default in the charset of its Content-Type.
+        """
+        return self.mmap[:].decode(encoding or self.encoding, errors)
+
+    def close(self) -> None:
+        if not self.mmap.closed:
+            self.mmap.close()
+        self.file.close()
+
+
+def read(
+    chunks: Iterable[bytes], threshold: int, encoding: Optional[str] = None
+) -> Union[bytes, SpooledBody]:
+    """The body made of chunks: bytes, or a SpooledBody if over threshold bytes.
+
+    Only the first threshold bytes or so are held in memory.
+    """
+    chunks = iter(chunks)
+    head = []
+    size = 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size > threshold:
+            break
+    else:
+        return b"".join(head)
+    spooled = tempfile.TemporaryFile()
+    try:
+        spooled.writelines(head)
+        del head
+        for chunk in chunks:
+            spooled.write(chunk)
+        spooled.flush()
+    except BaseException:
+        spooled.close()
+        raise
+    return SpooledBody(spooled, encoding)
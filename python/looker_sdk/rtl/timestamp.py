@@ -0,0 +1,135 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Fast parsing of API timestamps
+
+Uses ciso8601 when it is installed, else datetime.fromisoformat. Looker
+timestamps (2019-09-25T16:33:10.123+00:00) go straight through
+fromisoformat; other ISO 8601 spellings (Z, +0000, no or long fractions)
+are normalised first.
+"""
+import datetime
+import re
+from typing import Callable, Optional, Tuple, Union, cast
+
+try:
+    import ciso8601  # type: ignore
+except ImportError:  # pragma: no cover
+    ciso8601 = None
+
+
+_ISO = re.compile(
+    r"(?P<main>\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?)?)"
+    r"(?:[.,](?P<fraction>\d+))?"
+    r"(?P<offset>[Zz]|[+-]\d{2}(?::?\d{2})?)?$"
+)
+
+
+def parse_isoformat(value: str) -> datetime.datetime:
+    """Parse an ISO 8601 timestamp with datetime.fromisoformat.
+    """
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    match = _ISO.match(value)
+    if not match:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    main, fraction, offset = cast(
+        Tuple[str, Optional[str], Optional[str]],
+        match.group("main", "fraction", "offset"),
+    )
+    if fraction:
+        # fromisoformat only reads 3 or 6 digits
+        main += "." + fraction[:6].ljust(6, "0")
+    if offset in ("Z", "z"):
+        main += "+00:00"
+    elif offset:
+        main += f"{offset[:3]}:{offset[-2:]}" if len(offset) > 3 else offset + ":00"
+    return datetime.datetime.fromisoformat(main)
+
+
+if ciso8601:  # type: ignore
+    BACKEND = "ciso8601"
+    parse: Callable[[str], datetime.datetime] = ciso8601.parse_datetime  # type: ignore
+else:  # pragma: no cover
+    BACKEND = "fromisoformat"
+    parse = parse_isoformat
+
+
+class LazyDatetime(str):
+    """Timestamp kept as the raw API string until it is used as a datetime.
+
+    The parsed datetime is .parsed, computed on first use. Attributes str
+    does not have (year, tzinfo, timestamp()...) are read from it, so most
+    code written for datetime fields keeps working. Compared with a datetime
+    or another LazyDatetime it compares as .parsed, and it hashes as .parsed.
+    It serializes back to the original string.
+    """
+
+    _parsed: Optional[datetime.datetime] = None
+
+    @property
+    def parsed(self) -> datetime.datetime:
+        if self._parsed is None:
+            self._parsed = parse(self)
+        return self._parsed
+
+    def __getattr__(self, name: str) -> object:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return cast(object, getattr(self.parsed, name))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (datetime.datetime, LazyDatetime)):
+            return self.parsed == _datetime(other)
+        return str.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __lt__(self, other: Union[str, datetime.datetime]) -> bool:
+        if isinstance(other, (datetime.datetime, LazyDatetime)):
+            return self.parsed < _datetime(other)
+        return str.__lt__(self, other)
+
+    def __le__(self, other: Union[str, datetime.datetime]) -> bool:
+        if isinstance(other, (datetime.datetime, LazyDatetime)):
+            return self.parsed <= _datetime(other)
+        return str.__le__(self, other)
+
+    def __gt__(self, other: Union[str, datetime.datetime]) -> bool:
+        if isinstance(other, (datetime.datetime, LazyDatetime)):
+            return self.parsed > _datetime(other)
+        return str.__gt__(self, other)
+
+    def __ge__(self, other: Union[str, datetime.datetime]) -> bool:
+        if isinstance(other, (datetime.datetime, LazyDatetime)):
+            return self.parsed >= _datetime(other)
+        return str.__ge__(self, other)
+
+    def __hash__(self) -> int:
+        return hash(self.parsed)
+
+
+def _datetime(value: Union[datetime.datetime, LazyDatetime]) -> datetime.datetime:
+    return value.parsed if isinstance(value, LazyDatetime) else value
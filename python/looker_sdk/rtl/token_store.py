@@ -0,0 +1,256 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Stores that let several processes share auth tokens
+
+Worker processes on one host that use the same store log in once between
+them instead of once each. A token is only refreshed while holding the
+store's lock for its key, so concurrent workers do not all log in when it
+expires.
+"""
+import abc
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from typing import cast, ContextManager, Dict, Iterator, Optional, Tuple
+
+from looker_sdk import error
+from looker_sdk.rtl import auth_token
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+
+class TokenStore(abc.ABC):
+    """Keeps AuthTokens by key, e.g. "<base_url> <client_id> admin".
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[auth_token.AuthToken]:
+        """The stored token, or None. Expired tokens may be returned.
+        """
+
+    @abc.abstractmethod
+    def put(self, key: str, token: auth_token.AuthToken) -> None:
+        """Store token under key.
+        """
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Forget the token under key, if any.
+        """
+
+    @abc.abstractmethod
+    def lock(self, key: str) -> ContextManager[None]:
+        """Hold while refreshing the token under key.
+        """
+
+
+class MemoryTokenStore(TokenStore):
+    """Tokens shared by the threads of one process.
+    """
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, auth_token.AuthToken] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[auth_token.AuthToken]:
+        return self._tokens.get(key)
+
+    def put(self, key: str, token: auth_token.AuthToken) -> None:
+        self._tokens[key] = token
+
+    def delete(self, key: str) -> None:
+        self._tokens.pop(key, None)
+
+    @contextlib.contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            yield
+
+
+class FileTokenStore(TokenStore):
+    """One JSON file per token in directory, locked with flock.
+
+    Files are written atomically and are only readable by the owner.
+    """
+
+    def __init__(self, directory: str):
+        if fcntl is None:  # pragma: no cover
+            raise error.SDKError("FileTokenStore needs fcntl.flock")
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.directory = directory
+
+    def _path(self, key: str, suffix: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{name}{suffix}")
+
+    def get(self, key: str) -> Optional[auth_token.AuthToken]:
+        try:
+            with open(self._path(key, ".json")) as f:
+                return load(cast(Dict[str, object], json.load(f)))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, token: auth_token.AuthToken) -> None:
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(dump(token), f)
+            os.replace(temp, self._path(key, ".json"))
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key, ".json"))
+        except FileNotFoundError:
+            pass
+
+    @contextlib.contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        fd = os.open(self._path(key, ".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+
+class SQLiteTokenStore(TokenStore):
+    """Tokens in a SQLite database file.
+
+    lock() claims a lease on its key's row in a locks table with a
+    conditional UPDATE, so it only waits for holders of the same key and
+    no transaction stays open while it is held. A lease left by a process
+    that died expires after lease seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        timeout: float = 30.0,
+        lease: float = 60.0,
+        poll_interval: float = 0.01,
+    ):
+        self.path = path
+        self.timeout = timeout
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, token TEXT)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS locks"
+            " (key TEXT PRIMARY KEY, owner TEXT, expires_at REAL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # connections cannot be shared between threads
+        connection = cast(
+            Optional[sqlite3.Connection], getattr(self._local, "connection", None)
+        )
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[auth_token.AuthToken]:
+        row = cast(
+            Optional[Tuple[str]],
+            self._connection()
+            .execute("SELECT token FROM tokens WHERE key = ?", (key,))
+            .fetchone(),
+        )
+        return load(cast(Dict[str, object], json.loads(row[0]))) if row else None
+
+    def put(self, key: str, token: auth_token.AuthToken) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO tokens (key, token) VALUES (?, ?)",
+            (key, json.dumps(dump(token))),
+        )
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM tokens WHERE key = ?", (key,))
+
+    @contextlib.contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        connection = self._connection()
+        owner = uuid.uuid4().hex
+        connection.execute(
+            "INSERT OR IGNORE INTO locks (key, owner, expires_at) VALUES (?, NULL, 0)",
+            (key,),
+        )
+        while True:
+            now = time.time()
+            claimed = connection.execute(
+                "UPDATE locks SET owner = ?, expires_at = ?"
+                " WHERE key = ? AND (owner IS NULL OR expires_at < ?)",
+                (owner, now + self.lease, key, now),
+            ).rowcount
+            if claimed:
+                break
+            time.sleep(self.poll_interval)
+        try:
+            yield
+        finally:
+            connection.execute(
+                "UPDATE locks SET owner = NULL WHERE key = ? AND owner = ?",
+                (key, owner),
+            )
+
+
+def dump(token: auth_token.AuthToken) -> Dict[str, object]:
+    return {
+        "access_token": token.access_token,
+        "token_type": token.token_type,
+        "expires_in": token.expires_in,
+        "expires_at": token.expires_at.timestamp(),
+    }
+
+
+def load(data: Dict[str, object]) -> auth_token.AuthToken:
+    token = auth_token.AuthToken()
+    token.access_token = str(data["access_token"])
+    token.token_type = str(data["token_type"])
+    token.expires_in = int(data["expires_in"])  # type: ignore
+    token.expires_at = datetime.datetime.fromtimestamp(
+        float(data["expires_at"])  # type: ignore
+    )
+    return token
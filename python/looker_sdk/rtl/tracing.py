@@ -0,0 +1,90 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Optional OpenTelemetry tracing
+
+If the opentelemetry-api package is installed, API calls produce nested
+spans: the generated method, then auth, transport and deserialize. Without
+it every span is a shared no-op object.
+"""
+from typing import Callable, ContextManager, Dict, MutableMapping, Optional, Union
+
+TAttribute = Optional[Union[str, bool, int, float]]
+# the opentelemetry functions used, typed here and None without it
+get_tracer: Optional[Callable[[str], "Tracer"]] = None
+propagate_inject: Optional[Callable[[MutableMapping[str, str]], None]] = None
+
+try:
+    from opentelemetry.trace import get_tracer  # type: ignore
+    from opentelemetry.propagate import inject as propagate_inject  # type: ignore
+except ImportError:  # pragma: no cover
+    pass
+
+
+class NoopSpan:
+    """Stand-in span used when opentelemetry is not installed.
+    """
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: TAttribute) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+class Tracer:
+    """The part of opentelemetry.trace.Tracer used here, for typing only.
+    """
+
+    def start_as_current_span(
+        self, name: str, attributes: Dict[str, TAttribute]
+    ) -> ContextManager[NoopSpan]:
+        raise NotImplementedError
+
+
+NOOP_SPAN = NoopSpan()
+enabled: bool = get_tracer is not None
+
+
+def span(name: str, **attributes: TAttribute) -> ContextManager[NoopSpan]:
+    """Start a span as a child of the current span.
+
+    Attributes set to None are omitted.
+    """
+    if get_tracer is None:
+        return NOOP_SPAN
+    return get_tracer(__name__).start_as_current_span(
+        name, attributes={k: v for k, v in attributes.items() if v is not None}
+    )
+
+
+def inject(headers: MutableMapping[str, str]) -> None:
+    """Add W3C traceparent (and tracestate) for the current span to headers.
+    """
+    if propagate_inject is not None:
+        propagate_inject(headers)
@@ -24,10 +24,12 @@
 """
 import abc
 import enum
-from typing import Callable, Dict, MutableMapping, Optional, Union
+from typing import IO, Callable, Dict, MutableMapping, Optional, Tuple, Union
 
 import attr
 
+from looker_sdk.rtl import instrumentation as instr
+from looker_sdk.rtl import spool
 from looker_sdk.rtl import versions
 
 
@@ -53,6 +55,12 @@ class TransportSettings:
     api_version: str = "3.1"
     verify_ssl: bool = True
     headers: Optional[MutableMapping[str, str]] = None
+    # seconds to wait for a connection, and for each read of the response
+    connect_timeout: float = 10.0
+    timeout: float = 120.0
+    # response bodies larger than this many bytes are written to a
+    # temporary file and returned as a spool.SpooledBody
+    spool_threshold: Optional[int] = None
 
     @property
     def url(self) -> str:
@@ -66,9 +74,31 @@ class TransportSettings:
         """
         return f"PY-SDK {versions.sdk_version}"
 
+    @property
+    def timeouts(self) -> "TTimeout":
+        """(connect, read) timeouts in seconds
+        """
+        return (self.connect_timeout, self.timeout)
+
 
-TResponseValue = Union[str, bytes]
+TResponseValue = Union[str, bytes, spool.SpooledBody]
 TAuthenticator = Optional[Callable[[], Dict[str, str]]]
+# binary response destination: anything with write(bytes), or a bytearray
+# that is extended in place
+TOutput = Union[IO[bytes], bytearray]
+# (connect, read) timeouts in seconds
+TTimeout = Tuple[float, float]
+
+
+def is_text(content_type: str) -> bool:
+    """True if a response with this Content-Type header should be decoded to str.
+    """
+    mime = content_type.split(";", 1)[0].strip().lower()
+    return (
+        not mime
+        or mime.startswith("text/")
+        or mime.endswith(("json", "xml", "javascript"))
+    )
 
 
 @attr.s(auto_attribs=True)
@@ -78,12 +108,19 @@ class Response:
 
     ok: bool
     value: TResponseValue
+    # HTTP status, or None if no response was received
+    status_code: Optional[int] = attr.ib(default=None, eq=False)
 
 
 class Transport(abc.ABC):
     """Transport base class.
+
+    Implementations report every request to `instrumentation` as an
+    instrumentation.RequestEvent.
     """
 
+    instrumentation: instr.Instrumentation
+
     @classmethod
     @abc.abstractmethod
     def configure(cls, settings: TransportSettings) -> "Transport":
@@ -100,6 +137,20 @@ class Transport(abc.ABC):
         body: Optional[bytes] = None,
         authenticator: TAuthenticator = None,
         headers: Optional[MutableMapping[str, str]] = None,
+        method_name: Optional[str] = None,
+        binary: Optional[bool] = False,
+        output: Optional[TOutput] = None,
+        timeout: Optional[TTimeout] = None,
     ) -> Response:
         """Send API request.
+
+        method_name is the generated SDK method making the call, if any.
+        A successful response value is bytes if binary is True, str if it
+        is False, and chosen with is_text() from the response Content-Type
+        if it is None. If output is given, a successful response body is
+        streamed into it as it arrives and the value is b"".
+
+        timeout overrides the settings' (connect, read) timeouts. Both are
+        cut short by the current deadline.deadline(), if any, and once it
+        passes the request is abandoned with error.DeadlineExceeded.
         """
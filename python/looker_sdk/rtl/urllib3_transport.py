@@ -0,0 +1,225 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Transport implementation directly on a urllib3 PoolManager.
+
+Skips what requests.Session.request does on every call (hooks, cookie
+jar and settings merging, proxy environment lookups, redirects), which
+is a noticeable share of small, frequent calls such as me() or user().
+"""
+
+import codecs
+import logging
+import time
+import urllib.parse
+from typing import Callable, Dict, MutableMapping, Optional, Tuple
+
+import urllib3
+
+from looker_sdk import error
+from looker_sdk.rtl import deadline
+from looker_sdk.rtl import instrumentation as instr
+from looker_sdk.rtl import tracing
+from looker_sdk.rtl import transport
+
+try:
+    import certifi  # type: ignore
+except ImportError:  # pragma: no cover
+    certifi = None  # type: ignore
+
+
+class Urllib3Transport(transport.Transport):
+    """Urllib3Transport implementation of Transport.
+    """
+
+    # bytes read from the socket at a time when streaming to an output
+    chunk_size = 64 * 1024
+    # like requests: no retries, no redirects
+    retries = urllib3.Retry(0, read=False, redirect=False)
+
+    def __init__(
+        self,
+        settings: transport.TransportSettings,
+        pool_manager: urllib3.PoolManager,
+        instrumentation: Optional[instr.Instrumentation] = None,
+    ):
+
+        if settings.spool_threshold is not None:
+            raise error.SDKError("spool_threshold needs the requests transport.")
+
+        # built once and copied per call
+        self.headers: Dict[str, str] = {"User-Agent": settings.agent_tag}
+        if settings.headers:
+            self.headers.update(settings.headers)
+        self.pool_manager = pool_manager
+        self.timeout = settings.timeouts
+
+        self.api_path: str = f"{settings.base_url}/api/{settings.api_version}"
+        self.logger = logging.getLogger(__name__)
+        self.instrumentation = instrumentation or instr.Instrumentation()
+
+    @classmethod
+    def configure(cls, settings: transport.TransportSettings) -> transport.Transport:
+        if settings.verify_ssl:
+            pool_manager = urllib3.PoolManager(
+                cert_reqs="CERT_REQUIRED",
+                ca_certs=certifi.where() if certifi else None,
+            )
+        else:
+            pool_manager = urllib3.PoolManager(cert_reqs="CERT_NONE")
+        return cls(settings, pool_manager)
+
+    def request(
+        self,
+        method: transport.HttpMethod,
+        path: str,
+        query_params: Optional[MutableMapping[str, str]] = None,
+        body: Optional[bytes] = None,
+        authenticator: Optional[Callable[[], Dict[str, str]]] = None,
+        headers: Optional[MutableMapping[str, str]] = None,
+        method_name: Optional[str] = None,
+        binary: Optional[bool] = False,
+        output: Optional[transport.TOutput] = None,
+        timeout: Optional[transport.TTimeout] = None,
+    ) -> transport.Response:
+
+        connect, read = deadline.clip(timeout or self.timeout)
+        url = f"{self.api_path}{path}"
+        if query_params:
+            url = f"{url}?{urllib.parse.urlencode(query_params)}"
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+        if authenticator:
+            request_headers.update(authenticator())
+        self.logger.info("%s(%s)", method.name, url)
+        event: Optional[instr.RequestEvent] = None
+        if self.instrumentation.enabled:
+            event = instr.RequestEvent(
+                method=method.name,
+                path=path,
+                url=url,
+                method_name=method_name,
+                request_bytes=len(body) if body else 0,
+            )
+            connections = self._connection_count(url)
+            start = time.perf_counter()
+        with tracing.span(
+            f"HTTP {method.name}", **{"http.method": method.name, "http.url": url}
+        ) as span:
+            tracing.inject(request_headers)
+            try:
+                resp = self.pool_manager.request(
+                    method.name,
+                    url,
+                    body=body,
+                    headers=request_headers,
+                    retries=self.retries,
+                    redirect=False,
+                    preload_content=False,
+                    timeout=urllib3.Timeout(connect=connect, read=read),
+                )
+                if event:
+                    event.ttfb = time.perf_counter() - start
+                span.set_attribute("http.status_code", resp.status)
+                try:
+                    value, size = self._read(resp, binary, output)
+                except BaseException:
+                    # the rest of the body is still on the connection, so
+                    # it must not be reused
+                    resp.close()
+                    raise
+                finally:
+                    resp.release_conn()
+            except (urllib3.exceptions.HTTPError, IOError) as exc:
+                deadline.check()
+                ret = transport.Response(False, str(exc))
+                if event:
+                    event.error = str(exc)
+            else:
+                ret = transport.Response(resp.status < 400, value, resp.status)
+                if event:
+                    event.status_code = resp.status
+                    event.response_bytes = size
+                    after = self._connection_count(url)
+                    if connections is not None and after is not None:
+                        event.connection_reused = after == connections
+        if event:
+            event.total = time.perf_counter() - start
+            event.ok = ret.ok
+            self.instrumentation.emit(event)
+
+        return ret
+
+    def _read(
+        self,
+        resp: "urllib3.BaseHTTPResponse",
+        binary: Optional[bool],
+        output: Optional[transport.TOutput],
+    ) -> Tuple[transport.TResponseValue, int]:
+        """Response value and body size in bytes.
+        """
+        content_type = resp.headers.get("Content-Type", "")
+        if resp.status < 400 and output is not None:
+            size = 0
+            for chunk in resp.stream(self.chunk_size):
+                deadline.check()
+                size += len(chunk)
+                if isinstance(output, bytearray):
+                    output.extend(chunk)
+                else:
+                    output.write(chunk)
+            return b"", size
+        if deadline.remaining() is None:
+            content = resp.read()
+        else:
+            chunks = []
+            for chunk in resp.stream(self.chunk_size):
+                deadline.check()
+                chunks.append(chunk)
+            content = b"".join(chunks)
+        if resp.status < 400:
+            if binary is None:
+                binary = not transport.is_text(content_type)
+            if binary:
+                return content, len(content)
+        return content.decode(_charset(content_type), "replace"), len(content)
+
+    def _connection_count(self, url: str) -> Optional[int]:
+        """Number of connections the urllib3 pool for url has opened so far.
+        """
+        try:
+            pool = self.pool_manager.connection_from_url(url)
+            return int(pool.num_connections)
+        except (AttributeError, urllib3.exceptions.HTTPError):
+            return None
+
+
+def _charset(content_type: str) -> str:
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            try:
+                return codecs.lookup(value.strip().strip('"')).name
+            except LookupError:
+                break
+    return "utf-8"
@@ -0,0 +1,550 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Reconcile users, groups, folders and user attributes with a desired state
+
+SyncEngine loads what exists with parallel paginated fetches, indexes it by
+natural key (user email, group and user attribute name, folder path) and
+plans the changes that make it match a DesiredState. Nothing the state
+already has is touched. Changes are applied in dependency order, each step
+on a bounded thread pool:
+
+1. user attributes and groups
+2. folders, parents before children
+3. users
+4. group memberships and user attribute values
+"""
+import collections
+import concurrent.futures as cf
+import logging
+import threading
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+    Union,
+)
+
+import attr
+
+from looker_sdk import error
+from looker_sdk.rtl import model
+from looker_sdk.rtl import paging
+from looker_sdk.sdk import methods
+from looker_sdk.sdk import models
+
+USER_FIELDS = "id,email,first_name,last_name,is_disabled,group_ids"
+
+T = TypeVar("T")
+R = TypeVar("R")
+TFields = Dict[str, Union[str, bool, None]]
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class UserSpec:
+    """A user, found by email.
+
+    Fields left as None are not managed. groups are group names and
+    attributes maps user attribute names to this user's values.
+    """
+
+    email: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    is_disabled: Optional[bool] = None
+    groups: Sequence[str] = ()
+    attributes: Dict[str, str] = attr.Factory(dict)
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class GroupSpec:
+    name: str
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class FolderSpec:
+    """A folder given by its path from an existing root folder,
+    e.g. "Shared/Sales/EMEA".
+    """
+
+    path: str
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class UserAttributeSpec:
+    name: str
+    label: str
+    type: str = "string"
+    default_value: Optional[str] = None
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class DesiredState:
+    users: Sequence[UserSpec] = ()
+    groups: Sequence[GroupSpec] = ()
+    folders: Sequence[FolderSpec] = ()
+    user_attributes: Sequence[UserAttributeSpec] = ()
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class Change:
+    """One planned change, and its outcome once applied.
+
+    kind is "user_attribute", "group", "folder", "user", "membership" or
+    "user_attribute_value". key is the email, name or path of what
+    changes, target the group or user attribute name for memberships and
+    values, and fields the values to create or update.
+    """
+
+    step: int
+    kind: str
+    action: str
+    key: str
+    target: Optional[str] = None
+    fields: TFields = attr.Factory(dict)
+    ok: Optional[bool] = None
+    error: Optional[str] = None
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class CurrentState:
+    """What the instance has, indexed by natural key.
+    """
+
+    users: Dict[str, models.User] = attr.Factory(dict)
+    groups: Dict[str, models.Group] = attr.Factory(dict)
+    folders: Dict[str, models.Space] = attr.Factory(dict)
+    user_attributes: Dict[str, models.UserAttribute] = attr.Factory(dict)
+    # user id -> {user attribute name: value}, for the users and
+    # attributes of the desired state
+    values: Dict[int, Dict[str, str]] = attr.Factory(dict)
+
+
+class SyncEngine:
+    """Plans and applies the changes that bring one instance to a DesiredState.
+
+    With prune=True, managed groups (those in the desired state) also lose
+    the members the desired state does not put in them. Users, groups,
+    folders and user attributes are never deleted.
+    """
+
+    def __init__(
+        self,
+        sdk: methods.LookerSDK,
+        concurrency: int = 8,
+        per_page: int = 500,
+        prune: bool = False,
+    ):
+        self.sdk = sdk
+        self.concurrency = concurrency
+        self.per_page = per_page
+        self.prune = prune
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def sync(self, desired: DesiredState, dry_run: bool = False) -> List[Change]:
+        """Plan and, unless dry_run, apply the changes. Returns them.
+        """
+        current = self.load(desired)
+        changes = self.plan(desired, current)
+        if not dry_run:
+            self.apply(changes, current)
+        return changes
+
+    def load(self, desired: DesiredState) -> CurrentState:
+        """Fetch the current state in parallel.
+        """
+
+        def users(page: int, per_page: int) -> Sequence[models.User]:
+            return self.sdk.all_users(fields=USER_FIELDS, page=page, per_page=per_page)
+
+        def groups(page: int, per_page: int) -> Sequence[models.Group]:
+            return self.sdk.all_groups(fields="id,name", page=page, per_page=per_page)
+
+        current = CurrentState()
+        with cf.ThreadPoolExecutor(4) as pool:
+            all_users = pool.submit(lambda: self._fetch_all(users))
+            all_groups = pool.submit(lambda: self._fetch_all(groups))
+            folders = pool.submit(self.sdk.all_spaces, fields="id,name,parent_id")
+            attributes = pool.submit(
+                self.sdk.all_user_attributes, fields="id,name,label,type,default_value",
+            )
+        current.users = {u.email.lower(): u for u in all_users.result() if u.email}
+        current.groups = {g.name: g for g in all_groups.result() if g.name}
+        current.folders = _folder_paths(folders.result())
+        current.user_attributes = {a.name: a for a in attributes.result() if a.name}
+
+        names = {a.name for a in desired.user_attributes}
+        names.update(name for spec in desired.users for name in spec.attributes)
+        ids = [
+            attribute.id
+            for attribute in map(current.user_attributes.get, sorted(names))
+            if attribute is not None and attribute.id is not None
+        ]
+        user_ids = [
+            user.id
+            for user in (
+                current.users.get(spec.email.lower())
+                for spec in desired.users
+                if spec.attributes
+            )
+            if user is not None and user.id is not None
+        ]
+        if ids and user_ids:
+            user_attribute_ids = models.DelimSequence(ids)
+            current.values = dict(
+                zip(
+                    user_ids,
+                    self._map(
+                        lambda user_id: self._user_values(user_id, user_attribute_ids),
+                        user_ids,
+                    ),
+                )
+            )
+        return current
+
+    def _fetch_all(self, fetch: paging.TFetch[T]) -> List[T]:
+        return paging.fetch_all(fetch, self.per_page, self.concurrency)
+
+    def _user_values(
+        self, user_id: int, user_attribute_ids: models.DelimSequence[int]
+    ) -> Dict[str, str]:
+        values = self.sdk.user_attribute_user_values(
+            user_id, fields="name,value", user_attribute_ids=user_attribute_ids
+        )
+        return {
+            value.name: value.value
+            for value in values
+            if value.name and value.value is not None
+        }
+
+    def plan(self, desired: DesiredState, current: CurrentState) -> List[Change]:
+        """Changes that make current match desired, in the order to apply them.
+        """
+        changes: List[Change] = []
+        for spec in desired.user_attributes:
+            fields: TFields = {
+                "label": spec.label,
+                "type": spec.type,
+                "default_value": spec.default_value,
+            }
+            existing = current.user_attributes.get(spec.name)
+            if existing is None or _differs(existing, fields):
+                changes.append(
+                    Change(
+                        step=0,
+                        kind="user_attribute",
+                        action="create" if existing is None else "update",
+                        key=spec.name,
+                        fields=fields,
+                    )
+                )
+        changes.extend(
+            Change(step=0, kind="group", action="create", key=group.name)
+            for group in desired.groups
+            if group.name not in current.groups
+        )
+        folders = self._plan_folders(desired, current)
+        changes.extend(folders)
+        user_step = max((change.step for change in folders), default=0) + 1
+        changes.extend(self._plan_users(desired, current, user_step))
+        changes.sort(key=_step)
+        return changes
+
+    def _plan_folders(
+        self, desired: DesiredState, current: CurrentState
+    ) -> List[Change]:
+        paths: Set[str] = set()
+        for folder in desired.folders:
+            parts = folder.path.strip("/").split("/")
+            # missing ancestors are created too
+            for depth in range(2, len(parts) + 1):
+                paths.add("/".join(parts[:depth]))
+        return [
+            Change(step=path.count("/"), kind="folder", action="create", key=path)
+            for path in sorted(paths)
+            if path not in current.folders
+        ]
+
+    def _plan_users(
+        self, desired: DesiredState, current: CurrentState, step: int
+    ) -> List[Change]:
+        changes: List[Change] = []
+        group_names: Dict[int, str] = {
+            group.id: name
+            for name, group in current.groups.items()
+            if group.id is not None
+        }
+        members: Dict[str, Set[str]] = collections.defaultdict(set)
+        for spec in desired.users:
+            user = current.users.get(spec.email.lower())
+            fields = _fields(
+                first_name=spec.first_name,
+                last_name=spec.last_name,
+                is_disabled=spec.is_disabled,
+            )
+            if user is None or _differs(user, fields):
+                changes.append(
+                    Change(
+                        step=step,
+                        kind="user",
+                        action="create" if user is None else "update",
+                        key=spec.email,
+                        fields=fields,
+                    )
+                )
+            groups: Set[str] = set()
+            values: Dict[str, str] = {}
+            if user is not None:
+                groups = _group_names(user, group_names)
+                if user.id is not None:
+                    values = current.values.get(user.id, {})
+            for name in spec.groups:
+                members[name].add(spec.email.lower())
+                if name not in groups:
+                    changes.append(
+                        Change(
+                            step=step + 1,
+                            kind="membership",
+                            action="add",
+                            key=spec.email,
+                            target=name,
+                        )
+                    )
+            changes.extend(
+                Change(
+                    step=step + 1,
+                    kind="user_attribute_value",
+                    action="set",
+                    key=spec.email,
+                    target=name,
+                    fields={"value": value},
+                )
+                for name, value in spec.attributes.items()
+                if values.get(name) != value
+            )
+        if self.prune:
+            managed = {group.name for group in desired.groups}
+            for email, user in current.users.items():
+                for name in _group_names(user, group_names):
+                    if name in managed and email not in members[name]:
+                        changes.append(
+                            Change(
+                                step=step + 1,
+                                kind="membership",
+                                action="remove",
+                                key=user.email or email,
+                                target=name,
+                            )
+                        )
+        return changes
+
+    def apply(self, changes: Iterable[Change], current: CurrentState) -> None:
+        """Make the changes, a step at a time, recording each one's outcome.
+
+        current gains what is created, so later steps can refer to it. A
+        change that fails does not stop the others.
+        """
+        steps: Dict[int, List[Change]] = collections.defaultdict(list)
+        for change in changes:
+            steps[change.step].append(change)
+        for step in sorted(steps):
+            self._map(lambda change: self._apply(change, current), steps[step])
+
+    def _map(self, call: Callable[[T], R], items: Sequence[T]) -> List[R]:
+        if len(items) < 2:
+            return [call(item) for item in items]
+        with cf.ThreadPoolExecutor(min(self.concurrency, len(items))) as pool:
+            return list(pool.map(call, items))
+
+    def _apply(self, change: Change, current: CurrentState) -> None:
+        apply: Callable[[Change, CurrentState], None] = getattr(
+            self, f"_{change.action}_{change.kind}"
+        )
+        try:
+            apply(change, current)
+        except error.SDKError as exc:
+            change.ok = False
+            change.error = str(exc)
+            self.logger.warning(
+                "%s %s %s failed: %s", change.action, change.kind, change.key, exc
+            )
+        else:
+            change.ok = True
+
+    def _create_user_attribute(self, change: Change, current: CurrentState) -> None:
+        created = self.sdk.create_user_attribute(body=_write_user_attribute(change))
+        with self._lock:
+            current.user_attributes[change.key] = created
+
+    def _update_user_attribute(self, change: Change, current: CurrentState) -> None:
+        attribute = _require(current.user_attributes, change.key, "user attribute")
+        self.sdk.update_user_attribute(
+            _id(attribute.id, "user attribute", change.key),
+            body=_write_user_attribute(change),
+        )
+
+    def _create_group(self, change: Change, current: CurrentState) -> None:
+        created = self.sdk.create_group(body=models.WriteGroup(name=change.key))
+        with self._lock:
+            current.groups[change.key] = created
+
+    def _create_folder(self, change: Change, current: CurrentState) -> None:
+        parent_path, _, name = change.key.rpartition("/")
+        parent = _require(current.folders, parent_path, "folder")
+        created = self.sdk.create_space(
+            body=models.CreateSpace(
+                name=name, parent_id=_id(parent.id, "folder", parent_path)
+            )
+        )
+        with self._lock:
+            current.folders[change.key] = created
+
+    def _create_user(self, change: Change, current: CurrentState) -> None:
+        created = self.sdk.create_user(body=_write_user(change))
+        user_id = _id(created.id, "user", change.key)
+        try:
+            self.sdk.create_user_credentials_email(
+                user_id, body=models.WriteCredentialsEmail(email=change.key)
+            )
+        except error.SDKError:
+            # without an email the next sync could not find this user and
+            # would create it again
+            try:
+                self.sdk.delete_user(user_id)
+            except error.SDKError as exc:
+                self.logger.warning("deleting user %s failed: %s", user_id, exc)
+            raise
+        with self._lock:
+            current.users[change.key.lower()] = created
+
+    def _update_user(self, change: Change, current: CurrentState) -> None:
+        user = _require(current.users, change.key.lower(), "user")
+        self.sdk.update_user(_id(user.id, "user", change.key), body=_write_user(change))
+
+    def _add_membership(self, change: Change, current: CurrentState) -> None:
+        user = _require(current.users, change.key.lower(), "user")
+        group = _require(current.groups, change.target, "group")
+        self.sdk.add_group_user(
+            _id(group.id, "group", group.name),
+            body=models.GroupIdForGroupUserInclusion(
+                user_id=_id(user.id, "user", change.key)
+            ),
+        )
+
+    def _remove_membership(self, change: Change, current: CurrentState) -> None:
+        user = _require(current.users, change.key.lower(), "user")
+        group = _require(current.groups, change.target, "group")
+        self.sdk.delete_group_user(
+            _id(group.id, "group", group.name), _id(user.id, "user", change.key)
+        )
+
+    def _set_user_attribute_value(self, change: Change, current: CurrentState) -> None:
+        user = _require(current.users, change.key.lower(), "user")
+        attribute = _require(current.user_attributes, change.target, "user attribute")
+        self.sdk.set_user_attribute_user_value(
+            _id(user.id, "user", change.key),
+            _id(attribute.id, "user attribute", attribute.name),
+            body=models.WriteUserAttributeWithValue(value=_text(change, "value")),
+        )
+
+
+def _step(change: Change) -> int:
+    return change.step
+
+
+def _require(index: Dict[str, T], key: Optional[str], kind: str) -> T:
+    if key is None or key not in index:
+        raise error.SDKError(f"{kind} {key} does not exist")
+    return index[key]
+
+
+def _id(value: Optional[T], kind: str, key: Optional[str]) -> T:
+    if value is None:
+        raise error.SDKError(f"{kind} {key} has no id")
+    return value
+
+
+def _fields(**values: Union[str, bool, None]) -> TFields:
+    return {name: value for name, value in values.items() if value is not None}
+
+
+def _text(change: Change, name: str) -> Optional[str]:
+    value = change.fields.get(name)
+    return value if isinstance(value, str) else None
+
+
+def _flag(change: Change, name: str) -> Optional[bool]:
+    value = change.fields.get(name)
+    return value if isinstance(value, bool) else None
+
+
+def _write_user(change: Change) -> models.WriteUser:
+    return models.WriteUser(
+        first_name=_text(change, "first_name"),
+        last_name=_text(change, "last_name"),
+        is_disabled=_flag(change, "is_disabled"),
+    )
+
+
+def _write_user_attribute(change: Change) -> models.WriteUserAttribute:
+    return models.WriteUserAttribute(
+        name=change.key,
+        label=_text(change, "label") or change.key,
+        type=_text(change, "type") or "string",
+        default_value=_text(change, "default_value"),
+    )
+
+
+def _differs(existing: model.Model, fields: TFields) -> bool:
+    for name, value in fields.items():
+        current: object = getattr(existing, name)
+        if current != value:
+            return True
+    return False
+
+
+def _group_names(user: models.User, group_names: Dict[int, str]) -> Set[str]:
+    return {group_names[i] for i in user.group_ids or () if i in group_names}
+
+
+def _folder_paths(folders: Sequence[models.Space]) -> Dict[str, models.Space]:
+    """{path: folder}, paths being names joined by "/" from a root folder
+    """
+    by_id = {folder.id: folder for folder in folders if folder.id is not None}
+    paths: Dict[str, str] = {}
+
+    def path(folder: models.Space) -> str:
+        name = folder.name or ""
+        if folder.id is None:
+            return name
+        if folder.id not in paths:
+            parent = by_id.get(folder.parent_id) if folder.parent_id else None
+            paths[folder.id] = f"{path(parent)}/{name}" if parent else name
+        return paths[folder.id]
+
+    return {path(folder): folder for folder in folders}
@@ -7,19 +7,25 @@ from setuptools import setup, find_packages  # noqa: H301
 NAME = "looker_sdk"
 VERSION = "0.1.3b1"
 REQUIRES = ["requests >= 2.22", "attrs", "cattrs"]
+EXTRAS = {
+    "tracing": ["opentelemetry-api"],
+    "speedups": ["ciso8601"],
+    "http2": ["httpx[http2] >= 0.18"],
+}
 
 
 setup(
     author="Looker Data Sciences, Inc.",
     author_email="support@looker.com",
     description="Looker API 3.1",
+    extras_require=EXTRAS,
     install_requires=REQUIRES,
     license="MIT",
     long_description=open("README.rst").read(),
     keywords=["looker_sdk", "Looker API 3.1"],
     name=NAME,
     package_data={"looker_sdk": ["py.typed", "looker_sdk/looker-sample.ini"]},
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     url="https://pypi.python.org/pypi/looker_sdk",
     version=VERSION,
 )
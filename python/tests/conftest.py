@@ -1,14 +1,32 @@
+import itertools
 import os.path
 import pytest  # type: ignore
 import sys
+import threading
 import yaml
-from typing import cast, Dict, List, Union
+from typing import (
+    cast,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from looker_sdk import client  # noqa: E402
+from looker_sdk import error  # noqa: E402
 from looker_sdk import models as ml  # noqa: E402
+from looker_sdk.rtl import api_methods  # noqa: E402
 from looker_sdk.sdk import methods as mtds  # noqa: E402
+from looker_sdk.sdk import models  # noqa: E402
+
+T = TypeVar("T")
 
 
 @pytest.fixture(scope="session")  # type: ignore
@@ -82,3 +100,493 @@ def create_test_users(
 @pytest.fixture(scope="session")  # type: ignore
 def looker_client():
     return client.setup("../looker.ini")
+
+
+class FakeSDK:
+    """A Looker instance held in dicts of generated models, standing in for
+    methods.LookerSDK in unit tests.
+
+    Every call that changes the instance, searches it or reads one look
+    or dashboard is recorded in calls as (method name, *arguments), and
+    raises SDKError if its name or its arguments are in fail. Searches
+    record (name, sorts, page). Tests seed users, groups, spaces, looks,
+    dashboards and user_attributes; user_attribute_values maps user ids
+    to {user attribute name: value} and queries holds the queries
+    created. Looks with a deleted_at are only found by deleted searches.
+    Render tasks finish with render_status once render_task() has polled
+    them render_polls times, and render_task_results() raises
+    download_error, if set, after writing.
+    """
+
+    def __init__(self) -> None:
+        self.ids = itertools.count(100)
+        self.calls: List[Tuple[object, ...]] = []
+        self.fail: Set[object] = set()
+        self.lock = threading.Lock()
+        self.users: Dict[int, models.User] = {}
+        self.groups: Dict[int, models.Group] = {}
+        self.spaces: Dict[str, models.Space] = {}
+        self.looks: Dict[int, models.Look] = {}
+        self.dashboards: Dict[str, models.Dashboard] = {}
+        self.queries: Dict[int, models.Query] = {}
+        self.user_attributes: Dict[int, models.UserAttribute] = {}
+        self.user_attribute_values: Dict[int, Dict[str, str]] = {}
+        self.render_tasks: Dict[str, models.RenderTask] = {}
+        self.render_polls = 2
+        self.render_status = "success"
+        self.download_error: Optional[Exception] = None
+        self._polls: Dict[str, int] = {}
+
+    def _call(self, name: str, *args: object) -> None:
+        with self.lock:
+            self.calls.append((name,) + args)
+        if name in self.fail or args in self.fail:
+            raise error.SDKError(f"{name} failed")
+
+    def _id(self) -> int:
+        with self.lock:
+            return next(self.ids)
+
+    @staticmethod
+    def _key(value: Optional[T]) -> T:
+        assert value is not None
+        return value
+
+    @staticmethod
+    def _page(
+        rows: Iterable[T], page: Optional[int], per_page: Optional[int]
+    ) -> List[T]:
+        rows = list(rows)
+        if page is None or per_page is None:
+            return rows
+        return rows[(page - 1) * per_page : page * per_page]
+
+    # users, groups, spaces and user attributes
+
+    def all_users(
+        self,
+        fields: Optional[str] = None,
+        page: Optional[int] = None,
+        per_page: Optional[int] = None,
+        sorts: Optional[str] = None,
+        ids: Optional[models.DelimSequence[int]] = None,
+    ) -> Sequence[models.User]:
+        return self._page(self.users.values(), page, per_page)
+
+    def all_groups(
+        self,
+        fields: Optional[str] = None,
+        page: Optional[int] = None,
+        per_page: Optional[int] = None,
+        sorts: Optional[str] = None,
+        ids: Optional[models.DelimSequence[int]] = None,
+        content_metadata_id: Optional[int] = None,
+        can_add_to_content_metadata: Optional[bool] = None,
+    ) -> Sequence[models.Group]:
+        return self._page(self.groups.values(), page, per_page)
+
+    def all_spaces(self, fields: Optional[str] = None) -> Sequence[models.Space]:
+        return list(self.spaces.values())
+
+    def all_user_attributes(
+        self, fields: Optional[str] = None, sorts: Optional[str] = None
+    ) -> Sequence[models.UserAttribute]:
+        return list(self.user_attributes.values())
+
+    def user_attribute_user_values(
+        self,
+        user_id: int,
+        fields: Optional[str] = None,
+        user_attribute_ids: Optional[models.DelimSequence[int]] = None,
+        all_values: Optional[bool] = None,
+        include_unset: Optional[bool] = None,
+    ) -> Sequence[models.UserAttributeWithValue]:
+        return [
+            models.UserAttributeWithValue(name=name, value=value)
+            for name, value in self.user_attribute_values.get(user_id, {}).items()
+        ]
+
+    def create_user_attribute(
+        self, body: models.WriteUserAttribute, fields: Optional[str] = None
+    ) -> models.UserAttribute:
+        self._call("create_user_attribute", body.name)
+        created = models.UserAttribute(
+            id=self._id(),
+            name=body.name,
+            label=body.label,
+            type=body.type,
+            default_value=body.default_value,
+        )
+        self.user_attributes[self._key(created.id)] = created
+        return created
+
+    def update_user_attribute(
+        self,
+        user_attribute_id: int,
+        body: models.WriteUserAttribute,
+        fields: Optional[str] = None,
+    ) -> models.UserAttribute:
+        self._call("update_user_attribute", user_attribute_id)
+        attribute = self.user_attributes[user_attribute_id]
+        attribute.label = body.label
+        attribute.type = body.type
+        attribute.default_value = body.default_value
+        return attribute
+
+    def set_user_attribute_user_value(
+        self,
+        user_id: int,
+        user_attribute_id: int,
+        body: models.WriteUserAttributeWithValue,
+    ) -> models.UserAttributeWithValue:
+        self._call("set_user_attribute_user_value", user_id, user_attribute_id)
+        name = self._key(self.user_attributes[user_attribute_id].name)
+        self.user_attribute_values.setdefault(user_id, {})[name] = self._key(body.value)
+        return models.UserAttributeWithValue(name=name, value=body.value)
+
+    def create_group(
+        self, body: models.WriteGroup, fields: Optional[str] = None
+    ) -> models.Group:
+        self._call("create_group", body.name)
+        created = models.Group(id=self._id(), name=body.name)
+        self.groups[self._key(created.id)] = created
+        return created
+
+    def add_group_user(
+        self, group_id: int, body: models.GroupIdForGroupUserInclusion
+    ) -> models.User:
+        self._call("add_group_user", group_id, body.user_id)
+        user = self.users[self._key(body.user_id)]
+        user.group_ids = list(user.group_ids or []) + [group_id]
+        return user
+
+    def delete_group_user(self, group_id: int, user_id: int) -> None:
+        self._call("delete_group_user", group_id, user_id)
+        user = self.users[user_id]
+        user.group_ids = [i for i in user.group_ids or [] if i != group_id]
+
+    def create_space(self, body: models.CreateSpace) -> models.Space:
+        self._call("create_space", body.name, body.parent_id)
+        created = models.Space(
+            id=str(self._id()), name=body.name, parent_id=body.parent_id
+        )
+        self.spaces[self._key(created.id)] = created
+        return created
+
+    def create_user(
+        self, body: Optional[models.WriteUser] = None, fields: Optional[str] = None
+    ) -> models.User:
+        body = body or models.WriteUser()
+        self._call("create_user", body.first_name)
+        created = models.User(
+            id=self._id(),
+            first_name=body.first_name,
+            last_name=body.last_name,
+            is_disabled=body.is_disabled,
+        )
+        self.users[self._key(created.id)] = created
+        return created
+
+    def update_user(
+        self, user_id: int, body: models.WriteUser, fields: Optional[str] = None
+    ) -> models.User:
+        self._call("update_user", user_id)
+        user = self.users[user_id]
+        for name in ("first_name", "last_name", "is_disabled"):
+            value: object = getattr(body, name)
+            if value is not None:
+                setattr(user, name, value)
+        return user
+
+    def delete_user(self, user_id: int) -> str:
+        self._call("delete_user", user_id)
+        del self.users[user_id]
+        return ""
+
+    def create_user_credentials_email(
+        self,
+        user_id: int,
+        body: models.WriteCredentialsEmail,
+        fields: Optional[str] = None,
+    ) -> models.CredentialsEmail:
+        self._call("create_user_credentials_email", user_id, body.email)
+        self.users[user_id].email = body.email
+        return models.CredentialsEmail(email=body.email)
+
+    # looks and dashboards
+
+    @staticmethod
+    def _sort(rows: Iterable[T], sorts: Optional[str]) -> List[T]:
+        """rows ordered by a single "field" or "field desc" sort
+        """
+        rows = list(rows)
+        if sorts:
+            field, _, order = sorts.partition(" ")
+            rows.sort(key=lambda row: getattr(row, field), reverse=order == "desc")
+        return rows
+
+    def search_looks(
+        self,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        content_favorite_id: Optional[int] = None,
+        space_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        view_count: Optional[str] = None,
+        deleted: Optional[bool] = None,
+        query_id: Optional[int] = None,
+        fields: Optional[str] = None,
+        page: Optional[int] = None,
+        per_page: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        sorts: Optional[str] = None,
+        filter_or: Optional[bool] = None,
+    ) -> Sequence[models.Look]:
+        self._call("search_looks", sorts, page)
+        looks = (
+            look
+            for look in self.looks.values()
+            if (look.deleted_at is not None) == bool(deleted)
+            and (title is None or look.title == title)
+            and (space_id is None or look.space_id == space_id)
+        )
+        return self._page(self._sort(looks, sorts), page, per_page)
+
+    def search_dashboards(
+        self,
+        id: Optional[int] = None,
+        slug: Optional[str] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        content_favorite_id: Optional[int] = None,
+        space_id: Optional[str] = None,
+        deleted: Optional[str] = None,
+        user_id: Optional[str] = None,
+        view_count: Optional[str] = None,
+        fields: Optional[str] = None,
+        page: Optional[int] = None,
+        per_page: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        sorts: Optional[str] = None,
+        filter_or: Optional[bool] = None,
+    ) -> Sequence[models.Dashboard]:
+        self._call("search_dashboards", sorts, page)
+        dashboards = (
+            dashboard
+            for dashboard in self.dashboards.values()
+            if (title is None or dashboard.title == title)
+            and (space_id is None or dashboard.space_id == space_id)
+        )
+        return self._page(self._sort(dashboards, sorts), page, per_page)
+
+    def look(self, look_id: int, fields: Optional[str] = None) -> models.LookWithQuery:
+        self._call("look", look_id)
+        look = self.looks[look_id]
+        return models.LookWithQuery(
+            id=look.id,
+            title=look.title,
+            description=look.description,
+            space_id=look.space_id,
+            user_id=look.user_id,
+            query_id=look.query_id,
+            query=look.query,
+            updated_at=look.updated_at,
+            deleted_at=look.deleted_at,
+        )
+
+    def dashboard(
+        self, dashboard_id: str, fields: Optional[str] = None
+    ) -> models.Dashboard:
+        self._call("dashboard", dashboard_id)
+        return self.dashboards[dashboard_id]
+
+    def create_query(
+        self, body: models.WriteQuery, fields: Optional[str] = None
+    ) -> models.Query:
+        self._call("create_query", body.model, body.view)
+        created = models.Query(
+            id=self._id(),
+            model=body.model,
+            view=body.view,
+            fields=body.fields,
+            client_id=body.client_id,
+        )
+        self.queries[self._key(created.id)] = created
+        return created
+
+    def create_look(
+        self,
+        body: Optional[models.WriteLookWithQuery] = None,
+        fields: Optional[str] = None,
+    ) -> models.LookWithQuery:
+        body = body or models.WriteLookWithQuery()
+        self._call("create_look", body.title)
+        look_id = self._id()
+        self.looks[look_id] = models.Look(
+            id=look_id,
+            title=body.title,
+            description=body.description,
+            space_id=body.space_id,
+            query_id=body.query_id,
+            query=self.queries.get(body.query_id) if body.query_id else None,
+        )
+        return self.look(look_id)
+
+    def create_dashboard(
+        self, body: Optional[models.WriteDashboard] = None
+    ) -> models.Dashboard:
+        body = body or models.WriteDashboard()
+        self._call("create_dashboard", body.title)
+        created = models.Dashboard(
+            id=str(self._id()),
+            title=body.title,
+            description=body.description,
+            space_id=body.space_id,
+            dashboard_elements=[],
+            dashboard_filters=[],
+        )
+        self.dashboards[self._key(created.id)] = created
+        return created
+
+    def create_dashboard_filter(
+        self, body: models.WriteCreateDashboardFilter, fields: Optional[str] = None
+    ) -> models.DashboardFilter:
+        self._call("create_dashboard_filter", body.dashboard_id, body.name)
+        created = models.DashboardFilter(
+            id=str(self._id()),
+            dashboard_id=body.dashboard_id,
+            name=body.name,
+            title=body.title,
+            type=body.type,
+            default_value=body.default_value,
+        )
+        dashboard = self.dashboards[body.dashboard_id]
+        dashboard.dashboard_filters = [*(dashboard.dashboard_filters or ()), created]
+        return created
+
+    def create_dashboard_element(
+        self,
+        body: Optional[models.WriteDashboardElement] = None,
+        fields: Optional[str] = None,
+    ) -> models.DashboardElement:
+        body = body or models.WriteDashboardElement()
+        self._call("create_dashboard_element", body.dashboard_id, body.title)
+        created = models.DashboardElement(
+            id=str(self._id()),
+            dashboard_id=body.dashboard_id,
+            title=body.title,
+            type=body.type,
+            look_id=body.look_id,
+            query_id=body.query_id,
+            query=self.queries.get(body.query_id) if body.query_id else None,
+        )
+        dashboard = self.dashboards[self._key(body.dashboard_id)]
+        dashboard.dashboard_elements = [*(dashboard.dashboard_elements or ()), created]
+        return created
+
+    def delete_dashboard(self, dashboard_id: str) -> str:
+        self._call("delete_dashboard", dashboard_id)
+        del self.dashboards[dashboard_id]
+        return ""
+
+    # render tasks
+
+    def _render_task(
+        self, name: str, task: models.RenderTask, *args: object
+    ) -> models.RenderTask:
+        self._call(name, *args)
+        task_id = task.id = str(self._id())
+        task.status = "pending"
+        with self.lock:
+            self.render_tasks[task_id] = task
+            self._polls[task_id] = 0
+        return task
+
+    def create_dashboard_render_task(
+        self,
+        dashboard_id: int,
+        result_format: str,
+        body: models.WriteCreateDashboardRenderTask,
+        width: int,
+        height: int,
+        fields: Optional[str] = None,
+        pdf_paper_size: Optional[str] = None,
+        pdf_landscape: Optional[bool] = None,
+    ) -> models.RenderTask:
+        return self._render_task(
+            "create_dashboard_render_task",
+            models.RenderTask(
+                dashboard_id=dashboard_id,
+                result_format=result_format,
+                width=width,
+                height=height,
+            ),
+            dashboard_id,
+            pdf_paper_size,
+            pdf_landscape,
+        )
+
+    def create_look_render_task(
+        self,
+        look_id: int,
+        result_format: str,
+        width: int,
+        height: int,
+        fields: Optional[str] = None,
+    ) -> models.RenderTask:
+        return self._render_task(
+            "create_look_render_task",
+            models.RenderTask(
+                look_id=look_id, result_format=result_format, width=width, height=height
+            ),
+            look_id,
+        )
+
+    def create_query_render_task(
+        self,
+        query_id: int,
+        result_format: str,
+        width: int,
+        height: int,
+        fields: Optional[str] = None,
+    ) -> models.RenderTask:
+        return self._render_task(
+            "create_query_render_task",
+            models.RenderTask(
+                query_id=query_id,
+                result_format=result_format,
+                width=width,
+                height=height,
+            ),
+            query_id,
+        )
+
+    def render_task(
+        self, render_task_id: str, fields: Optional[str] = None
+    ) -> models.RenderTask:
+        task = self.render_tasks[render_task_id]
+        with self.lock:
+            self._polls[render_task_id] += 1
+            if self._polls[render_task_id] >= self.render_polls:
+                task.status = self.render_status
+                if task.status == "failure":
+                    task.status_detail = "render failed"
+        return models.RenderTask(
+            id=task.id, status=task.status, status_detail=task.status_detail
+        )
+
+    def render_task_results(
+        self, render_task_id: str, output: Optional[api_methods.TOutput] = None
+    ) -> bytes:
+        data = b"%PDF-" + render_task_id.encode() * 1000
+        if output is None:
+            return data
+        if isinstance(output, bytearray):
+            output.extend(data)
+        else:
+            output.write(data)
+        if self.download_error is not None:
+            raise self.download_error
+        return b""
@@ -32,6 +32,7 @@ from looker_sdk.rtl import api_settings
 from looker_sdk.rtl import api_methods
 from looker_sdk.rtl import requests_transport
 from looker_sdk.rtl import serialize
+from looker_sdk.rtl import spool
 from looker_sdk.rtl import transport
 from looker_sdk.sdk import models
 
@@ -154,7 +155,142 @@ def test_return(
     assert actual == expected
 
 
+def test_return_spooled(api):
+    body = spool.read([b'{"looker_release_version": ', b'"6.18"}'], threshold=8)
+    actual = api._return(transport.Response(ok=True, value=body), models.ApiVersion)
+    assert actual == models.ApiVersion(looker_release_version="6.18")
+    assert body.mmap.closed
+
+    body = spool.read([b"a,b\n", b"1,2\n"], threshold=2)
+    assert api._return(transport.Response(ok=True, value=body), str) is body
+
+
 def test_return_raises_an_SDKError_for_bad_responses(api):
     with pytest.raises(error.SDKError) as exc:
         api._return(transport.Response(ok=False, value="some error message"), str)
     assert "some error message" in str(exc.value)
+
+
+def test_query_encoder():
+    encode = api_methods.QueryEncoder(
+        limit=str,
+        ts=api_methods.encode_datetime,
+        apply_formatting=api_methods.encode_bool,
+        ids=api_methods.encode_json,
+        fields=api_methods.encode_json,
+        name=str,
+    )
+    actual = encode(
+        10,
+        datetime.datetime(2019, 8, 14, 8, 4, 2),
+        False,
+        [1, 2, 3],
+        models.DelimSequence(["a", "b"]),
+        None,
+    )
+    assert isinstance(actual, api_methods.EncodedQuery)
+    assert actual == {
+        "limit": "10",
+        "ts": "2019-08-14T08:04Z",
+        "apply_formatting": "false",
+        "ids": "[1, 2, 3]",
+        "fields": "a,b",
+    }
+    assert encode(None, None, None, None, None, None) is None
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "query_params, expected",
+    [
+        (
+            api_methods.QueryEncoder(force=api_methods.encode_bool)(True),
+            {"force": "true"},
+        ),
+        ({"force": True}, {"force": "true"}),
+        (None, None),
+    ],
+)
+def test_delete_sends_query_params(api, mocker, query_params, expected):
+    request = mocker.patch.object(
+        api.transport, "request", return_value=transport.Response(ok=True, value="")
+    )
+    api.delete("/users/1", query_params=query_params)
+    assert request.call_args[1]["query_params"] == expected
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "structure, binary", [(bytes, True), (api_methods.TTextOrBinary, None)]
+)
+def test_binary_responses(api, mocker, structure, binary):
+    request = mocker.patch.object(
+        api.transport,
+        "request",
+        return_value=transport.Response(ok=True, value=b"\x89PNG"),
+    )
+    output = bytearray()
+    assert api.get("/render_tasks/1/results", structure, output=output) == b"\x89PNG"
+    assert request.call_args[1]["binary"] is binary
+    assert request.call_args[1]["output"] is output
+
+
+def test_as_user(api, mocker):
+    authenticate = mocker.patch.object(
+        auth_session.SudoTokenPool,
+        "authenticate",
+        return_value={"Authorization": "token UserAccessToken"},
+    )
+    request = mocker.patch.object(
+        api.transport, "request", return_value=transport.Response(ok=True, value="")
+    )
+    sdk = api.as_user(7)
+    assert isinstance(sdk, api_methods.APIMethods)
+    assert sdk.transport is api.transport
+    assert sdk.auth.is_sudo == 7
+    assert not api.auth.is_sudo
+
+    sdk.delete("/users/1")
+    authenticator = request.call_args[1]["authenticator"]
+    assert authenticator() == {"Authorization": "token UserAccessToken"}
+    authenticate.assert_called_once_with(7)
+
+
+def test_with_timeout(api, mocker):
+    request = mocker.patch.object(
+        api.transport, "request", return_value=transport.Response(ok=True, value="")
+    )
+    api.delete("/users/1")
+    assert "timeout" not in request.call_args[1]
+
+    sdk = api.with_timeout(5.0)
+    sdk.delete("/users/1")
+    assert request.call_args[1]["timeout"] == (10.0, 5.0)
+    assert api.with_timeout(5.0, connect_timeout=1.0).timeout == (1.0, 5.0)
+    assert api.timeout is None
+
+
+def test_deadline(api, mocker):
+    mocker.patch.object(api.auth, "authenticate", return_value={})
+    with api.deadline(0):
+        with pytest.raises(error.DeadlineExceeded):
+            api.get("/users/1", str)
+
+
+def test_patch_sends_changes(api, mocker):
+    request = mocker.patch.object(
+        api.transport, "request", return_value=transport.Response(ok=True, value="")
+    )
+    user = serialize.deserialize(
+        json.dumps({"id": 1, "first_name": "Ada", "group_ids": [1, 2]}), models.User
+    )
+    user.first_name = "Grace"
+    api.patch("/users/1", None, body=user)
+    assert json.loads(request.call_args[1]["body"]) == {"first_name": "Grace"}
+
+    api.patch("/users/1", None, body=user, full=True)
+    assert json.loads(request.call_args[1]["body"]) == {
+        "id": 1,
+        "first_name": "Grace",
+        "group_ids": [1, 2],
+    }
+    api.put("/users/1", None, body=user)
+    assert json.loads(request.call_args[1]["body"])["id"] == 1
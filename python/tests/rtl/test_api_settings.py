@@ -50,6 +50,9 @@ base_url=https://host2.looker.com:19999
 client_id=your_API3_client_id
 client_secret=your_API3_client_secret
 verify_ssl=
+timeout=30
+connect_timeout=2.5
+spool_threshold=1048576
 
 [BARE_MINIMUM]
 base_url=https://host3.looker.com:19999/
@@ -104,6 +107,8 @@ def test_it_assigns_defaults_to_empty_settings(config_file):
     assert settings.api_version == "3.1"
     assert settings.base_url == "https://host3.looker.com:19999/"
     assert settings.verify_ssl
+    assert settings.timeouts == (10.0, 120.0)
+    assert settings.spool_threshold is None
     assert not hasattr(settings, "client_id")
     assert not hasattr(settings, "client_secret")
 
@@ -225,3 +230,17 @@ def test_it_fails_when_env_variables_are_defined_but_empty(config_file, monkeypa
 
     with pytest.raises(error.SDKError):
         api_settings.ApiSettings.configure(config_file, "BARE")
+
+
+def test_it_reads_timeouts(config_file, monkeypatch):
+    settings = api_settings.ApiSettings.configure(config_file, "OLD_API")
+    assert settings.timeouts == (2.5, 30.0)
+
+    monkeypatch.setenv("LOOKERSDK_TIMEOUT", "5")
+    settings = api_settings.ApiSettings.configure(config_file, "OLD_API")
+    assert settings.timeouts == (2.5, 5.0)
+
+
+def test_it_reads_spool_threshold(config_file):
+    settings = api_settings.ApiSettings.configure(config_file, "OLD_API")
+    assert settings.spool_threshold == 1048576
@@ -20,14 +20,18 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import datetime
 import json
+import threading
 import pytest  # type: ignore
 import urllib
 
 from looker_sdk import error
 from looker_sdk.rtl import auth_session as auth
 from looker_sdk.rtl import api_settings
+from looker_sdk.rtl import auth_token
 from looker_sdk.rtl import serialize
+from looker_sdk.rtl import token_store
 from looker_sdk.rtl import transport
 
 
@@ -72,6 +76,10 @@ def auth_session(config_file):
 class MockTransport(transport.Transport):
     """A mock transport layer used for testing purposes"""
 
+    def __init__(self):
+        self.logins = []
+        self.logouts = []
+
     @classmethod
     def configure(cls, settings):
         return cls()
@@ -85,9 +93,9 @@ class MockTransport(transport.Transport):
         authenticator=None,
         headers=None,
     ):
-        if authenticator:
-            authenticator()
+        auth_header = authenticator() if authenticator else {}
         if method == transport.HttpMethod.POST:
+            self.logins.append(path)
             if path == "/login":
                 token = "AdminAccessToken"
                 expected_header = {"Content-Type": "application/x-www-form-urlencoded"}
@@ -95,11 +103,14 @@ class MockTransport(transport.Transport):
                     raise TypeError(f"Must send {expected_header}")
             elif path == "/login/5":
                 token = "UserAccessToken"
+            elif path.startswith("/login/"):
+                token = f"User{path[7:]}AccessToken"
             access_token = json.dumps(
                 {"access_token": token, "token_type": "Bearer", "expires_in": 3600}
             )
             response = transport.Response(ok=True, value=access_token)
         elif (method == transport.HttpMethod.DELETE) and (path == "/logout"):
+            self.logouts.append(auth_header["Authorization"])
             response = transport.Response(ok=True, value="")
         else:
             raise TypeError("Bad transport layer call")
@@ -219,3 +230,111 @@ def test_env_variables_override_config_file_credentials(
     mocked_request.assert_called
     actual_request_body = mocked_request.call_args[1]["body"]
     assert actual_request_body == expected_body
+
+
+def test_sudo_tokens_login_lazily(auth_session: auth.AuthSession):
+    pool = auth_session.sudo_tokens
+    assert pool is auth_session.sudo_tokens
+    assert pool.authenticate(7) == {"Authorization": "token User7AccessToken"}
+    assert pool.authenticate(8) == {"Authorization": "token User8AccessToken"}
+    assert pool.authenticate(7) == {"Authorization": "token User7AccessToken"}
+    assert auth_session.transport.logins == ["/login", "/login/7", "/login/8"]
+    # the session itself is still not sudo
+    assert auth_session.authenticate() == {"Authorization": "token AdminAccessToken"}
+
+
+def test_sudo_tokens_evict_least_recently_used(auth_session: auth.AuthSession):
+    pool = auth.SudoTokenPool(auth_session, max_size=2)
+    pool.token(1)
+    pool.token(2)
+    pool.token(1)
+    pool.token(3)
+    assert list(pool._tokens) == [1, 3]
+    assert auth_session.transport.logouts == ["token User2AccessToken"]
+
+    pool.clear()
+    assert len(pool) == 0
+    assert auth_session.transport.logouts[1:] == [
+        "token User1AccessToken",
+        "token User3AccessToken",
+    ]
+
+
+def test_sudo_tokens_refresh_before_expiry(auth_session: auth.AuthSession):
+    pool = auth.SudoTokenPool(auth_session, refresh_margin=60)
+    token = pool.token(7)
+    token.expires_at = datetime.datetime.now() + datetime.timedelta(seconds=30)
+    assert pool.token(7) is not token
+    assert auth_session.transport.logins.count("/login/7") == 2
+
+
+def test_sudo_tokens_log_in_once_across_threads(auth_session: auth.AuthSession):
+    pool = auth_session.sudo_tokens
+    threads = [threading.Thread(target=pool.token, args=(7,)) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert auth_session.transport.logins == ["/login", "/login/7"]
+
+
+def test_sudo_session(auth_session: auth.AuthSession):
+    session = auth.SudoSession(auth_session.sudo_tokens, 7)
+    assert session.is_sudo == 7
+    assert not session.is_user_authenticated
+    assert session.authenticate() == {"Authorization": "token User7AccessToken"}
+    assert session.is_user_authenticated
+    with pytest.raises(error.SDKError):
+        session.login_user(8)
+
+    session.logout()
+    assert not session.is_user_authenticated
+    assert auth_session.transport.logouts == ["token User7AccessToken"]
+
+
+def test_token_store_shares_tokens(config_file, tmp_path):
+    settings = api_settings.ApiSettings.configure(config_file)
+    store = token_store.FileTokenStore(str(tmp_path))
+    sessions = [
+        auth.AuthSession(
+            settings, MockTransport.configure(settings), serialize.deserialize, store
+        )
+        for _ in range(2)
+    ]
+    for session in sessions:
+        assert session.authenticate() == {"Authorization": "token AdminAccessToken"}
+        assert session.sudo_tokens.token(7).access_token == "User7AccessToken"
+    assert sessions[0].transport.logins == ["/login", "/login/7"]
+    assert sessions[1].transport.logins == []
+
+    # logging out must not revoke tokens the other session still uses
+    sessions[0].logout()
+    sessions[0].sudo_tokens.clear()
+    assert not sessions[0].is_admin_authenticated
+    assert sessions[0].transport.logouts == []
+    sessions[1].admin_token = auth_token.AuthToken()
+    assert sessions[1].authenticate() == {"Authorization": "token AdminAccessToken"}
+    assert sessions[1].transport.logins == []
+
+
+@pytest.fixture(  # type: ignore
+    name="store", params=["memory", "file", "sqlite"]
+)
+def shared_store(request, tmp_path) -> token_store.TokenStore:
+    if request.param == "file":
+        return token_store.FileTokenStore(str(tmp_path / "tokens"))
+    if request.param == "sqlite":
+        return token_store.SQLiteTokenStore(str(tmp_path / "tokens.db"))
+    return token_store.MemoryTokenStore()
+
+
+def test_sudo_login_without_admin_token(config_file, store: token_store.TokenStore):
+    settings = api_settings.ApiSettings.configure(config_file)
+    session = auth.AuthSession(
+        settings, MockTransport.configure(settings), serialize.deserialize, store
+    )
+    # logging in user 7 needs the admin token while holding user 7's lock
+    assert session.sudo_tokens.token(7).access_token == "User7AccessToken"
+    assert session.transport.logins == ["/login", "/login/7"]
+    assert session.authenticate() == {"Authorization": "token AdminAccessToken"}
+    assert session.transport.logins == ["/login", "/login/7"]
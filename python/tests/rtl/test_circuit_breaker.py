@@ -0,0 +1,193 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import time
+
+import pytest  # type: ignore
+
+from looker_sdk import error
+from looker_sdk.rtl import circuit_breaker as cb
+from looker_sdk.rtl import instrumentation as instr
+from looker_sdk.rtl import transport
+
+GET = transport.HttpMethod.GET
+
+
+class FakeTransport(transport.Transport):
+    """Answers every request with status, or no response if it is None.
+    """
+
+    def __init__(self):
+        self.status = 200
+        self.delay = 0.0
+        self.calls = 0
+        self.instrumentation = instr.Instrumentation()
+
+    @classmethod
+    def configure(cls, settings):
+        return cls()
+
+    def request(
+        self,
+        method,
+        path,
+        query_params=None,
+        body=None,
+        authenticator=None,
+        headers=None,
+        method_name=None,
+        binary=False,
+        output=None,
+        timeout=None,
+    ):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.status is None:
+            return transport.Response(False, "Connection reset by peer")
+        return transport.Response(self.status < 400, "", self.status)
+
+
+@pytest.fixture
+def fake():
+    return FakeTransport()
+
+
+@pytest.fixture
+def breakers(fake):
+    return cb.CircuitBreakerTransport(
+        fake, window=4, minimum_calls=4, reset_timeout=0.05
+    )
+
+
+def call(breakers, method_name="me"):
+    return breakers.request(GET, f"/{method_name}", method_name=method_name)
+
+
+@pytest.mark.parametrize("status", [None, 500, 503, 429])
+def test_opens_on_failures(fake, breakers, status):
+    fake.status = status
+    for _ in range(4):
+        assert not call(breakers).ok
+    assert breakers.states() == {"instance": cb.CLOSED, "me": cb.OPEN}
+    with pytest.raises(error.CircuitOpen):
+        call(breakers)
+    assert fake.calls == 4
+
+
+def test_client_errors_do_not_open(fake, breakers):
+    fake.status = 404
+    for _ in range(8):
+        assert not call(breakers).ok
+    assert breakers.states()["me"] == cb.CLOSED
+
+
+def test_opens_on_failure_rate(fake, breakers):
+    for status in (200, 500, 200, 200):
+        fake.status = status
+        call(breakers)
+    assert breakers.states()["me"] == cb.CLOSED
+    fake.status = 500
+    call(breakers)
+    assert breakers.states()["me"] == cb.OPEN
+
+
+def test_opens_on_slow_calls(fake):
+    breakers = cb.CircuitBreakerTransport(
+        fake, slow_call=0.01, window=2, minimum_calls=2
+    )
+    fake.delay = 0.02
+    call(breakers)
+    call(breakers)
+    with pytest.raises(error.CircuitOpen):
+        call(breakers)
+
+
+def test_endpoints_are_independent(fake, breakers):
+    fake.status = 500
+    for _ in range(4):
+        call(breakers, "me")
+    fake.status = 200
+    assert call(breakers, "all_users").ok
+    with pytest.raises(error.CircuitOpen):
+        call(breakers, "me")
+
+
+def test_instance_opens(fake):
+    instance = cb.CircuitBreaker("instance", window=4, minimum_calls=4)
+    breakers = cb.CircuitBreakerTransport(fake, instance=instance, window=10)
+    fake.status = 500
+    for name in ("a", "b", "c", "d"):
+        call(breakers, name)
+    with pytest.raises(error.CircuitOpen, match="instance"):
+        call(breakers, "e")
+
+
+def test_calls_without_method_name_share_a_breaker(fake, breakers):
+    fake.status = 500
+    for user_id in range(4):
+        breakers.request(transport.HttpMethod.POST, f"/login/{user_id}")
+    assert breakers.states()["POST /login/:id"] == cb.OPEN
+
+
+def test_half_open_probe_closes(fake, breakers):
+    fake.status = 500
+    for _ in range(4):
+        call(breakers)
+    time.sleep(0.05)
+    fake.status = 200
+    assert call(breakers).ok
+    assert breakers.states()["me"] == cb.CLOSED
+    assert call(breakers).ok
+
+
+def test_half_open_probe_failure_reopens(fake, breakers):
+    fake.status = 500
+    for _ in range(4):
+        call(breakers)
+    time.sleep(0.05)
+    call(breakers)
+    assert breakers.states()["me"] == cb.OPEN
+    with pytest.raises(error.CircuitOpen):
+        call(breakers)
+
+
+def test_half_open_admits_one_probe():
+    breaker = cb.CircuitBreaker("me", minimum_calls=1, reset_timeout=0.0)
+    breaker.acquire()
+    breaker.record(True)
+    breaker.acquire()
+    assert breaker.state == cb.HALF_OPEN
+    with pytest.raises(error.CircuitOpen):
+        breaker.acquire()
+    breaker.release()
+    breaker.acquire()
+    breaker.record(False)
+    assert breaker.state == cb.CLOSED
+
+
+def test_exceptions_count_as_failures(fake, breakers, mocker):
+    mocker.patch.object(fake, "request", side_effect=error.DeadlineExceeded)
+    for _ in range(4):
+        with pytest.raises(error.DeadlineExceeded):
+            call(breakers)
+    with pytest.raises(error.CircuitOpen):
+        call(breakers)
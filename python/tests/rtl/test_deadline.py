@@ -0,0 +1,71 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import threading
+import time
+
+import pytest  # type: ignore
+
+from looker_sdk import error
+from looker_sdk.rtl import deadline
+
+
+def test_no_deadline():
+    assert deadline.remaining() is None
+    deadline.check()
+    assert deadline.clip((10.0, 120.0)) == (10.0, 120.0)
+
+
+def test_deadline():
+    with deadline.deadline(1.0):
+        assert 0.9 < deadline.remaining() <= 1.0
+        connect, read = deadline.clip((10.0, 0.5))
+        assert 0.9 < connect <= 1.0
+        assert read == 0.5
+    assert deadline.remaining() is None
+
+
+def test_nested_deadlines_only_shorten():
+    with deadline.deadline(1.0):
+        with deadline.deadline(5.0):
+            assert deadline.remaining() <= 1.0
+        with deadline.deadline(0.1):
+            assert deadline.remaining() <= 0.1
+        assert deadline.remaining() > 0.1
+
+
+def test_deadline_exceeded():
+    with deadline.deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(error.DeadlineExceeded):
+            deadline.check()
+        with pytest.raises(error.SDKError):
+            deadline.clip((10.0, 120.0))
+
+
+def test_deadline_is_per_thread():
+    seen = []
+    with deadline.deadline(1.0):
+        thread = threading.Thread(target=lambda: seen.append(deadline.remaining()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
@@ -0,0 +1,176 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import threading
+import time
+
+import pytest  # type: ignore
+
+from looker_sdk.rtl import hedging
+from looker_sdk.rtl import instrumentation as instr
+from looker_sdk.rtl import profiler
+from looker_sdk.rtl import transport
+
+GET = transport.HttpMethod.GET
+
+
+class FakeTransport(transport.Transport):
+    """Sleeps for the next of delays (then 0.0) and reports an event.
+    """
+
+    def __init__(self, instrumentation=None):
+        self.delays = []
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.instrumentation = instrumentation or instr.Instrumentation()
+
+    @classmethod
+    def configure(cls, settings):
+        return cls()
+
+    def request(
+        self,
+        method,
+        path,
+        query_params=None,
+        body=None,
+        authenticator=None,
+        headers=None,
+        method_name=None,
+    ):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            delay = self.delays.pop(0) if self.delays else 0.0
+        time.sleep(delay)
+        self.instrumentation.emit(
+            instr.RequestEvent(
+                method=method.name,
+                path=path,
+                url=path,
+                method_name=method_name,
+                ok=True,
+                total=delay,
+            )
+        )
+        return transport.Response(True, str(call), 200)
+
+
+@pytest.fixture
+def fake():
+    return FakeTransport()
+
+
+@pytest.fixture
+def hedger(fake):
+    hedger = hedging.HedgingTransport(fake, min_samples=5, max_extra=0.5)
+    yield hedger
+    hedger.close()
+
+
+def warm_up(hedger, seconds=0.01, samples=10):
+    """Give hedger latency history for "dashboard" as if it made the calls.
+    """
+    histogram = hedger.histograms["dashboard"] = profiler.Histogram()
+    for _ in range(samples):
+        histogram.record(seconds)
+    hedger.requests += samples
+
+
+def get(hedger, method_name="dashboard", **kwargs):
+    return hedger.request(GET, "/dashboards/1", method_name=method_name, **kwargs)
+
+
+def test_histograms_from_instrumentation(hedger, fake):
+    fake.delays = [0.01, 0.02]
+    get(hedger)
+    get(hedger)
+    hedger.request(transport.HttpMethod.PATCH, "/dashboards/1", method_name="up")
+    assert list(hedger.histograms) == ["dashboard"]
+    assert hedger.histograms["dashboard"].count == 2
+    assert hedger.hedge_delay("dashboard") is None
+
+
+def test_shared_instrumentation(hedger, fake):
+    other = hedging.HedgingTransport(FakeTransport(fake.instrumentation))
+    get(hedger)
+    assert "dashboard" in hedger.histograms
+    assert "dashboard" not in other.histograms
+    other.close()
+
+
+def test_hedge_slow_request(hedger, fake):
+    warm_up(hedger)
+    assert hedger.hedge_delay("dashboard") == pytest.approx(0.01, rel=0.05)
+    fake.delays = [1.0, 0.0]
+    start = time.monotonic()
+    response = get(hedger)
+    assert time.monotonic() - start < 0.5
+    # the hedge answered
+    assert response.value == "2"
+    assert hedger.hedges == 1
+    assert hedger.wins == 1
+
+
+def test_fast_request_is_not_hedged(hedger, fake):
+    warm_up(hedger, seconds=0.5)
+    assert get(hedger).value == "1"
+    assert fake.calls == 1
+    assert hedger.hedges == 0
+
+
+def test_extra_load_is_capped(fake):
+    hedger = hedging.HedgingTransport(fake, max_extra=0.1, min_samples=5)
+    warm_up(hedger, samples=9)
+    fake.delays = [0.05, 0.0, 0.05, 0.0]
+    get(hedger)
+    get(hedger)
+    # 11 GETs allow one hedge
+    assert hedger.hedges == 1
+    assert fake.calls == 3
+    hedger.close()
+
+
+@pytest.mark.parametrize(
+    "method, method_name",
+    [(transport.HttpMethod.PATCH, "dashboard"), (GET, "look"), (GET, None)],
+)
+def test_not_hedged(fake, method, method_name):
+    hedger = hedging.HedgingTransport(
+        fake, max_extra=1.0, min_samples=5, method_names=["dashboard"]
+    )
+    warm_up(hedger)
+    fake.delays = [0.05]
+    hedger.request(method, "/dashboards/1", method_name=method_name)
+    assert fake.calls == 1
+    hedger.close()
+
+
+def test_output_not_hedged(hedger, mocker):
+    warm_up(hedger)
+    request = mocker.patch.object(
+        hedger.transport, "request", return_value=transport.Response(True, b"")
+    )
+    output = bytearray()
+    get(hedger, output=output)
+    request.assert_called_once()
+    assert request.call_args[1]["output"] is output
@@ -0,0 +1,53 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import threading
+
+import pytest  # type: ignore
+
+from looker_sdk.rtl import paging
+
+
+@pytest.mark.parametrize("rows", [0, 1, 9, 10, 11, 95])  # type: ignore
+def test_fetch_all(rows):
+    data = list(range(rows))
+    requested = []
+    lock = threading.Lock()
+
+    def fetch(page, per_page):
+        with lock:
+            requested.append(page)
+        return data[(page - 1) * per_page : page * per_page]
+
+    assert paging.fetch_all(fetch, per_page=10, concurrency=3) == data
+    # at most concurrency pages past the last one
+    assert max(requested) <= rows // 10 + 1 + 3
+
+
+def test_fetch_all_raises():
+    def fetch(page, per_page):
+        if page == 2:
+            raise ValueError("boom")
+        return [page] * per_page
+
+    with pytest.raises(ValueError):
+        paging.fetch_all(fetch, per_page=2, concurrency=2)
@@ -0,0 +1,146 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+from typing import MutableMapping
+
+import pytest  # type: ignore
+
+from looker_sdk import error
+
+from looker_sdk.rtl import api_methods
+from looker_sdk.rtl import profiler
+from looker_sdk.rtl import serialize
+from looker_sdk.rtl import transport
+
+
+class MockAuth:
+    def authenticate(self):
+        return {"Authorization": "token xyz"}
+
+
+class MockTransport(transport.Transport):
+    @classmethod
+    def configure(cls, settings):
+        return cls()
+
+    def request(
+        self,
+        method,
+        path,
+        query_params=None,
+        body=None,
+        authenticator=None,
+        headers=None,
+        method_name=None,
+    ):
+        if authenticator:
+            authenticator()
+        if path == "/fail":
+            return transport.Response(ok=False, value="not found", status_code=404)
+        return transport.Response(ok=True, value='{"foo": "bar"}')
+
+
+def test_histogram_percentiles():
+    histogram = profiler.Histogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+    assert histogram.count == 100
+    assert histogram.mean == pytest.approx(0.0505)
+    assert histogram.percentile(50) == pytest.approx(0.050, rel=0.05)
+    assert histogram.percentile(95) == pytest.approx(0.095, rel=0.05)
+    assert histogram.percentile(99) == pytest.approx(0.099, rel=0.05)
+    assert histogram.percentile(100) == pytest.approx(0.1, rel=0.05)
+    assert histogram.max == 0.1
+
+
+def test_empty_histogram():
+    assert profiler.Histogram().stats()["p99"] == 0.0
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "profile, env, enabled",
+    [(True, "", True), (False, "true", False), (None, "true", True), (None, "", False)],
+)
+def test_profile_flag(monkeypatch, profile, env, enabled):
+    monkeypatch.setenv("LOOKERSDK_PROFILE", env)
+    api = api_methods.APIMethods(
+        MockAuth(),
+        serialize.deserialize,
+        serialize.serialize,
+        MockTransport(),
+        profile=profile,
+    )
+    assert (api.profiler is not None) is enabled
+
+
+def test_phases_are_recorded():
+    api = api_methods.APIMethods(
+        MockAuth(),
+        serialize.deserialize,
+        serialize.serialize,
+        MockTransport(),
+        profile=True,
+    )
+    for _ in range(3):
+        api.post(
+            "/foo",
+            MutableMapping[str, str],
+            query_params={"limit": 5},
+            body={"foo": "bar"},
+            method_name="create_foo",
+        )
+    stats = api.profiler.stats()
+    assert list(stats) == ["create_foo"]
+    assert list(stats["create_foo"]) == list(profiler.PHASES)
+    total = stats["create_foo"]["total"]
+    assert total["count"] == 3
+    phases = sum(stats["create_foo"][phase]["mean"] for phase in profiler.PHASES[:-1])
+    assert phases == pytest.approx(total["mean"])
+
+    report = api.profiler.report()
+    assert "create_foo" in report
+    assert "deserialize" in report
+
+    api.profiler.reset()
+    assert api.profiler.stats() == {}
+
+
+def test_failed_calls_are_recorded():
+    api = api_methods.APIMethods(
+        MockAuth(),
+        serialize.deserialize,
+        serialize.serialize,
+        MockTransport(),
+        profile=True,
+    )
+    api.get("/foo", MutableMapping[str, str], method_name="foo")
+    for _ in range(2):
+        with pytest.raises(error.SDKError):
+            api.get("/fail", MutableMapping[str, str], method_name="foo")
+    stats = api.profiler.stats()["foo"]
+    assert stats["total"]["count"] == 3
+    assert stats["total"]["errors"] == 2
+    # the failures happened reading the response
+    assert stats["deserialize"]["count"] == 3
+    assert "errors" not in stats["network"]
+    assert " 3       2 " in api.profiler.report()
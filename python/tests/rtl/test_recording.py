@@ -0,0 +1,154 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+import time
+
+import pytest  # type: ignore
+
+from looker_sdk.rtl import instrumentation as instr
+from looker_sdk.rtl import recording
+from looker_sdk.rtl import transport
+
+GET = transport.HttpMethod.GET
+POST = transport.HttpMethod.POST
+
+
+class FakeTransport(transport.Transport):
+    """Answers from a {path: [values]} dict, one value per call.
+    """
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.instrumentation = instr.Instrumentation()
+
+    @classmethod
+    def configure(cls, settings):
+        return cls({})
+
+    def request(
+        self,
+        method,
+        path,
+        query_params=None,
+        body=None,
+        authenticator=None,
+        headers=None,
+        method_name=None,
+        binary=False,
+        output=None,
+    ):
+        time.sleep(0.01)
+        value = self.responses[path].pop(0)
+        if isinstance(value, transport.Response):
+            return value
+        if output is not None:
+            output.extend(value)
+            value = b""
+        return transport.Response(True, value, 200)
+
+
+@pytest.fixture(name="recorded")  # type: ignore
+def recorded_file(tmp_path):
+    path = str(tmp_path / "api.jsonl.gz")
+    recorder = recording.RecordingTransport(
+        FakeTransport(
+            {
+                "/login": [json.dumps({"access_token": "secret", "expires_in": 3600})],
+                "/users/1": ['{"id": 1, "v": 1}', '{"id": 1, "v": 2}'],
+                "/users": ['[{"id": 1}]', '[{"id": 2}]'],
+                "/render_tasks/1/results": [b"\x89PNG\x00\xff"],
+                "/users/9": [
+                    transport.Response(False, '{"message": "Not found"}', 404)
+                ],
+            }
+        ),
+        path,
+    )
+    recorder.request(POST, "/login", body=b"client_id=id&client_secret=secret")
+    recorder.request(GET, "/users/1", authenticator=lambda: {"Authorization": "x"})
+    recorder.request(GET, "/users/1")
+    recorder.request(GET, "/users", query_params={"page": "1"})
+    recorder.request(GET, "/users", query_params={"page": "2"})
+    output = bytearray()
+    recorder.request(GET, "/render_tasks/1/results", binary=True, output=output)
+    assert output == b"\x89PNG\x00\xff"
+    recorder.request(GET, "/users/9")
+    recorder.close()
+    return path
+
+
+def test_recording_is_redacted(recorded):
+    records = list(recording.read(recorded))
+    assert [r["path"] for r in records] == [
+        "/login",
+        "/users/1",
+        "/users/1",
+        "/users",
+        "/users",
+        "/render_tasks/1/results",
+        "/users/9",
+    ]
+    assert records[1]["elapsed"] >= 0.01
+    assert "body" not in records[0]
+    assert json.loads(records[0]["value"])["access_token"] == "recorded"
+    assert "secret" not in json.dumps(records)
+
+
+def test_replay_matches_requests(recorded):
+    replay = recording.ReplayTransport.load(recorded, speed=None)
+    login = replay.request(POST, "/login", body=b"client_id=other&client_secret=s")
+    assert login.ok and json.loads(login.value)["expires_in"] == 3600
+    assert replay.request(GET, "/users", query_params={"page": "2"}).value == (
+        '[{"id": 2}]'
+    )
+    # repeated requests cycle through the recorded responses
+    values = [replay.request(GET, "/users/1").value for _ in range(3)]
+    assert values == ['{"id": 1, "v": 1}', '{"id": 1, "v": 2}', '{"id": 1, "v": 1}']
+
+    not_found = replay.request(GET, "/users/9")
+    assert not not_found.ok and not_found.status_code == 404
+    assert replay.request(GET, "/users/1").status_code == 200
+
+    missing = replay.request(GET, "/users/2")
+    assert not missing.ok and missing.status_code is None
+
+
+def test_replay_binary(recorded):
+    replay = recording.ReplayTransport.load(recorded, speed=None)
+    path = "/render_tasks/1/results"
+    assert replay.request(GET, path, binary=True).value == b"\x89PNG\x00\xff"
+    output = bytearray()
+    assert replay.request(GET, path, binary=True, output=output).value == b""
+    assert output == b"\x89PNG\x00\xff"
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "speed, slowest, fastest", [(None, 0, 0.005), (1.0, 0.01, 1), (0.5, 0.02, 1)]
+)
+def test_replay_speed(recorded, speed, slowest, fastest):
+    replay = recording.ReplayTransport.load(recorded, speed=speed)
+    events = []
+    replay.instrumentation.subscribe(events.append)
+    replay.request(GET, "/users/1", method_name="user")
+    assert events[0].method_name == "user"
+    assert slowest <= events[0].total < fastest
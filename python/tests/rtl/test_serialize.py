@@ -21,6 +21,7 @@
 # THE SOFTWARE.
 
 import copy
+import datetime
 import functools
 import json
 
@@ -33,6 +34,7 @@ import pytest  # type: ignore
 
 from looker_sdk.rtl import model as ml
 from looker_sdk.rtl import serialize as sr
+from looker_sdk.rtl import spool
 
 
 @attr.s(auto_attribs=True, kw_only=True)
@@ -80,6 +82,11 @@ class WriteChildModel(ml.Model):
         self.import_ = import_
 
 
+@attr.s(auto_attribs=True, kw_only=True)
+class Dated(ml.Model):
+    created_at: Optional[datetime.datetime] = None
+
+
 structure_hook = functools.partial(sr.structure_hook, globals())  # type: ignore
 cattr.register_structure_hook(
     ForwardRef("ChildModel"), structure_hook  # type: ignore
@@ -168,6 +175,13 @@ def test_deserialize_with_null():
     assert model.finally_[1].id == 2
 
 
+def test_deserialize_spooled():
+    data = json.dumps(MODEL_DATA).encode("utf-8")
+    with spool.read([data[:10], data[10:]], threshold=10) as body:
+        model = sr.deserialize(body, Model)
+    assert model == sr.deserialize(data, Model)
+
+
 @pytest.mark.parametrize(  # type: ignore
     "data, structure", [(MODEL_DATA, Sequence[Model]), ([MODEL_DATA], Model)]
 )
@@ -234,3 +248,151 @@ def test_serialize_explict_null():
     data["finally"][0]["import"] = None
     expected = json.dumps(data).encode("utf-8")
     assert sr.serialize(model) == expected
+
+
+def test_serialize_datetime():
+    data = {"created_at": datetime.datetime(2019, 9, 25, tzinfo=datetime.timezone.utc)}
+    expected = b'{"created_at": "2019-09-25T00:00:00+00:00"}'
+    assert sr.serialize(data) == expected
+
+
+CONVERTER_FIELDS = {
+    "Model": (
+        ("id", "id", "int"),
+        ("name", "name", "str"),
+        ("class_", "class", "str"),
+        ("finally_", "finally", ("Sequence", "ChildModel")),
+    ),
+    "ChildModel": (("id", "id", "int"), ("import_", "import", "str")),
+}
+
+
+@pytest.fixture(name="registry")  # type: ignore
+def converter_registry() -> sr.ConverterRegistry:
+    registry = sr.ConverterRegistry()
+    registry.register(globals(), CONVERTER_FIELDS)
+    return registry
+
+
+def test_converter_structure(registry):
+    data = copy.deepcopy(MODEL_DATA)
+    data["finally"][0]["id"] = "1"
+    data["unknown"] = "ignored"
+
+    model = registry.get(Model).structure(data)
+    assert model == Model(
+        id=1,
+        name="my-name",
+        class_="model-name",
+        finally_=[
+            ChildModel(id=1, import_="child1"),
+            ChildModel(id=2, import_="child2"),
+        ],
+    )
+
+
+def test_converter_unstructure(registry):
+    model = Model(id=1, name=ml.EXPLICIT_NULL, finally_=[ChildModel(id=2)])
+    assert registry.get(Model).unstructure(model) == {
+        "id": 1,
+        "name": None,
+        "finally": [{"id": 2}],
+    }
+
+
+def test_converter_unregistered_model(registry):
+    assert registry.get(WriteModel) is None
+
+
+def test_deserialize_lazy_datetimes(registry):
+    registry.register(
+        globals(), {"Dated": (("created_at", "created_at", "datetime.datetime"),)}
+    )
+    sr.lazy_datetimes()
+    try:
+        dated = registry.converter("Dated").structure(
+            {"created_at": "2019-09-25T00:00:00.000+00:00"}
+        )
+    finally:
+        sr.lazy_datetimes(False)
+    assert dated.created_at == "2019-09-25T00:00:00.000+00:00"
+    assert dated.created_at.parsed == datetime.datetime(
+        2019, 9, 25, tzinfo=datetime.timezone.utc
+    )
+    assert registry.get(Dated).unstructure(dated) == {
+        "created_at": "2019-09-25T00:00:00.000+00:00"
+    }
+
+
+@pytest.mark.parametrize("registered", [False, True])  # type: ignore
+def test_changes(registered):
+    registry = sr.ConverterRegistry()
+    if registered:
+        registry.register(globals(), CONVERTER_FIELDS)
+    original, sr.converters = sr.converters, registry
+    try:
+        model = sr.deserialize(json.dumps(MODEL_DATA), Model)
+        assert sr.changes(model) == []
+        assert sr.serialize_changes(model) == b"{}"
+
+        model.name = "new-name"
+        model.finally_[1].import_ = "child3"
+        assert sr.changes(model) == ["name", "finally"]
+        assert json.loads(sr.serialize_changes(model)) == {
+            "name": "new-name",
+            "finally": [{"id": 1, "import": "child1"}, {"id": 2, "import": "child3"}],
+        }
+        model.finally_.pop()
+        model.id = None
+        model.class_ = ml.EXPLICIT_NULL
+        assert sr.changes(model) == ["name", "class", "finally"]
+
+        ml.send_all(model)
+        assert sr.changes(model) is None
+        assert sr.serialize_changes(model) == sr.serialize(model)
+    finally:
+        sr.converters = original
+
+
+def test_changes_sequence():
+    models = sr.deserialize(json.dumps([MODEL_DATA, MODEL_DATA]), Sequence[Model])
+    models[1].finally_.append(ChildModel(id=3))
+    assert sr.changes(models[0]) == []
+    assert sr.changes(models[1]) == ["finally"]
+
+
+def test_changes_ignore_nulls_and_timestamp_format():
+    data = {"id": 1, "name": None, "finally": [{"id": 1, "import": None}]}
+    model = sr.deserialize(json.dumps(data), Model)
+    assert sr.changes(model) == []
+    dated = sr.deserialize('{"created_at": "2019-09-25T00:00:00.000+00:00"}', Dated)
+    assert sr.changes(dated) == []
+    dated.created_at = datetime.datetime(2019, 9, 26, tzinfo=datetime.timezone.utc)
+    assert sr.changes(dated) == ["created_at"]
+
+
+@pytest.mark.parametrize("registered", [False, True])  # type: ignore
+def test_changes_track_assignments(registered):
+    registry = sr.ConverterRegistry()
+    if registered:
+        registry.register(globals(), CONVERTER_FIELDS)
+    original, sr.converters = sr.converters, registry
+    try:
+        data = dict(MODEL_DATA, unknown={"not": "a field"})
+        model = sr.deserialize(json.dumps(data), Model)
+    finally:
+        sr.converters = original
+    assert model._changed == set()
+    # only the nested fields are copied, and only shallowly
+    assert list(model._loaded) == ["finally_"]
+    assert model._loaded["finally_"][0] is model.finally_[0]
+
+    model.name = model.name
+    assert model._changed == {"name"}
+    assert sr.changes(model) == ["name"]
+    model.finally_[0] = ChildModel(id=1, import_="child1")
+    assert sr.changes(model) == ["name", "finally"]
+
+
+def test_changes_new_model():
+    assert sr.changes(Model(id=1)) is None
@@ -0,0 +1,61 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest  # type: ignore
+
+from looker_sdk.rtl import spool
+
+
+def test_read_small_body():
+    assert spool.read([b"ab", b"cd"], threshold=4) == b"abcd"
+    assert spool.read([], threshold=0) == b""
+
+
+def test_read_spools_large_body():
+    with spool.read([b"a,b\n", b"1,2\n", b"3,4"], threshold=4) as body:
+        assert isinstance(body, spool.SpooledBody)
+        assert len(body) == 11
+        assert body[0:3] == b"a,b"
+        assert body[:] == bytes(body) == b"a,b\n1,2\n3,4"
+        assert body.find(b"3") == 8
+        assert list(body.lines()) == [b"a,b\n", b"1,2\n", b"3,4"]
+        assert body.decode() == "a,b\n1,2\n3,4"
+    assert body.mmap.closed
+    assert body.file.closed
+
+
+def test_decode_uses_encoding():
+    text = "café".encode("latin-1")
+    body = spool.read([text], threshold=1, encoding="ISO-8859-1")
+    assert body.decode() == "café"
+    assert body.decode("utf-8") == "caf�"
+    body.close()
+    body.close()
+
+
+def test_read_failure_closes_file():
+    def chunks():
+        yield b"abcd"
+        raise IOError("connection reset")
+
+    with pytest.raises(IOError):
+        spool.read(chunks(), threshold=2)
@@ -0,0 +1,94 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import datetime
+
+import pytest  # type: ignore
+
+from looker_sdk.rtl import timestamp
+
+UTC = datetime.timezone.utc
+IST = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "value, expected",
+    [
+        (
+            "2019-09-25T16:33:10.123+00:00",
+            datetime.datetime(2019, 9, 25, 16, 33, 10, 123000, tzinfo=UTC),
+        ),
+        (
+            "2019-09-25T16:33:10+00:00",
+            datetime.datetime(2019, 9, 25, 16, 33, 10, tzinfo=UTC),
+        ),
+        (
+            "2019-09-25T16:33:10Z",
+            datetime.datetime(2019, 9, 25, 16, 33, 10, tzinfo=UTC),
+        ),
+        (
+            "2019-09-25T16:33:10.1234567+0530",
+            datetime.datetime(2019, 9, 25, 16, 33, 10, 123456, tzinfo=IST),
+        ),
+        (
+            "2019-09-25T16:33:10.5-00",
+            datetime.datetime(2019, 9, 25, 16, 33, 10, 500000, tzinfo=UTC),
+        ),
+        ("2019-09-25T16:33:10", datetime.datetime(2019, 9, 25, 16, 33, 10)),
+    ],
+)
+def test_parse(value, expected):
+    assert timestamp.parse_isoformat(value) == expected
+    assert timestamp.parse(value) == expected
+
+
+def test_parse_invalid():
+    with pytest.raises(ValueError):
+        timestamp.parse_isoformat("yesterday")
+
+
+def test_lazy_datetime():
+    value = timestamp.LazyDatetime("2019-09-25T16:33:10.123+00:00")
+    assert value == "2019-09-25T16:33:10.123+00:00"
+    assert "_parsed" not in value.__dict__
+    assert value.year == 2019
+    assert value.tzinfo == UTC
+    assert value.parsed is value.parsed
+    assert value.parsed == datetime.datetime(
+        2019, 9, 25, 16, 33, 10, 123000, tzinfo=UTC
+    )
+
+
+def test_lazy_datetime_compares_as_datetime():
+    value = timestamp.LazyDatetime("2019-09-25T16:33:10.123+00:00")
+    same = datetime.datetime(2019, 9, 25, 16, 33, 10, 123000, tzinfo=UTC)
+    later = datetime.datetime(2019, 9, 26, tzinfo=UTC)
+    assert value == same and same == value
+    assert value != later and later != value
+    assert value < later and later > value
+    assert value <= same and value >= same
+    assert not value > later
+    assert value == timestamp.LazyDatetime("2019-09-25T16:33:10.123Z")
+    assert value < timestamp.LazyDatetime("2019-09-26T00:00:00Z")
+    assert sorted([later, value]) == [value, later]
+    assert {value: 1}[same] == 1
+    assert value == "2019-09-25T16:33:10.123+00:00"
@@ -0,0 +1,115 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import threading
+import time
+
+import pytest  # type: ignore
+
+from looker_sdk.rtl import auth_token
+from looker_sdk.rtl import token_store as ts
+from looker_sdk.sdk import models
+
+
+@pytest.fixture(  # type: ignore
+    name="store", params=["memory", "file", "sqlite"]
+)
+def token_store(request, tmp_path) -> ts.TokenStore:
+    if request.param == "file":
+        return ts.FileTokenStore(str(tmp_path / "tokens"))
+    if request.param == "sqlite":
+        return ts.SQLiteTokenStore(str(tmp_path / "tokens.db"))
+    return ts.MemoryTokenStore()
+
+
+def make_token(name: str = "all-access") -> auth_token.AuthToken:
+    return auth_token.AuthToken(
+        models.AccessToken(access_token=name, token_type="Bearer", expires_in=3600)
+    )
+
+
+def test_put_get_delete(store: ts.TokenStore):
+    assert store.get("admin") is None
+    token = make_token()
+    store.put("admin", token)
+    stored = store.get("admin")
+    assert stored.access_token == "all-access"
+    assert stored.token_type == "Bearer"
+    assert stored.expires_in == 3600
+    assert abs((stored.expires_at - token.expires_at).total_seconds()) < 0.001
+    assert stored.is_active
+
+    store.put("admin", make_token("refreshed"))
+    assert store.get("admin").access_token == "refreshed"
+    store.delete("admin")
+    store.delete("admin")
+    assert store.get("admin") is None
+
+
+def test_lock_is_exclusive(store: ts.TokenStore):
+    inside = []
+
+    def refresh(name):
+        with store.lock("admin"):
+            inside.append(name)
+            time.sleep(0.01)
+            assert inside == [name]
+            store.put("admin", make_token(name))
+            inside.remove(name)
+
+    threads = [threading.Thread(target=refresh, args=(str(i),)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.get("admin") is not None
+
+
+def test_locks_nest(store: ts.TokenStore):
+    with store.lock("user 7"):
+        with store.lock("admin"):
+            store.put("admin", make_token())
+        store.put("user 7", make_token("user"))
+    assert store.get("admin").access_token == "all-access"
+    assert store.get("user 7").access_token == "user"
+
+
+def test_sqlite_locks_only_the_key(tmp_path):
+    path = str(tmp_path / "tokens.db")
+    first = ts.SQLiteTokenStore(path)
+    second = ts.SQLiteTokenStore(path, timeout=0.1)
+    with first.lock("admin"):
+        # no transaction is held, so the database stays writable
+        with second.lock("user 7"):
+            second.put("user 7", make_token("user"))
+        second.put("admin", make_token())
+    assert first.get("user 7").access_token == "user"
+
+
+def test_sqlite_lease_expires(tmp_path):
+    path = str(tmp_path / "tokens.db")
+    # entered and never left, as by a process that died holding it
+    held = ts.SQLiteTokenStore(path, lease=0.05).lock("admin")
+    held.__enter__()
+    started = time.monotonic()
+    with ts.SQLiteTokenStore(path).lock("admin"):
+        assert time.monotonic() - started >= 0.04
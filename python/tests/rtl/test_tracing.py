@@ -0,0 +1,118 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+import json
+
+import pytest  # type: ignore
+
+from looker_sdk.rtl import api_methods
+from looker_sdk.rtl import api_settings
+from looker_sdk.rtl import auth_session
+from looker_sdk.rtl import requests_transport
+from looker_sdk.rtl import serialize
+from looker_sdk.sdk import models
+
+trace = pytest.importorskip("opentelemetry.trace")
+sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+export = pytest.importorskip("opentelemetry.sdk.trace.export")
+in_memory = pytest.importorskip(
+    "opentelemetry.sdk.trace.export.in_memory_span_exporter"
+)
+
+
+class Response:
+    """Fake requests.Response
+    """
+
+    def __init__(self, text):
+        self.ok = True
+        self.status_code = 200
+        self.text = text
+
+
+class Session:
+    """Fake requests.Session recording the headers it was sent
+    """
+
+    def __init__(self):
+        self.headers = {}
+        self.sent = []
+
+    def request(self, method, url, params, data, headers, stream=False, timeout=None):
+        self.sent.append(dict(headers))
+        if url.endswith("/login"):
+            return Response(
+                json.dumps(
+                    {"access_token": "token", "token_type": "Bearer", "expires_in": 60}
+                )
+            )
+        return Response(json.dumps({"looker_release_version": "6.18"}))
+
+
+@pytest.fixture(scope="module")  # type: ignore
+def exporter():
+    exporter = in_memory.InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(export.SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return exporter
+
+
+@pytest.fixture  # type: ignore
+def api(monkeypatch):
+    monkeypatch.setenv("LOOKERSDK_CLIENT_ID", "id")
+    monkeypatch.setenv("LOOKERSDK_CLIENT_SECRET", "secret")
+    settings = api_settings.ApiSettings(base_url="https://host")
+    session = Session()
+    transport = requests_transport.RequestsTransport(settings, session)
+    auth = auth_session.AuthSession(settings, transport, serialize.deserialize)
+    return api_methods.APIMethods(
+        auth, serialize.deserialize, serialize.serialize, transport
+    )
+
+
+def test_spans_are_nested(exporter, api):
+    exporter.clear()
+    api.get(
+        "/versions", models.ApiVersion, method_name="versions", endpoint="/versions",
+    )
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    root = spans["versions"]
+    assert root.parent is None
+    assert root.attributes["looker.endpoint"] == "/versions"
+    assert spans["looker.auth"].parent.span_id == root.context.span_id
+    assert spans["looker.deserialize"].parent.span_id == root.context.span_id
+    assert spans["looker.deserialize"].attributes["looker.model"] == "ApiVersion"
+    # login happens inside auth, the API call inside the method span
+    transports = [s for s in exporter.get_finished_spans() if s.name == "HTTP POST"]
+    assert transports[0].parent.span_id == spans["looker.auth"].context.span_id
+    assert spans["HTTP GET"].parent.span_id == root.context.span_id
+    assert spans["HTTP GET"].attributes["http.status_code"] == 200
+
+
+def test_traceparent_is_propagated(exporter, api):
+    api.get("/versions", models.ApiVersion, method_name="versions")
+    sent = api.transport.session.sent[-1]
+    trace_id = sent["traceparent"].split("-")[1]
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert int(trace_id, 16) == spans["versions"].context.trace_id
@@ -0,0 +1,565 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Tests run against every Transport implementation, each on a fake
+connection answering with a canned Reply.
+"""
+
+import concurrent.futures as cf
+import io
+import socket
+import threading
+import time
+from typing import Dict, List, Mapping, Tuple, Type
+
+import attr
+import pytest  # type: ignore
+import requests
+import urllib3
+
+from looker_sdk import error
+from looker_sdk.rtl import deadline
+from looker_sdk.rtl import httpx_transport
+from looker_sdk.rtl import instrumentation
+from looker_sdk.rtl import requests_transport
+from looker_sdk.rtl import spool
+from looker_sdk.rtl import transport
+from looker_sdk.rtl import urllib3_transport
+
+try:
+    import httpx  # type: ignore
+except ImportError:
+    httpx = None
+
+try:
+    import h2.config  # type: ignore
+    import h2.connection  # type: ignore
+    import h2.events  # type: ignore
+except ImportError:
+    h2 = None
+
+
+@attr.s(auto_attribs=True)
+class Reply:
+    """What the fake connection answers every request with
+    """
+
+    status: int = 200
+    body: bytes = b"yay!"
+    headers: Dict[str, str] = attr.Factory(dict)
+    # raise a connection error instead of answering
+    error: bool = False
+    # seconds each read of the body takes
+    delay: float = 0.0
+
+
+@attr.s(auto_attribs=True)
+class Sent:
+    """A request as the fake connection received it
+    """
+
+    method: str
+    url: str
+    headers: Mapping[str, str]
+    # (connect, read) timeouts in seconds
+    timeout: Tuple[float, float]
+    # whether the body was left on the connection to be read in chunks
+    stream: bool
+
+
+class Body(io.BytesIO):
+    """Response body on the fake connection
+    """
+
+    def __init__(self, reply: Reply):
+        super().__init__(reply.body)
+        self.delay = reply.delay
+
+    def read(self, *args):
+        time.sleep(self.delay)
+        return super().read(*args)
+
+
+class Backend:
+    """Builds one Transport implementation on a fake connection
+    """
+
+    cls: Type[transport.Transport]
+
+    def __init__(self):
+        self.sent: List[Sent] = []
+
+    def transport(self, settings, reply=None, instrumentation=None):
+        raise NotImplementedError
+
+
+class Adapter(requests.adapters.BaseAdapter):
+    """Fake requests adapter, in place of the one with the connection pools
+    """
+
+    def __init__(self, sent, reply):
+        super().__init__()
+        self.sent = sent
+        self.reply = reply
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        headers = requests.structures.CaseInsensitiveDict(request.headers)
+        self.sent.append(Sent(request.method, request.url, headers, timeout, stream))
+        if self.reply.error:
+            raise requests.ConnectionError("Connection reset by peer")
+        resp = requests.Response()
+        resp.status_code = self.reply.status
+        resp.headers = requests.structures.CaseInsensitiveDict(self.reply.headers)
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        resp.raw = Body(self.reply)
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
+
+
+class RequestsBackend(Backend):
+    cls = requests_transport.RequestsTransport
+
+    def transport(self, settings, reply=None, instrumentation=None):
+        session = requests.Session()
+        session.mount("https://", Adapter(self.sent, reply or Reply()))
+        return self.cls(settings, session, instrumentation)
+
+
+class Connection:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPool:
+    def __init__(self):
+        # whether each connection was closed when it came back
+        self.returned = []
+
+    def _put_conn(self, connection):
+        self.returned.append(connection.closed)
+
+
+class PoolManager:
+    """Fake urllib3.PoolManager
+    """
+
+    def __init__(self, sent, reply):
+        self.sent = sent
+        self.reply = reply
+        self.pool = ConnectionPool()
+
+    def request(self, method, url, headers, timeout, **kwargs):
+        timeouts = (timeout.connect_timeout, timeout.read_timeout)
+        headers = requests.structures.CaseInsensitiveDict(headers)
+        self.sent.append(Sent(method, url, headers, timeouts, True))
+        if self.reply.error:
+            raise urllib3.exceptions.ProtocolError("Connection reset by peer")
+        return urllib3.HTTPResponse(
+            body=Body(self.reply),
+            status=self.reply.status,
+            headers=self.reply.headers,
+            preload_content=False,
+            connection=Connection(),
+            pool=self.pool,
+        )
+
+
+class Urllib3Backend(Backend):
+    cls = urllib3_transport.Urllib3Transport
+
+    def transport(self, settings, reply=None, instrumentation=None):
+        self.pool_manager = PoolManager(self.sent, reply or Reply())
+        return self.cls(settings, self.pool_manager, instrumentation)
+
+
+class HttpxBackend(Backend):
+    cls = httpx_transport.HttpxTransport
+
+    def transport(self, settings, reply=None, instrumentation=None):
+        reply = reply or Reply()
+
+        def handler(request):
+            timeout = request.extensions["timeout"]
+            self.sent.append(
+                Sent(
+                    request.method,
+                    str(request.url),
+                    request.headers,
+                    (timeout["connect"], timeout["read"]),
+                    True,
+                )
+            )
+            if reply.error:
+                raise httpx.ConnectError("Connection reset by peer", request=request)
+            body = Body(reply)
+            return httpx.Response(
+                reply.status,
+                headers=reply.headers,
+                content=iter(lambda: body.read(1024), b""),
+            )
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        return self.cls(settings, client, instrumentation)
+
+
+BACKENDS = {
+    "requests": RequestsBackend,
+    "urllib3": Urllib3Backend,
+    "httpx": HttpxBackend,
+}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request):
+    if request.param == "httpx" and httpx is None:
+        pytest.skip("needs httpx")
+    return BACKENDS[request.param]()
+
+
+@pytest.fixture
+def settings():
+    return transport.TransportSettings(
+        base_url="https://host",
+        api_version="3.1",
+        headers={"Content-Type": "application/json"},
+        verify_ssl=True,
+    )
+
+
+def test_configure(settings, backend):
+    """Test configuration creates instance.
+    """
+    test = backend.cls.configure(settings)
+    assert isinstance(test, backend.cls)
+
+
+def test_request_ok(settings, backend):
+    """Test basic successful round trip
+    """
+    test = backend.transport(settings)
+    resp = test.request(
+        transport.HttpMethod.GET,
+        "/users",
+        query_params={"fields": "id,name", "page": "1"},
+        authenticator=lambda: {"Authorization": "token AccessToken"},
+    )
+    assert resp == transport.Response(ok=True, value="yay!")
+    assert resp.status_code == 200
+    sent = backend.sent[0]
+    assert sent.method == "GET"
+    assert sent.url == "https://host/api/3.1/users?fields=id%2Cname&page=1"
+    assert sent.headers["Authorization"] == "token AccessToken"
+    assert sent.headers["Content-Type"] == "application/json"
+    assert sent.headers["User-Agent"] == settings.agent_tag
+
+    # the authenticator's headers are not kept for later calls
+    test.request(transport.HttpMethod.GET, "/users")
+    assert "Authorization" not in backend.sent[1].headers
+
+
+def test_request_not_ok(settings, backend):
+    """Test API error response
+    """
+    test = backend.transport(
+        settings, Reply(404, b"Some API error", {"Content-Type": "image/png"})
+    )
+    resp = test.request(transport.HttpMethod.GET, "/some/path", binary=True)
+    assert resp == transport.Response(ok=False, value="Some API error")
+    assert resp.status_code == 404
+
+
+def test_request_error(settings, backend):
+    """Test network error response
+    """
+    test = backend.transport(settings, Reply(error=True))
+    resp = test.request(transport.HttpMethod.GET, "/some/path")
+    assert resp == transport.Response(ok=False, value="Connection reset by peer")
+    assert resp.status_code is None
+
+
+def test_request_emits_event(settings, backend):
+    """Test instrumentation listeners see each request
+    """
+    events = []
+    test = backend.transport(settings, Reply(404, b"Some API error"))
+    test.instrumentation.subscribe(events.append)
+    test.request(
+        transport.HttpMethod.POST,
+        "/some/path",
+        body=b"12345",
+        method_name="some_method",
+    )
+    assert len(events) == 1
+    event = events[0]
+    assert isinstance(event, instrumentation.RequestEvent)
+    assert event.method == "POST"
+    assert event.path == "/some/path"
+    assert event.url == "https://host/api/3.1/some/path"
+    assert event.method_name == "some_method"
+    assert event.ok is False
+    assert event.status_code == 404
+    assert event.request_bytes == 5
+    assert event.response_bytes == len("Some API error")
+    assert 0 < event.ttfb <= event.total
+    assert event.connection_reused is None
+
+
+def test_request_error_emits_event(settings, backend):
+    """Test network errors are reported and listener errors are contained
+    """
+    events = []
+
+    def broken(event):
+        raise ValueError("broken listener")
+
+    shared = instrumentation.Instrumentation()
+    shared.subscribe(broken)
+    shared.subscribe(events.append)
+    test = backend.transport(settings, Reply(error=True), shared)
+    resp = test.request(transport.HttpMethod.GET, "/some/path")
+    assert resp.ok is False
+    assert events[0].error == "Connection reset by peer"
+    assert events[0].status_code is None
+
+    shared.unsubscribe(events.append)
+    test.request(transport.HttpMethod.GET, "/some/path")
+    assert len(events) == 1
+
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "binary, content_type, expected",
+    [
+        (True, "text/plain", PNG),
+        (None, "image/png", PNG),
+        (None, "application/json; charset=utf-8", "png"),
+        (False, "image/png", "png"),
+        (False, "text/plain; charset=latin-1", "p\xe9ng"),
+    ],
+)
+def test_request_binary(settings, backend, binary, content_type, expected):
+    """Binary responses are returned as bytes without decoding
+    """
+    body = expected.encode("latin-1") if isinstance(expected, str) else PNG
+    test = backend.transport(
+        settings, Reply(body=body, headers={"Content-Type": content_type})
+    )
+    resp = test.request(transport.HttpMethod.GET, "/render", binary=binary)
+    assert resp.value == expected
+
+
+@pytest.mark.parametrize("output_type", [io.BytesIO, bytearray])  # type: ignore
+def test_request_streams_to_output(settings, backend, output_type):
+    output = output_type()
+    test = backend.transport(settings, Reply(body=PNG * 10000))
+    test.chunk_size = 1000
+    events = []
+    test.instrumentation.subscribe(events.append)
+    resp = test.request(transport.HttpMethod.GET, "/render", output=output)
+    assert resp == transport.Response(ok=True, value=b"")
+    written = output.getvalue() if isinstance(output, io.BytesIO) else output
+    assert written == PNG * 10000
+    assert events[0].response_bytes == len(PNG) * 10000
+
+
+def test_request_not_ok_is_not_streamed(settings, backend):
+    output = io.BytesIO()
+    test = backend.transport(settings, Reply(404, b"Not found"))
+    resp = test.request(transport.HttpMethod.GET, "/render", output=output)
+    assert resp.value == "Not found"
+    assert output.getvalue() == b""
+
+
+def test_request_timeouts(settings, backend):
+    test = backend.transport(settings)
+    test.request(transport.HttpMethod.GET, "/some/path")
+    assert backend.sent[-1].timeout == (10.0, 120.0)
+
+    test.request(transport.HttpMethod.GET, "/some/path", timeout=(1.0, 2.0))
+    assert backend.sent[-1].timeout == (1.0, 2.0)
+
+    with deadline.deadline(0.5):
+        resp = test.request(transport.HttpMethod.GET, "/some/path")
+    assert resp.value == "yay!"
+    assert backend.sent[-1].stream is True
+    assert backend.sent[-1].timeout[0] <= 0.5
+    assert backend.sent[-1].timeout[1] <= 0.5
+
+
+def test_request_past_deadline(settings, backend):
+    test = backend.transport(settings)
+    with deadline.deadline(0):
+        with pytest.raises(error.DeadlineExceeded):
+            test.request(transport.HttpMethod.GET, "/some/path")
+    assert backend.sent == []
+
+
+def test_request_stops_reading_at_deadline(settings, backend):
+    test = backend.transport(settings, Reply(body=PNG * 1000, delay=0.01))
+    test.chunk_size = 1024
+    start = time.monotonic()
+    with deadline.deadline(0.05):
+        with pytest.raises(error.DeadlineExceeded):
+            test.request(transport.HttpMethod.GET, "/render", binary=True)
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.parametrize("backend", ["urllib3"], indirect=True)  # type: ignore
+def test_request_deadline_mid_body_closes_connection(settings, backend):
+    class SlowOutput(io.BytesIO):
+        def write(self, chunk):
+            time.sleep(0.05)
+            return super().write(chunk)
+
+    reply = Reply(body=b"x" * 3 * backend.cls.chunk_size)
+    test = backend.transport(settings, reply)
+    test.request(transport.HttpMethod.GET, "/render")
+    with deadline.deadline(0.02):
+        with pytest.raises(error.DeadlineExceeded):
+            test.request(transport.HttpMethod.GET, "/render", output=SlowOutput())
+    assert backend.pool_manager.pool.returned == [False, True]
+
+
+@pytest.mark.parametrize("backend", ["requests"], indirect=True)  # type: ignore
+@pytest.mark.parametrize(  # type: ignore
+    "text, spooled", [("small", False), ("a,b\n" * 10, True)]
+)
+def test_request_spools_large_bodies(settings, backend, text, spooled):
+    settings.spool_threshold = 16
+    reply = Reply(body=text.encode(), headers={"Content-Type": "text/csv"})
+    test = backend.transport(settings, reply)
+    test.chunk_size = 4
+    resp = test.request(transport.HttpMethod.GET, "/some/path")
+    assert backend.sent[0].stream is True
+    assert isinstance(resp.value, spool.SpooledBody) is spooled
+    if spooled:
+        assert resp.value.decode() == text
+        resp.value.close()
+    else:
+        assert resp.value == text
+
+
+@pytest.mark.parametrize("backend", ["requests"], indirect=True)  # type: ignore
+def test_request_not_ok_is_not_spooled(settings, backend):
+    settings.spool_threshold = 1
+    test = backend.transport(settings, Reply(500, b"Some API error"))
+    resp = test.request(transport.HttpMethod.GET, "/some/path")
+    assert resp.value == "Some API error"
+
+
+@pytest.mark.parametrize("backend", ["urllib3", "httpx"], indirect=True)  # type: ignore
+def test_spool_threshold_needs_requests(settings, backend):
+    settings.spool_threshold = 1024
+    with pytest.raises(error.SDKError):
+        backend.transport(settings)
+
+
+class H2Server:
+    """HTTP/2 server without TLS (prior knowledge) that holds its replies
+    until `streams` requests are open on a connection, then answers them all
+    """
+
+    def __init__(self, streams: int):
+        self.streams = streams
+        self.connections = 0
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def close(self):
+        self.sock.close()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        config = h2.config.H2Configuration(client_side=False)
+        conn = h2.connection.H2Connection(config=config)
+        conn.initiate_connection()
+        sock.sendall(conn.data_to_send())
+        waiting: List[int] = []
+        with sock:
+            while True:
+                data = sock.recv(65535)
+                if not data:
+                    return
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        waiting.append(event.stream_id)
+                if len(waiting) >= self.streams:
+                    for stream_id in waiting:
+                        headers = [(":status", "200"), ("content-type", "text/plain")]
+                        conn.send_headers(stream_id, headers)
+                        conn.send_data(stream_id, b"yay!", end_stream=True)
+                    waiting = []
+                sock.sendall(conn.data_to_send())
+
+
+@pytest.fixture
+def h2_server():
+    if httpx is None or h2 is None:
+        pytest.skip("needs httpx[http2]")
+    server = H2Server(streams=8)
+    yield server
+    server.close()
+
+
+def test_httpx_multiplexes_over_http2(h2_server):
+    settings = transport.TransportSettings(
+        base_url=f"http://127.0.0.1:{h2_server.port}",
+        api_version="3.1",
+        headers=None,
+        verify_ssl=False,
+    )
+    client = httpx.Client(http1=False, http2=True)
+    test = httpx_transport.HttpxTransport(settings, client)
+    events: List[instrumentation.RequestEvent] = []
+    test.instrumentation.subscribe(events.append)
+
+    def get(_: int) -> transport.Response:
+        return test.request(transport.HttpMethod.GET, "/me", timeout=(5.0, 5.0))
+
+    with cf.ThreadPoolExecutor(h2_server.streams) as pool:
+        resps = list(pool.map(get, range(h2_server.streams)))
+    client.close()
+
+    # the server only answers once every request is in flight, and all of
+    # them share the one connection
+    assert resps == [transport.Response(ok=True, value="yay!")] * h2_server.streams
+    assert h2_server.connections == 1
+    assert {event.http_version for event in events} == {"HTTP/2"}
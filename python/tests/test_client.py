@@ -0,0 +1,153 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import threading
+
+import pytest  # type: ignore
+
+from looker_sdk import client
+from looker_sdk import error
+from looker_sdk.rtl import api_settings
+from looker_sdk.rtl import circuit_breaker
+from looker_sdk.rtl import hedging
+from looker_sdk.rtl import requests_transport
+from looker_sdk.rtl import urllib3_transport
+
+INI = """
+[EU]
+base_url=https://eu.looker.com:19999
+api_version=3.1
+
+[US]
+base_url=https://us.looker.com:19999
+api_version=3.1
+"""
+
+
+@pytest.fixture(name="pool")  # type: ignore
+def client_pool(tmp_path):
+    ini = tmp_path / "looker.ini"
+    ini.write_text(INI)
+    return client.LookerClientPool(str(ini))
+
+
+def base_url(sdk):
+    return sdk.auth.settings.base_url
+
+
+def test_pool_clients_per_section(pool):
+    assert list(pool) == ["EU", "US"]
+    assert len(pool) == 2
+    assert base_url(pool["EU"]) == "https://eu.looker.com:19999"
+    assert base_url(pool["US"]) == "https://us.looker.com:19999"
+    assert pool["EU"].auth is not pool["US"].auth
+    assert pool["EU"].transport.session is not pool["US"].transport.session
+
+
+def test_pool_shares_connections_and_instrumentation(pool):
+    for sdk in pool.values():
+        assert sdk.transport.instrumentation is pool.instrumentation
+        adapter = sdk.transport.session.get_adapter(base_url(sdk))
+        assert adapter is pool.adapter
+
+
+def test_pool_other_transports(tmp_path):
+    ini = tmp_path / "looker.ini"
+    ini.write_text(INI.replace("[US]\n", "[US]\ntransport=urllib3\n"))
+    pool = client.LookerClientPool(str(ini))
+    assert isinstance(pool["EU"].transport, requests_transport.RequestsTransport)
+    assert isinstance(pool["US"].transport, urllib3_transport.Urllib3Transport)
+    for sdk in pool.values():
+        assert sdk.transport.instrumentation is pool.instrumentation
+
+    ini.write_text(INI.replace("[US]\n", "[US]\ntransport=carrier-pigeon\n"))
+    with pytest.raises(error.SDKError):
+        client.LookerClientPool(str(ini))
+
+
+def test_pool_map_runs_in_parallel(pool):
+    # both calls must be running at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def call(sdk):
+        barrier.wait()
+        return base_url(sdk)
+
+    assert pool.map(call) == {
+        "EU": "https://eu.looker.com:19999",
+        "US": "https://us.looker.com:19999",
+    }
+    assert pool.map(base_url, keys=["US"]) == {"US": "https://us.looker.com:19999"}
+
+
+def test_pool_map_exceptions(pool):
+    def call(sdk):
+        if base_url(sdk).startswith("https://eu"):
+            raise error.SDKError("eu is down")
+        return 1
+
+    with pytest.raises(error.SDKError):
+        pool.map(call)
+    results = pool.map(call, return_exceptions=True)
+    assert isinstance(results["EU"], error.SDKError)
+    assert results["US"] == 1
+
+
+def test_pool_merge(pool):
+    assert pool.merge(lambda sdk: [base_url(sdk)[8:10]] * 2) == [
+        "eu",
+        "eu",
+        "us",
+        "us",
+    ]
+
+
+def test_configure_transport(tmp_path, monkeypatch):
+    ini = tmp_path / "looker.ini"
+    ini.write_text(INI)
+    settings = api_settings.ApiSettings.configure(str(ini), "EU")
+    assert settings.transport == "requests"
+    transport = client.configure_transport(settings)
+    assert isinstance(transport, requests_transport.RequestsTransport)
+
+    monkeypatch.setenv("LOOKERSDK_TRANSPORT", "carrier-pigeon")
+    settings = api_settings.ApiSettings.configure(str(ini), "EU")
+    with pytest.raises(error.SDKError):
+        client.configure_transport(settings)
+
+
+def test_configure_transport_circuit_breaker(tmp_path):
+    ini = tmp_path / "looker.ini"
+    ini.write_text(INI.replace("[EU]\n", "[EU]\ncircuit_breaker=true\n"))
+    settings = api_settings.ApiSettings.configure(str(ini), "EU")
+    transport = client.configure_transport(settings)
+    assert isinstance(transport, circuit_breaker.CircuitBreakerTransport)
+    assert isinstance(transport.transport, requests_transport.RequestsTransport)
+
+
+def test_configure_transport_hedge(tmp_path):
+    ini = tmp_path / "looker.ini"
+    ini.write_text(INI.replace("[EU]\n", "[EU]\nhedge=true\ncircuit_breaker=true\n"))
+    settings = api_settings.ApiSettings.configure(str(ini), "EU")
+    transport = client.configure_transport(settings)
+    assert isinstance(transport, circuit_breaker.CircuitBreakerTransport)
+    assert isinstance(transport.transport, hedging.HedgingTransport)
@@ -0,0 +1,177 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+
+from looker_sdk import content
+from looker_sdk.sdk import models
+from tests.conftest import FakeSDK
+
+
+def source():
+    sdk = FakeSDK()
+    orders = models.Query(id=1, model="thelook", view="orders", client_id="abc")
+    sdk.looks = {
+        1: models.Look(id=1, title="Orders", space_id="1", query=orders),
+        2: models.Look(id=2, title="Users", space_id="2", query=orders),
+    }
+    sdk.dashboards = {
+        "1": models.Dashboard(
+            id="1",
+            title="Sales",
+            space_id="1",
+            dashboard_elements=[
+                models.DashboardElement(id="1", look_id=2),
+                models.DashboardElement(id="2", title="Tile", query=orders),
+            ],
+            dashboard_filters=[
+                models.DashboardFilter(id="1", name="date", title="Date", type="date")
+            ],
+        )
+    }
+    return sdk
+
+
+def changes(sdk):
+    return [call for call in sdk.calls if not call[0].startswith("search")]
+
+
+def test_export_import(tmp_path):
+    path = str(tmp_path / "content.ndjson")
+    report = content.Exporter(source(), per_page=1).run(path)
+    assert (report.done, report.skipped, report.failed) == (3, 0, [])
+    lines = [json.loads(line) for line in open(path)]
+    # looks come first, in the order they were fetched
+    assert [line["kind"] for line in lines] == ["look", "look", "dashboard"]
+    assert sorted(line["id"] for line in lines[:2]) == ["1", "2"]
+
+    target = FakeSDK()
+    report = content.Importer(target, folder_ids={"2": "20"}).run(path)
+    assert (report.done, report.skipped, report.failed) == (3, 0, [])
+    assert len(target.queries) == 3
+    assert all(query.client_id is None for query in target.queries.values())
+    assert sorted((look.title, look.space_id) for look in target.looks.values()) == [
+        ("Orders", "1"),
+        ("Users", "20"),
+    ]
+    new_ids = {look.title: look.id for look in target.looks.values()}
+    [dashboard] = target.dashboards.values()
+    assert dashboard.title == "Sales"
+    assert [(f.dashboard_id, f.name) for f in dashboard.dashboard_filters] == [
+        (dashboard.id, "date")
+    ]
+    elements = dashboard.dashboard_elements
+    assert [(e.dashboard_id, e.look_id) for e in elements] == [
+        (dashboard.id, new_ids["Users"]),
+        (dashboard.id, None),
+    ]
+    assert elements[0].query_id is None
+    assert elements[1].query_id in target.queries
+
+
+def test_export_resume(tmp_path):
+    path = str(tmp_path / "content.ndjson")
+    sdk = source()
+    sdk.fail.add((2,))
+    report = content.Exporter(sdk).run(path)
+    assert report.done == 2
+    assert [(f.kind, f.id) for f in report.failed] == [("look", "2")]
+    with open(path, "a") as export:
+        export.write('{"kind": "look", "id": "2", "da')
+
+    sdk.fail.clear()
+    sdk.calls = []
+    report = content.Exporter(sdk).run(path, resume=True)
+    assert (report.done, report.skipped, report.failed) == (1, 2, [])
+    assert changes(sdk) == [("look", 2)]
+    lines = [json.loads(line) for line in open(path)]
+    assert sorted((line["kind"], line["id"]) for line in lines) == [
+        ("dashboard", "1"),
+        ("look", "1"),
+        ("look", "2"),
+    ]
+
+
+def test_export_records_unexpected_errors(tmp_path, monkeypatch):
+    sdk = source()
+
+    def look(look_id, fields=None):
+        raise ValueError(f"bad look {look_id}")
+
+    monkeypatch.setattr(sdk, "look", look)
+    report = content.Exporter(sdk).run(str(tmp_path / "content.ndjson"))
+    assert report.done == 1
+    assert sorted(report.failed, key=lambda f: f.id) == [
+        content.Failure(kind="look", id="1", error="ValueError('bad look 1')"),
+        content.Failure(kind="look", id="2", error="ValueError('bad look 2')"),
+    ]
+
+
+def test_import_resume(tmp_path):
+    path = str(tmp_path / "content.ndjson")
+    content.Exporter(source()).run(path)
+    target = FakeSDK()
+    target.fail.add("create_dashboard_element")
+    report = content.Importer(target).run(path)
+    assert report.done == 2
+    assert [(f.kind, f.id) for f in report.failed] == [("dashboard", "1")]
+    assert "delete_dashboard" in [call[0] for call in target.calls]
+    assert target.dashboards == {}
+
+    target.fail.clear()
+    target.calls = []
+    report = content.Importer(target).run(path)
+    assert (report.done, report.skipped, report.failed) == (1, 2, [])
+    assert [call[0] for call in target.calls] == [
+        "create_dashboard",
+        "create_dashboard_filter",
+        "create_dashboard_element",
+        "create_query",
+        "create_dashboard_element",
+    ]
+
+
+def test_import_keeps_the_error_when_cleanup_fails(tmp_path):
+    path = str(tmp_path / "content.ndjson")
+    content.Exporter(source()).run(path)
+    target = FakeSDK()
+    target.fail.update(["create_dashboard_filter", "delete_dashboard"])
+    report = content.Importer(target).run(path)
+    assert report.failed == [
+        content.Failure(
+            kind="dashboard", id="1", error="create_dashboard_filter failed"
+        )
+    ]
+
+
+def test_import_dashboard_without_look(tmp_path):
+    path = str(tmp_path / "content.ndjson")
+    sdk = source()
+    del sdk.looks[2]
+    content.Exporter(sdk).run(path)
+    target = FakeSDK()
+    report = content.Importer(target).run(path)
+    assert report.done == 1
+    assert report.failed == [
+        content.Failure(kind="dashboard", id="1", error="look 2 was not imported")
+    ]
+    assert "create_dashboard" not in [call[0] for call in target.calls]
@@ -0,0 +1,103 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Import time of the generated SDK, measured with python -X importtime
+"""
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+MODELS = "looker_sdk.sdk.models"
+# so that looker_sdk imports from this checkout wherever pytest runs
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code: str) -> Tuple[Dict[str, Tuple[int, int]], List[str]]:
+    """Run code in a fresh interpreter.
+
+    Returns the (self, cumulative) import time in microseconds of each
+    module imported by the import system and the model modules loaded at
+    exit. Modules loaded with importlib are missing from the former, their
+    time is part of the self time of the module loading them.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"{code}\nimport sys\nprint(*sys.modules, sep='\\n')",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+        cwd=ROOT,
+    )
+    times: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line.split("|")
+        times[name.strip()] = (int(own.split(":")[1]), int(cumulative))
+    models = [name for name in result.stdout.split() if name.startswith(f"{MODELS}.")]
+    return times, models
+
+
+def test_import_does_not_load_models():
+    times, models = run("import looker_sdk")
+    assert MODELS in times
+    assert models == []
+
+
+def test_models_package_is_cheaper_than_its_models():
+    """What import looker_sdk pays for the models package itself and its
+    converter table, against loading every model as importing it used to.
+    """
+    times, _ = run(
+        f"""import looker_sdk
+import sys
+import time
+start = time.perf_counter()
+import {MODELS} as models
+for name in dir(models):
+    getattr(models, name)
+us = int((time.perf_counter() - start) * 1e6)
+# in the format of -X importtime, for run() to parse
+print(f"import time: 0 | {{us}} | every model", file=sys.stderr)"""
+    )
+    package = times[MODELS][0] + times["looker_sdk.sdk.converters"][1]
+    assert package < times["every model"][1]
+
+
+def test_setup_loads_only_auth_models(tmp_path):
+    ini = tmp_path / "looker.ini"
+    ini.write_text("[Looker]\nbase_url=https://localhost:19999\n")
+    _, models = run(f"import looker_sdk.client\nlooker_sdk.client.setup({str(ini)!r})")
+    assert len(models) == 1
+
+
+def test_model_access_loads_one_module():
+    _, models = run(f"from {MODELS} import Dashboard")
+    assert len(models) == 1
@@ -0,0 +1,155 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import concurrent.futures as cf
+import datetime
+
+import pytest  # type: ignore
+
+from looker_sdk import mirror
+from looker_sdk.sdk import models
+from tests.conftest import FakeSDK
+
+NOW = datetime.datetime(2020, 1, 10, tzinfo=datetime.timezone.utc)
+
+ORDERS = models.Query(id=1, model="thelook", view="orders")
+USERS = models.Query(id=2, model="thelook", view="users")
+
+
+def look(**kwargs):
+    kwargs.setdefault("space_id", "1")
+    kwargs.setdefault("user_id", 1)
+    kwargs.setdefault("updated_at", NOW)
+    return models.Look(**kwargs)
+
+
+def dashboard(**kwargs):
+    kwargs.setdefault("space_id", "1")
+    kwargs.setdefault("user_id", 1)
+    return models.Dashboard(**kwargs)
+
+
+@pytest.fixture
+def sdk():
+    sdk = FakeSDK()
+    sdk.users = {
+        i: models.User(id=i, email=f"user{i}@example.com", is_disabled=False)
+        for i in range(1, 8)
+    }
+    sdk.spaces = {
+        "1": models.Space(id="1", name="Shared"),
+        "2": models.Space(id="2", name="Sales", parent_id="1"),
+    }
+    sdk.looks = {
+        1: look(id=1, title="Sales by month", query=ORDERS),
+        2: look(id=2, title="sales by region", query=ORDERS, space_id="2"),
+        3: look(id=3, title="New users", query=USERS),
+    }
+    sdk.dashboards = {
+        "1": dashboard(
+            id="1",
+            title="Sales",
+            dashboard_elements=[models.DashboardElement(id="1", look_id=2)],
+        ),
+        "2": dashboard(
+            id="2",
+            title="Users",
+            dashboard_elements=[
+                models.DashboardElement(id="2", query=USERS),
+                models.DashboardElement(id="3"),
+            ],
+        ),
+    }
+    return sdk
+
+
+@pytest.fixture
+def local(sdk, tmp_path):
+    local = mirror.Mirror(sdk, str(tmp_path / "mirror.db"), per_page=2)
+    local.sync()
+    yield local
+    local.close()
+
+
+def ids(rows):
+    return [row["id"] for row in rows]
+
+
+def test_sync(local):
+    assert local.user_by_email("USER3@example.com")["id"] == 3
+    assert local.look(1)["title"] == "Sales by month"
+    assert local.dashboard("2")["title"] == "Users"
+    assert len(local._rows("SELECT * FROM users")) == 7
+
+
+def test_find_by_title_prefix(local):
+    assert ids(local.find_looks("sales")) == [1, 2]
+    assert ids(local.find_looks("New")) == [3]
+    assert ids(local.find_dashboards("S")) == ["1"]
+    assert local.find_looks("x") == []
+
+
+def test_explore_usage(local):
+    assert ids(local.looks_using_explore("thelook", "orders")) == [1, 2]
+    # via look 2, and via a tile query
+    assert ids(local.dashboards_using_explore("thelook", "orders")) == ["1"]
+    assert ids(local.dashboards_using_explore("thelook", "users")) == ["2"]
+
+
+def test_folder_contents(local):
+    contents = local.folder_contents("1")
+    assert ids(contents["folders"]) == ["2"]
+    assert ids(contents["looks"]) == [1, 3]
+    assert ids(contents["dashboards"]) == ["1", "2"]
+
+
+def test_refresh(sdk, local):
+    later = NOW + datetime.timedelta(hours=1)
+    sdk.looks[1].title = "Revenue by month"
+    sdk.looks[1].updated_at = later
+    sdk.looks[4] = look(id=4, title="Churn", query=USERS, updated_at=later)
+    sdk.looks[3].deleted_at = datetime.datetime.now(datetime.timezone.utc)
+    del sdk.users[7]
+    sdk.dashboards["1"].title = "Revenue"
+    sdk.calls = []
+
+    local.refresh()
+    assert ids(local.find_looks("")) == [4, 1, 2]
+    assert local.look(1)["title"] == "Revenue by month"
+    assert local.look(3) is None
+    assert local.user(7) is None
+    assert local.dashboard("1")["title"] == "Revenue"
+    # stopped at the first page with looks older than the last refresh
+    assert sdk.calls.count(("search_looks", "updated_at desc", 1)) == 1
+    assert ("search_looks", "updated_at desc", 3) not in sdk.calls
+
+
+def test_refresh_without_sync(sdk, tmp_path):
+    local = mirror.Mirror(sdk, str(tmp_path / "mirror.db"))
+    local.refresh()
+    assert ids(local.find_looks("")) == [3, 1, 2]
+
+
+def test_reads_from_threads(local):
+    with cf.ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: ids(local.find_looks("sales")), range(8)))
+    assert results == [[1, 2]] * 8
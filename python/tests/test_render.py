@@ -0,0 +1,129 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest  # type: ignore
+
+from looker_sdk import error
+from looker_sdk import render
+from tests.conftest import FakeSDK
+
+
+def fake_sdk(polls=2, status=render.SUCCESS, download_error=None):
+    sdk = FakeSDK()
+    sdk.render_polls = polls
+    sdk.render_status = status
+    sdk.download_error = download_error
+    return sdk
+
+
+@pytest.fixture(name="engine")  # type: ignore
+def render_engine():
+    def make(sdk, **kwargs):
+        kwargs.setdefault("poll_interval", 0.001)
+        kwargs.setdefault("max_poll_interval", 0.005)
+        return render.RenderEngine(sdk, **kwargs)
+
+    return make
+
+
+def test_run_writes_results(engine, tmp_path):
+    sdk = fake_sdk(polls=3)
+    jobs = [
+        render.RenderJob(
+            path=str(tmp_path / "d.pdf"),
+            dashboard_id=1,
+            options={"pdf_landscape": True},
+        ),
+        render.RenderJob(path=str(tmp_path / "l.png"), look_id=2, result_format="png"),
+        render.RenderJob(path=str(tmp_path / "q.jpg"), query_id=3, result_format="jpg"),
+    ]
+    results = engine(sdk, concurrency=2).run(jobs)
+
+    assert [r.job for r in results] == jobs
+    for result in results:
+        assert result.ok, result.error
+        assert result.polls == 3
+        content = open(result.job.path, "rb").read()
+        assert content.startswith(b"%PDF-")
+        assert result.size == len(content)
+        assert result.render_seconds >= 0
+        assert result.download_seconds >= 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["d.pdf", "l.png", "q.jpg"]
+    assert ("create_dashboard_render_task", 1, None, True) in sdk.calls
+    assert sdk.render_tasks[results[1].task_id].result_format == "png"
+
+
+def test_run_failed_task(engine, tmp_path):
+    path = tmp_path / "d.pdf"
+    result = engine(fake_sdk(polls=1, status=render.FAILURE)).run(
+        [render.RenderJob(path=str(path), dashboard_id=1)]
+    )[0]
+    assert not result.ok
+    assert result.error == "render failed"
+    assert not path.exists()
+
+
+def test_run_timeout(engine, tmp_path):
+    result = engine(fake_sdk(polls=1000), timeout=0.02).run(
+        [render.RenderJob(path=str(tmp_path / "d.pdf"), dashboard_id=1)]
+    )[0]
+    assert not result.ok
+    assert result.error.startswith("timed out")
+    assert 0 < result.polls < 1000
+
+
+def test_run_nothing_to_render(engine, tmp_path):
+    result = engine(fake_sdk()).run([render.RenderJob(path=str(tmp_path / "x"))])[0]
+    assert not result.ok
+    assert result.task_id is None
+    assert "Nothing to render" in result.error
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "exc, message",
+    [
+        (error.SDKError("connection reset"), "connection reset"),
+        (ValueError("bad chunk"), "ValueError('bad chunk')"),
+    ],
+)
+def test_run_failed_download(engine, tmp_path, exc, message):
+    result = engine(fake_sdk(polls=1, download_error=exc)).run(
+        [render.RenderJob(path=str(tmp_path / "d.pdf"), dashboard_id=1)]
+    )[0]
+    assert not result.ok
+    assert result.error == message
+    assert result.finished is not None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_run_unexpected_error(engine, tmp_path):
+    sdk = fake_sdk(polls=1)
+    sdk.create_dashboard_render_task = lambda **kwargs: 1 / 0
+    failed, rendered = engine(sdk).run(
+        [
+            render.RenderJob(path=str(tmp_path / "d.pdf"), dashboard_id=1),
+            render.RenderJob(path=str(tmp_path / "l.pdf"), look_id=2),
+        ]
+    )
+    assert not failed.ok
+    assert failed.error.startswith("ZeroDivisionError")
+    assert rendered.ok
@@ -0,0 +1,144 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2019 Looker Data Sciences, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from looker_sdk import sync
+from looker_sdk.sdk import models
+from tests.conftest import FakeSDK
+
+
+def fake_sdk():
+    sdk = FakeSDK()
+    sdk.users = {
+        1: models.User(id=1, email="ada@example.com", first_name="Ada"),
+        2: models.User(id=2, email="alan@example.com", group_ids=[10]),
+    }
+    sdk.groups = {10: models.Group(id=10, name="Admins")}
+    sdk.spaces = {"1": models.Space(id="1", name="Shared")}
+    return sdk
+
+
+DESIRED = sync.DesiredState(
+    user_attributes=[sync.UserAttributeSpec(name="region", label="Region")],
+    groups=[sync.GroupSpec(name="Admins"), sync.GroupSpec(name="Sales")],
+    folders=[sync.FolderSpec(path="Shared/Sales/EMEA")],
+    users=[
+        sync.UserSpec(email="Ada@example.com", first_name="Ada", groups=["Admins"]),
+        sync.UserSpec(
+            email="grace@example.com",
+            first_name="Grace",
+            groups=["Sales"],
+            attributes={"region": "EMEA"},
+        ),
+    ],
+)
+
+
+def test_plan():
+    engine = sync.SyncEngine(fake_sdk())
+    changes = engine.plan(DESIRED, engine.load(DESIRED))
+    assert [(c.step, c.kind, c.action, c.key, c.target) for c in changes] == [
+        (0, "user_attribute", "create", "region", None),
+        (0, "group", "create", "Sales", None),
+        (1, "folder", "create", "Shared/Sales", None),
+        (2, "folder", "create", "Shared/Sales/EMEA", None),
+        (3, "user", "create", "grace@example.com", None),
+        (4, "membership", "add", "Ada@example.com", "Admins"),
+        (4, "membership", "add", "grace@example.com", "Sales"),
+        (4, "user_attribute_value", "set", "grace@example.com", "region"),
+    ]
+
+
+def test_sync_applies_in_order_and_converges():
+    sdk = fake_sdk()
+    changes = sync.SyncEngine(sdk, per_page=1).sync(DESIRED)
+    assert all(change.ok for change in changes)
+    grace = next(u for u in sdk.users.values() if u.email == "grace@example.com")
+    sales = next(g for g in sdk.groups.values() if g.name == "Sales")
+    assert grace.group_ids == [sales.id]
+    assert sdk.user_attribute_values[grace.id] == {"region": "EMEA"}
+    emea = next(s for s in sdk.spaces.values() if s.name == "EMEA")
+    assert sdk.spaces[emea.parent_id].name == "Sales"
+
+    sdk.calls = []
+    assert sync.SyncEngine(sdk, per_page=1).sync(DESIRED) == []
+    assert sdk.calls == []
+
+
+def test_sync_updates_only_differences():
+    sdk = fake_sdk()
+    sync.SyncEngine(sdk).sync(DESIRED)
+    sdk.calls = []
+    desired = sync.DesiredState(
+        users=[sync.UserSpec(email="ada@example.com", first_name="Augusta")]
+    )
+    changes = sync.SyncEngine(sdk).sync(desired)
+    assert [(c.kind, c.action, c.fields) for c in changes] == [
+        ("user", "update", {"first_name": "Augusta"})
+    ]
+    assert sdk.calls == [("update_user", 1)]
+
+
+def test_dry_run():
+    sdk = fake_sdk()
+    assert sync.SyncEngine(sdk).sync(DESIRED, dry_run=True)
+    assert sdk.calls == []
+
+
+def test_prune():
+    sdk = fake_sdk()
+    desired = sync.DesiredState(groups=[sync.GroupSpec(name="Admins")])
+    changes = sync.SyncEngine(sdk).sync(desired)
+    assert changes == []
+    changes = sync.SyncEngine(sdk, prune=True).sync(desired)
+    assert [(c.action, c.key, c.target, c.ok) for c in changes] == [
+        ("remove", "alan@example.com", "Admins", True)
+    ]
+    assert sdk.users[2].group_ids == []
+
+
+def test_failed_dependency():
+    sdk = fake_sdk()
+    sdk.fail.add("create_group")
+    changes = sync.SyncEngine(sdk).sync(DESIRED)
+    failed = {(c.kind, c.key): c.error for c in changes if not c.ok}
+    assert failed == {
+        ("group", "Sales"): "create_group failed",
+        ("membership", "grace@example.com"): "group Sales does not exist",
+    }
+
+
+def test_failed_credentials_delete_the_user():
+    sdk = fake_sdk()
+    sdk.fail.add("create_user_credentials_email")
+    desired = sync.DesiredState(
+        users=[sync.UserSpec(email="grace@example.com", first_name="Grace")]
+    )
+    changes = sync.SyncEngine(sdk).sync(desired)
+    assert [(c.kind, c.ok, c.error) for c in changes] == [
+        ("user", False, "create_user_credentials_email failed")
+    ]
+    assert [call[0] for call in sdk.calls] == [
+        "create_user",
+        "create_user_credentials_email",
+        "delete_user",
+    ]
+    assert sorted(sdk.users) == [1, 2]
@@ -251,7 +251,7 @@ export abstract class CodeGen implements ICodeGen {
   // Reformat source files after generation
   reformat() {
     const result: string[] = []
-    for (const name of ['sdk/methods', 'sdk/models']) {
+    for (const name of ['sdk/methods', 'sdk/models', 'sdk/models/__init__']) {
       const sourceFile = this.fileName(name)
       const output = this.reformatFile(sourceFile)
       if (output) {
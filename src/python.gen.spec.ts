@@ -24,6 +24,7 @@
 
 import * as Models from './sdkModels'
 import { PythonGen } from './python.gen'
+import { TypeGenerator } from './sdkGenerator'
 
 const apiModel = Models.ApiModel.fromFile('./Looker.3.1.oas.json', './Looker.3.1.json')
 
@@ -102,17 +103,47 @@ describe('python generator', () => {
     it('add_group_group', () => {
       const method = apiModel.methods['add_group_group']
       const args = gen.httpArgs('', method).trim()
-      expect(args).toEqual('models.Group, body=body')
+      expect(args).toEqual('models.Group, body=body, method_name="add_group_group", endpoint="/groups/{group_id}/groups"')
     })
     it('create_query', () => {
       const method = apiModel.methods['create_query']
       const args = gen.httpArgs('', method).trim()
-      expect(args).toEqual('models.Query, query_params={"fields": fields}, body=body')
+      expect(args).toEqual('models.Query, query_params=_create_query_query(fields), body=body, method_name="create_query", endpoint="/queries"')
     })
     it('create_dashboard', () => {
       const method = apiModel.methods['create_dashboard']
       const args = gen.httpArgs('', method).trim()
-      expect(args).toEqual('models.Dashboard, body=body')
+      expect(args).toEqual('models.Dashboard, body=body, method_name="create_dashboard", endpoint="/dashboards"')
+    })
+  })
+
+  describe('query encoders', () => {
+    it('encoder per parameter type', () => {
+      const method = apiModel.methods['active_themes']
+      expect(gen.queryEncoder(method)).toEqual('_active_themes_query')
+      expect(gen.queryEncoders['_active_themes_query']).toEqual(
+        '_active_themes_query = api_methods.QueryEncoder(name=str, ts=api_methods.encode_datetime, fields=str)')
+    })
+  })
+
+  describe('binary responses', () => {
+    it('binary media types', () => {
+      expect(gen.isBinaryMediaType('image/png')).toEqual(true)
+      expect(gen.isBinaryMediaType('application/pdf')).toEqual(true)
+      expect(gen.isBinaryMediaType('application/json')).toEqual(false)
+      expect(gen.isBinaryMediaType('text/plain')).toEqual(false)
+    })
+    it('render results are bytes', () => {
+      const method = apiModel.methods['render_task_results']
+      expect(gen.returnType(method)).toEqual('bytes')
+      expect(gen.httpArgs('', method)).toEqual(
+        'bytes, output=output, method_name="render_task_results", endpoint="/render_tasks/{render_task_id}/results"')
+    })
+    it('render results may be spooled', () => {
+      const method = apiModel.methods['render_task_results']
+      expect(gen.declaredReturnType(method)).toEqual('Union[bytes, spool.SpooledBody]')
+      expect(gen.httpCall('', method).split('\n')[1]).toEqual(
+        'assert isinstance(response, (bytes, spool.SpooledBody))')
     })
   })
 
@@ -134,7 +165,7 @@ def all_datagroups(
     it('assert response is model add_group_group', () => {
       const method = apiModel.methods['add_group_group']
       const expected =
-        `response = self.post(f"/groups/{group_id}/groups", models.Group, body=body)
+        `response = self.post(f"/groups/{group_id}/groups", models.Group, body=body, method_name="add_group_group", endpoint="/groups/{group_id}/groups")
 assert isinstance(response, models.Group)
 return response`
       const actual = gen.httpCall(indent, method)
@@ -143,7 +174,7 @@ return response`
     it('assert response is None delete_group_from_group', () => {
       const method = apiModel.methods['delete_group_from_group']
       const expected =
-        `response = self.delete(f"/groups/{group_id}/groups/{deleting_group_id}")
+        `response = self.delete(f"/groups/{group_id}/groups/{deleting_group_id}", method_name="delete_group_from_group", endpoint="/groups/{group_id}/groups/{deleting_group_id}")
 assert response is None
 return response`
       const actual = gen.httpCall(indent, method)
@@ -152,7 +183,7 @@ return response`
     it('assert response is list active_themes', () => {
       const method = apiModel.methods['active_themes']
       const expected =
-        `response = self.get(f"/themes/active", Sequence[models.Theme], query_params={"name": name, "ts": ts, "fields": fields})
+        `response = self.get(f"/themes/active", Sequence[models.Theme], query_params=_active_themes_query(name, ts, fields), method_name="active_themes", endpoint="/themes/active")
 assert isinstance(response, list)
 return response`
       const actual = gen.httpCall(indent, method)
@@ -161,7 +192,7 @@ return response`
     it('assert response is dict query_task_results', () => {
       const method = apiModel.methods['query_task_results']
       const expected =
-        `response = self.get(f"/query_tasks/{query_task_id}/results", MutableMapping[str, str])
+        `response = self.get(f"/query_tasks/{query_task_id}/results", MutableMapping[str, str], method_name="query_task_results", endpoint="/query_tasks/{query_task_id}/results")
 assert isinstance(response, dict)
 return response`
       const actual = gen.httpCall(indent, method)
@@ -240,4 +271,30 @@ class WriteCreateQueryTask(model.Model):
         self.dashboard_id = dashboard_id`)
     })
   })
+
+  describe('models package', () => {
+    it('module names from tags', () => {
+      expect(gen.modelsModuleName('LookmlModel')).toEqual('lookml_model')
+      expect(gen.modelsModuleName('ApiAuth')).toEqual('api_auth')
+      expect(gen.modelsModuleName('Query')).toEqual('query')
+    })
+    it('types are assigned to the module of the first method using them', () => {
+      const typeModules = new TypeGenerator(apiModel, gen).typeModules()
+      expect(typeModules['AccessToken']).toEqual('api_auth')
+      expect(typeModules['Query']).toEqual('query')
+    })
+    it('cross module references are type checking imports', () => {
+      const actual = gen.typeCheckingImports(indent, ['Query', 'LookmlModel'],
+        {Query: 'query', LookmlModel: 'lookml_model'})
+      expect(actual).toEqual(`
+if TYPE_CHECKING:
+    from looker_sdk.sdk.models.lookml_model import (  # noqa: F401
+        LookmlModel,
+    )
+    from looker_sdk.sdk.models.query import (  # noqa: F401
+        Query,
+    )
+`)
+    })
+  })
 })
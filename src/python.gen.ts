@@ -108,56 +108,156 @@ export class PythonGen extends CodeGen {
     'uri': {name: 'str', default: this.nullStr},
     'datetime': {name: 'datetime.datetime', default: this.nullStr}
   }
-  // cattrs [un]structure hooks for model [de]serialization
-  hooks: string[] = []
-  structure_hook: string = 'structure_hook'
 
   // @ts-ignore
   methodsPrologue = (indent: string) => `
 # ${warnEditing}
+# Annotations stay unevaluated so models are only imported when used
+from __future__ import annotations
+
 import datetime
-from typing import MutableMapping, Optional, Sequence
+from typing import MutableMapping, Optional, Sequence, Union
 
 from ${this.packagePath}.sdk import models
 from ${this.packagePath}.rtl import api_methods
+from ${this.packagePath}.rtl import spool
 
 
 class ${this.packageName}(api_methods.APIMethods):
 `
 
   // @ts-ignore
-  methodsEpilogue = (indent: string) => ''
+  methodsEpilogue = (indent: string) => {
+    const names = Object.keys(this.queryEncoders).sort()
+    if (names.length === 0) return ''
+    return `
+
+# Query parameter encoders of the methods above, built once at import
+${names.map(name => this.queryEncoders[name]).join('\n')}
+`
+  }
+
+  // query parameter encoder declarations by encoder name
+  queryEncoders: Record<string, string> = {}
 
   // @ts-ignore
   modelsPrologue = (indent: string) => `
 # ${warnEditing}
 import datetime
-from typing import MutableMapping, Optional, Sequence
+from typing import MutableMapping, Optional, Sequence, TYPE_CHECKING
 
 import attr
-import cattr
+
+from ${this.packagePath}.rtl import model
+`
+
+  // @ts-ignore
+  modelsEpilogue = (indent: string) => ''
+
+  modelsModuleName(tag: string) {
+    return tag
+      .replace(/([a-z0-9])([A-Z])/g, '$1_$2')
+      .replace(/\W+/g, '_')
+      .toLowerCase()
+  }
+
+  // Imports of the types from other modules, only evaluated by type checkers
+  typeCheckingImports(indent: string, names: string[], typeModules: Record<string, string>) {
+    const modules: Record<string, string[]> = {}
+    names.forEach(name => {
+      const module = typeModules[name]
+      modules[module] = (modules[module] || []).concat(name)
+    })
+    const bump = this.bumper(indent)
+    const imports = Object.keys(modules).sort().map(module =>
+      `${bump}from ${this.packagePath}.sdk.models.${module} import (  # noqa: F401\n` +
+      modules[module].sort().map(name => `${this.bumper(bump)}${name},\n`).join('') +
+      `${bump})`
+    )
+    return `\n${indent}if TYPE_CHECKING:\n${imports.join('\n')}\n`
+  }
+
+  modelsModule(indent: string, types: IType[], typeModules: Record<string, string>) {
+    const module = typeModules[types[0].name]
+    const refs = new Set<string>()
+    types.forEach(type => Object.values(type.properties).forEach(prop => {
+      let ref = prop.type
+      while (ref.elementType) ref = ref.elementType
+      if (typeModules[ref.name] && typeModules[ref.name] !== module) refs.add(ref.name)
+    }))
+    return this.modelsPrologue(indent) +
+      (refs.size ? this.typeCheckingImports(indent, Array.from(refs), typeModules) : '') +
+      types.map(type => this.declareType(indent, type)).join('\n\n') +
+      '\n'
+  }
+
+  modelsIndex(indent: string, typeModules: Record<string, string>) {
+    const bump = this.bumper(indent)
+    const b2 = this.bumper(bump)
+    const names = Object.keys(typeModules).sort()
+    const table = names.map(name => `${b2}"${name}": "${typeModules[name]}",`)
+    return `
+# ${warnEditing}
+"""API models, each imported from its tag's module on first use
+"""
+from typing import TYPE_CHECKING
 
 from ${this.packagePath}.rtl import model
 from ${this.packagePath}.rtl import serialize as sr
+from ${this.packagePath}.sdk import converters
 
 EXPLICIT_NULL = model.EXPLICIT_NULL  # type: ignore
 DelimSequence = model.DelimSequence
-`
 
-  // @ts-ignore
-  modelsEpilogue = (indent: string) => `
+_models = model.LazyModels(
+${bump}globals(),  # type: ignore
+${bump}{
+${table.join('\n')}
+${bump}},
+)
+__getattr__ = _models.getattr
+__dir__ = _models.dir
+
+sr.converters.register(_models, converters.FIELDS)
+${this.typeCheckingImports(indent, names, typeModules)}`
+  }
+
+  // type of a field in converters.py: a scalar or model name, or a
+  // ("Sequence" | "MutableMapping", type) pair
+  converterType(type: IType): string {
+    if (type.elementType) {
+      const container = type instanceof HashType ? 'MutableMapping' : 'Sequence'
+      return `("${container}", ${this.converterType(type.elementType)})`
+    }
+    const mapped = this.pythonTypes[type.name]
+    return `"${mapped ? mapped.name : type.name}"`
+  }
 
-# The following cattrs structure hook registrations are a workaround
-# for https://github.com/Tinche/cattrs/pull/42 Once this issue is resolved
-# these calls will be removed.
+  modelsConverters(indent: string, types: IType[]) {
+    const bump = this.bumper(indent)
+    const b2 = this.bumper(bump)
+    const models = types.map(type => {
+      const fields = Object.values(type.properties).map(prop => {
+        const attr = this.pythonKeywords.includes(prop.name) ? `${prop.name}_` : prop.name
+        return `${b2}("${attr}", "${prop.name}", ${this.converterType(prop.type)}),`
+      })
+      return `${bump}"${type.name}": (\n${fields.join('\n')}\n${bump}),`
+    })
+    return `
+# ${warnEditing}
+"""Fields of each model as (attribute, json key, type), in declaration order
 
-import functools  # noqa:E402
-from typing import ForwardRef  # type: ignore  # noqa:E402
+serialize converts models with these instead of attrs reflection and eval.
+"""
+from typing import Dict, Sequence
 
-${this.structure_hook} = functools.partial(sr.structure_hook, globals())  # type: ignore
-${this.hooks.join('\n')}
-`
+from ${this.packagePath}.rtl import serialize as sr
 
+FIELDS: Dict[str, Sequence[sr.TField]] = {
+${models.join('\n')}
+}
+`
+  }
 
   // @ts-ignore
   argGroup(indent: string, args: Arg[]) {
@@ -197,14 +297,53 @@ ${this.hooks.join('\n')}
 
   // because Python has named default parameters, Request types are not required like
   // they are for Typescript
-  methodSignature(indent: string, method: IMethod) {
+  // media types of responses returned as bytes rather than str
+  isBinaryMediaType(mediaType: string) {
+    return /^(image|audio|video)\//.test(mediaType) ||
+      ['application/pdf', 'application/octet-stream', 'application/zip'].includes(mediaType)
+  }
+
+  // "bytes" if all of method's 200 responses are binary, "Union[str, bytes]"
+  // if only some are (e.g. run_look result_format=png), else undefined
+  binaryResponseType(method: IMethod) {
+    const ok = method.responses.filter(response => response.statusCode === 200)
+    const binary = ok.filter(response => this.isBinaryMediaType(response.mediaType))
+    if (binary.length === 0) return undefined
+    return binary.length === ok.length ? 'bytes' : 'Union[str, bytes]'
+  }
+
+  returnType(method: IMethod) {
     const type = this.typeMapMethods(method.type)
+    return this.binaryResponseType(method) || type.name
+  }
+
+  // text and binary bodies come back as a spool.SpooledBody when the
+  // transport spools large responses (spool_threshold), so they are
+  // declared and asserted as either
+  spooledTypes(method: IMethod) {
+    const type = this.returnType(method)
+    if (type === 'Union[str, bytes]') return ['str', 'bytes', 'spool.SpooledBody']
+    if (type === 'str' || type === 'bytes') return [type, 'spool.SpooledBody']
+    return undefined
+  }
+
+  declaredReturnType(method: IMethod) {
+    const spooled = this.spooledTypes(method)
+    return spooled ? `Union[${spooled.join(', ')}]` : this.returnType(method)
+  }
+
+  methodSignature(indent: string, method: IMethod) {
+    const type = this.declaredReturnType(method)
     const bump = this.bumper(indent)
     let params: string[] = []
     const args = method.allParams
     if (args && args.length > 0) method.allParams.forEach(p => params.push(this.declareParameter(bump, p)))
-    return this.commentHeader(indent, `${method.httpMethod} ${method.endpoint} -> ${type.name}`)
-      + `${indent}def ${method.name}(\n${bump}self${params.length > 0 ? ',\n' : ''}${params.join(this.paramDelimiter)}\n${indent}) -> ${type.name}:\n`
+    if (this.binaryResponseType(method)) {
+      params.push(`${bump}# Stream the response into this file or bytearray and return b""\n` +
+        `${bump}output: Optional[api_methods.TOutput] = ${this.nullStr}`)
+    }
+    return this.commentHeader(indent, `${method.httpMethod} ${method.endpoint} -> ${type}`)
+      + `${indent}def ${method.name}(\n${bump}self${params.length > 0 ? ',\n' : ''}${params.join(this.paramDelimiter)}\n${indent}) -> ${type}:\n`
   }
 
   declareParameter(indent: string, param: IParameter) {
@@ -267,12 +406,38 @@ ${this.hooks.join('\n')}
       result = this.argFill(result, `body=${method.bodyArg}`)
     }
     if (method.queryArgs.length) {
-      const queryParams = this.argGroup(indent, method.queryArgs)
-      result = this.argFill(result, `query_params=${queryParams}`)
+      const encoder = this.queryEncoder(method)
+      result = this.argFill(result, `query_params=${encoder}(${method.queryArgs.join(this.argDelimiter)})`)
     }
-    const type = this.typeMapMethods(method.type)
-    result = this.argFill(result, type.name)
-    return result
+    if (this.binaryResponseType(method)) {
+      result = this.argFill(result, 'output=output')
+    }
+    result = this.argFill(result, this.returnType(method))
+    // identifies the generated method and endpoint template to
+    // instrumentation and tracing
+    const meta = `method_name="${method.name}"${this.argDelimiter}endpoint="${method.endpoint}"`
+    return result ? `${result}${this.argDelimiter}${meta}` : meta
+  }
+
+  // Declares the api_methods.QueryEncoder for method's query parameters,
+  // picking each encoder from the parameter's type. Returns its name
+  queryEncoder(method: IMethod) {
+    const name = `_${method.name}_query`
+    const encoders = method.getParams('query').map(param => {
+      // sequences, delimited sequences, hashes and models are json
+      const mapped = param.type.elementType ? undefined : this.pythonTypes[param.type.name]
+      const scalars: Record<string, string> = {
+        'int': 'str',
+        'float': 'str',
+        'str': 'str',
+        'bool': 'api_methods.encode_bool',
+        'datetime.datetime': 'api_methods.encode_datetime',
+      }
+      const encode = (mapped && scalars[mapped.name]) || 'api_methods.encode_json'
+      return `${param.name}=${encode}`
+    })
+    this.queryEncoders[name] = `${name} = api_methods.QueryEncoder(${encoders.join(this.argDelimiter)})`
+    return name
   }
 
   httpCall(indent: string, method: IMethod) {
@@ -280,8 +445,11 @@ ${this.hooks.join('\n')}
     const args = this.httpArgs(bump, method)
     const methodCall = `${indent}response = ${this.it(method.httpMethod.toLowerCase())}`
     const callArgs = `f"${method.endpoint}"${args ? ', ' + args : ''}`
-    let assertTypeName = this.typeMapMethods(method.type).name
-    if (method.type instanceof ArrayType) {
+    let assertTypeName = this.returnType(method)
+    const spooled = this.spooledTypes(method)
+    if (spooled) {
+      assertTypeName = `(${spooled.join(', ')})`
+    } else if (method.type instanceof ArrayType) {
       assertTypeName = 'list'
     } else if (method.type instanceof HashType) {
       assertTypeName = 'dict'
@@ -334,10 +502,6 @@ ${this.hooks.join('\n')}
       attrsArgs += ', init=False'
     }
 
-    const forwardRef = `ForwardRef("${type.name}")`
-    this.hooks.push(
-      `cattr.register_structure_hook(\n${bump}${forwardRef},  # type: ignore\n${bump}${this.structure_hook}  # type:ignore\n)`
-    )
     return `\n` +
       `${indent}@attr.s(${attrsArgs})\n` +
       `${indent}class ${type.name}(model.Model):\n` +
@@ -68,8 +68,21 @@ import { IVersionInfo } from './codeGen'
         let output = sdk.render(gen.indentStr)
         fs.writeFileSync(gen.fileName('sdk/methods'), output)
         const types = new TypeGenerator(apiModel, gen)
-        output = types.render('')
-        fs.writeFileSync(gen.fileName('sdk/models'), output)
+        if (gen.modelsIndex) {
+          const modelsPath = `${sdkPath}/models`
+          if (!isFileSync(modelsPath)) fs.mkdirSync(modelsPath, {recursive: true})
+          const {index, modules} = types.renderModules('')
+          for (const [name, source] of Object.entries(modules)) {
+            fs.writeFileSync(gen.fileName(`sdk/models/${name}`), source)
+          }
+          fs.writeFileSync(gen.fileName('sdk/models/__init__'), index)
+          if (gen.modelsConverters) {
+            fs.writeFileSync(gen.fileName('sdk/converters'), gen.modelsConverters('', types.declaredTypes()))
+          }
+        } else {
+          output = types.render('')
+          fs.writeFileSync(gen.fileName('sdk/models'), output)
+        }
         const reformatted = gen.reformat()
         if (reformatted.length > 0) {
           success(`reformatted ${reformatted.join(',')}`)
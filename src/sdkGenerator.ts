@@ -101,8 +101,7 @@ export class SdkGenerator extends Generator<Models.IApiModel> {
 export class TypeGenerator extends Generator<Models.IApiModel> {
   render(indent: string) {
     let items: string[] = []
-    Object.values(this.model.sortedTypes())
-      .filter(type => !(type instanceof Models.IntrinsicType))
+    this.declaredTypes()
       .forEach(type => items.push(this.codeFormatter.declareType(indent, type)))
     const counts = this.typeTally(this.model.types)
     const tally = `${counts.total} API models: ${counts.standard} Spec, ${counts.request} Request, ${counts.write} Write`
@@ -115,6 +114,65 @@ export class TypeGenerator extends Generator<Models.IApiModel> {
       .toString(indent)
   }
 
+  // all types that get a declaration, sorted by name
+  declaredTypes() {
+    return Object.values(this.model.sortedTypes())
+      .filter(type => !(type instanceof Models.IntrinsicType))
+  }
+
+  // Writes one module per method tag plus the index that resolves type names
+  // to those modules. Returns the index source and {moduleName: source}
+  renderModules(indent: string) {
+    const typeModules = this.typeModules()
+    const modules: Record<string, Models.IType[]> = {}
+    this.declaredTypes()
+      .forEach(type => {
+        const name = typeModules[type.name]
+        modules[name] = (modules[name] || []).concat(type)
+      })
+    const counts = this.typeTally(this.model.types)
+    const tally = `${counts.total} API models: ${counts.standard} Spec, ${counts.request} Request, ${counts.write} Write`
+    success(`${tally} in ${Object.keys(modules).length} modules`)
+    const sources: Record<string, string> = {}
+    Object.entries(modules).forEach(([name, types]) => {
+      sources[name] = this.codeFormatter.modelsModule!(indent, types, typeModules)
+    })
+    const index = this
+      .p(`${this.codeFormatter.comment('', tally)}`)
+      .p(this.codeFormatter.modelsIndex!(indent, typeModules))
+      .toString(indent)
+    return {index, modules: sources}
+  }
+
+  // Assigns every type to the module of the first method (alphabetically) that
+  // uses it directly, then types only used as properties to the module of
+  // their first user. Unused types go to "common". Returns {typeName: moduleName}
+  typeModules() {
+    const moduleName = (tag: string) => this.codeFormatter.modelsModuleName!(tag)
+    const result: Record<string, string> = {}
+    const assigned: Models.IType[] = []
+    const assign = (type: Models.IType | undefined, module: string) => {
+      while (type && type.elementType) type = type.elementType
+      if (!type || type instanceof Models.IntrinsicType || result[type.name]) return
+      result[type.name] = module
+      assigned.push(type)
+    }
+    this.model.sortedMethods().forEach(method => {
+      const module = moduleName(method.tags[0] || 'common')
+      assign(method.type, module)
+      method.allParams.forEach(param => assign(param.type, module))
+      method.bodyParams.forEach(param => assign(this.model.getWriteableType(param.type), module))
+    })
+    // assigned grows while this runs, so nested properties are reached too
+    for (let i = 0; i < assigned.length; i++) {
+      const type = assigned[i]
+      Object.values(type.properties)
+        .forEach(prop => assign(prop.type, result[type.name]))
+    }
+    this.model.sortedTypes().forEach(type => assign(type, moduleName('common')))
+    return result
+  }
+
   typeTally(types: Record<string, Models.IType>) {
     let request = 0
     let write = 0
@@ -222,6 +222,8 @@ export interface IMethod extends ISymbol {
   description: string
   params: IParameter[]
   summary: string
+  // OpenAPI tags grouping the method, e.g. ["Dashboard"]
+  tags: string[]
   pathArgs: string[]
   bodyArg: string
   queryArgs: string[]
@@ -290,6 +292,10 @@ export class Method extends SchemadSymbol implements IMethod {
     return this.schema.summary || ''
   }
 
+  get tags(): string[] {
+    return this.schema.tags || []
+  }
+
   // all required parameters ordered by location declaration order
   get requiredParams() {
     return this.required('path')
@@ -1054,6 +1060,21 @@ export interface ICodeGen {
   // standard code to append to the bottom of the generated "models" file(s)
   modelsEpilogue(indent: string): string
 
+  // Optional: languages that implement these write models as a package with
+  // one module per method tag instead of a single "models" file.
+  // module name for the models used by methods tagged with tag
+  modelsModuleName?(tag: string): string
+
+  // entire models module for types, which are all assigned to the same module.
+  // typeModules maps every type name to its module name
+  modelsModule?(indent: string, types: IType[], typeModules: Record<string, string>): string
+
+  // package index that resolves type names to their modules
+  modelsIndex?(indent: string, typeModules: Record<string, string>): string
+
+  // Optional: precomputed field conversions for types, written to "converters"
+  modelsConverters?(indent: string, types: IType[]): string
+
   // provide the name for a file with the appropriate language code extension
   fileName(base: string): string
 